@@ -1,6 +1,9 @@
 // Configuration
 let cartItems = [];
 let apiBaseUrl = 'http://localhost:5001';
+// Produits affichés par page, et curseur de la page suivante (null : dernière page)
+const PRODUCTS_PAGE_SIZE = 50;
+let productsCursor = null;
 
 // Fonction pour obtenir l'URL de l'API
 function getApiUrl() {
@@ -408,7 +411,52 @@ function toggleDiscountFields() {
     }
 }
 
-// Charger et afficher tous les produits
+// Récupérer une page de produits (GET /products, pagination par curseur)
+async function fetchProductsPage(apiUrl, cursor) {
+    const params = new URLSearchParams({ limit: String(PRODUCTS_PAGE_SIZE) });
+    if (cursor) {
+        params.set('cursor', cursor);
+    }
+    const response = await fetch(`${apiUrl}/products?${params}`);
+    const data = await response.json();
+    if (!response.ok) {
+        throw new Error(data.error || `HTTP ${response.status}`);
+    }
+    return data;
+}
+
+// Construire la carte HTML d'un produit
+function productCardHtml(product) {
+    const categoryEmoji = {
+        'food': '🍔',
+        'electronics': '💻',
+        'clothing': '👕',
+        'other': '📦'
+    }[product.category] || '📦';
+    
+    return `
+        <div class="product-card">
+            <div class="product-icon">${categoryEmoji}</div>
+            <div class="product-info">
+                <h4 class="product-name">${product.name}</h4>
+                <p class="product-id">ID: ${product.id}</p>
+                <p class="product-category">Catégorie: ${product.category}</p>
+                <p class="product-price">${parseFloat(product.price).toFixed(2)}€</p>
+            </div>
+        </div>
+    `;
+}
+
+// Afficher le bouton "Charger plus" tant qu'il reste des produits
+function updateLoadMoreButton() {
+    const loadMoreButton = document.getElementById('products-load-more');
+    if (loadMoreButton) {
+        loadMoreButton.style.display = productsCursor ? 'inline-block' : 'none';
+        loadMoreButton.disabled = false;
+    }
+}
+
+// Charger et afficher la première page de produits
 async function loadProducts() {
     const productsListDiv = document.getElementById('products-list');
     const apiUrl = getApiUrl();
@@ -416,37 +464,19 @@ async function loadProducts() {
     if (!productsListDiv) return;
     
     productsListDiv.innerHTML = '<span class="loading">Chargement des produits...</span>';
+    productsCursor = null;
+    updateLoadMoreButton();
     
     try {
-        const response = await fetch(`${apiUrl}/products`);
-        const data = await response.json();
+        const data = await fetchProductsPage(apiUrl, null);
         
-        if (response.ok && data.products && data.products.length > 0) {
-            let html = '';
-            data.products.forEach(product => {
-                const categoryEmoji = {
-                    'food': '🍔',
-                    'electronics': '💻',
-                    'clothing': '👕',
-                    'other': '📦'
-                }[product.category] || '📦';
-                
-                html += `
-                    <div class="product-card">
-                        <div class="product-icon">${categoryEmoji}</div>
-                        <div class="product-info">
-                            <h4 class="product-name">${product.name}</h4>
-                            <p class="product-id">ID: ${product.id}</p>
-                            <p class="product-category">Catégorie: ${product.category}</p>
-                            <p class="product-price">${parseFloat(product.price).toFixed(2)}€</p>
-                        </div>
-                    </div>
-                `;
-            });
-            productsListDiv.innerHTML = html;
+        if (data.products.length > 0) {
+            productsListDiv.innerHTML = data.products.map(productCardHtml).join('');
         } else {
             productsListDiv.innerHTML = '<p class="empty-state">Aucun produit créé pour le moment</p>';
         }
+        productsCursor = data.next_cursor;
+        updateLoadMoreButton();
     } catch (error) {
         productsListDiv.innerHTML = `
             <div class="error-box">
@@ -456,6 +486,27 @@ async function loadProducts() {
     }
 }
 
+// Ajouter la page de produits suivante à la liste
+async function loadMoreProducts() {
+    const productsListDiv = document.getElementById('products-list');
+    const loadMoreButton = document.getElementById('products-load-more');
+    
+    if (!productsListDiv || !productsCursor) return;
+    
+    if (loadMoreButton) {
+        loadMoreButton.disabled = true;
+    }
+    
+    try {
+        const data = await fetchProductsPage(getApiUrl(), productsCursor);
+        productsListDiv.insertAdjacentHTML('beforeend', data.products.map(productCardHtml).join(''));
+        productsCursor = data.next_cursor;
+    } catch (error) {
+        showToast(`Erreur de connexion: ${error.message}`, 'error');
+    }
+    updateLoadMoreButton();
+}
+
 // Afficher une documentation dans la modal
 async function showDocumentation(filePath, title) {
     const modal = document.getElementById('doc-modal');
@@ -0,0 +1,90 @@
+"""
+Benchmark du checkout asynchrone (AsyncCheckoutService).
+
+Lance des checkouts simultanés face à un fournisseur de taux simulé, de
+latence fixe, et compare la durée et le nombre d'appels au fournisseur :
+- demandes séquentielles, sans cache (un appel par catégorie et par panier) ;
+- AsyncCheckoutService, à froid (appels concurrents et regroupés) ;
+- AsyncCheckoutService, à chaud (taux en cache).
+
+Usage :
+    python -m benchmarks.bench_async_checkout [nombre_de_paniers] [latence_ms]
+"""
+
+import asyncio
+import sys
+import time
+from decimal import Decimal
+from typing import List
+
+from src.models.cart import Cart
+from src.models.category import category_registry
+from src.models.product import Product
+from src.services.async_checkout_service import AsyncCheckoutService
+from src.services.checkout_service import CheckoutService
+from src.services.tax_calculator import TaxCalculator
+from src.services.tax_rate_provider import FakeTaxRateProvider
+
+TAX_RATES = {
+    "food": Decimal("0.10"),
+    "electronics": Decimal("0.20"),
+    "clothing": Decimal("0.15"),
+    "other": Decimal("0.18"),
+}
+CATEGORIES = list(TAX_RATES)
+
+
+def build_carts(count: int) -> List[Cart]:
+    """Construit des paniers de 1 à 4 catégories."""
+    carts = []
+    for n in range(count):
+        cart = Cart()
+        for i in range(n % 4 + 1):
+            category = CATEGORIES[(n + i) % len(CATEGORIES)]
+            cart.add_item(Product(id=f"p{i}", name="Produit", price=Decimal("9.99"),
+                                  category=category), i + 1)
+        carts.append(cart)
+    return carts
+
+
+async def sequential(carts: List[Cart], provider: FakeTaxRateProvider) -> None:
+    """Demande un à un les taux de chaque panier, sans cache."""
+    for cart in carts:
+        names = [category_registry.name(code) for code in cart.code_subtotals]
+        rates = {name: await provider.get_rate(name) for name in names}
+        CheckoutService(TaxCalculator(rates)).calculate_total(cart)
+
+
+async def concurrent(carts: List[Cart], service: AsyncCheckoutService) -> None:
+    """Lance tous les checkouts simultanément."""
+    await asyncio.gather(*(service.calculate_total(cart) for cart in carts))
+
+
+def main() -> None:
+    """Affiche la durée et le nombre d'appels au fournisseur de chaque variante."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 5.0) / 1000
+    carts = build_carts(count)
+
+    print(f"Paniers : {count}, latence du fournisseur : {latency * 1000:.0f} ms")
+    print(f"{'variante':>22} | {'durée (ms)':>10} | {'appels':>7}")
+    print("-" * 46)
+
+    provider = FakeTaxRateProvider(TAX_RATES, latency)
+    start = time.perf_counter()
+    asyncio.run(sequential(carts[: max(1, count // 10)], provider))
+    elapsed = (time.perf_counter() - start) * 10
+    print(f"{'séquentiel (estimé)':>22} | {elapsed * 1000:>10.0f} | {provider.calls * 10:>7}")
+
+    provider = FakeTaxRateProvider(TAX_RATES, latency)
+    service = AsyncCheckoutService(provider)
+    for label in ("asynchrone, à froid", "asynchrone, à chaud"):
+        start = time.perf_counter()
+        asyncio.run(concurrent(carts, service))
+        elapsed = time.perf_counter() - start
+        print(f"{label:>22} | {elapsed * 1000:>10.0f} | {provider.calls:>7}")
+    print(f"Statistiques : {service.stats()}")
+
+
+if __name__ == "__main__":
+    main()
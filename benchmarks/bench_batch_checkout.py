@@ -0,0 +1,58 @@
+"""
+Benchmark de l'endpoint /checkout/batch.
+
+Compare, avec le client de test Flask, le calcul de N paniers par N
+requêtes /checkout et par une requête /checkout/batch. Le cache des
+résultats est vidé avant chaque mesure pour ne mesurer que le coût des
+requêtes et des calculs.
+
+Usage :
+    python -m benchmarks.bench_batch_checkout [nombre_de_paniers]
+"""
+
+import sys
+import time
+
+from src.api.app import create_app
+
+CATEGORIES = ["food", "electronics", "clothing", "other"]
+
+
+def main() -> None:
+    """Affiche la durée des deux variantes."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    app = create_app()
+    app.config["CHECKOUT_BATCH_MAX_SIZE"] = count
+    client = app.test_client()
+    for i in range(200):
+        client.post(
+            "/products",
+            json={"id": f"p{i}", "name": "Produit", "price": f"{i}.99",
+                  "category": CATEGORIES[i % len(CATEGORIES)]},
+        )
+    carts = [
+        {"items": [{"product_id": f"p{(n * 7 + i) % 200}", "quantity": i + 1}
+                   for i in range(n % 10 + 1)]}
+        for n in range(count)
+    ]
+    cache = app.extensions["checkout_cache"]
+
+    cache.clear()
+    start = time.perf_counter()
+    single = [client.post("/checkout", json=cart).get_json() for cart in carts]
+    single_elapsed = time.perf_counter() - start
+
+    cache.clear()
+    start = time.perf_counter()
+    batch = client.post("/checkout/batch", json={"carts": carts}).get_json()["results"]
+    batch_elapsed = time.perf_counter() - start
+
+    assert [{key: result[key] for key in single[0]} for result in batch] == single
+    print(f"Paniers : {count}")
+    print(f"{count} requêtes /checkout : {single_elapsed * 1000:.0f} ms")
+    print(f"1 requête /checkout/batch : {batch_elapsed * 1000:.0f} ms "
+          f"({single_elapsed / batch_elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
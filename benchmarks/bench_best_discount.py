@@ -0,0 +1,84 @@
+"""
+Benchmark de la recherche de la meilleure remise.
+
+Compare, pour 100 000 codes de remise, l'évaluation de chaque code sur le
+panier (checkout complet par remise) avec DiscountIndex, qui ne consulte
+que les groupes des catégories du panier et le groupe global.
+
+Usage :
+    python -m benchmarks.bench_best_discount [nombre_de_codes]
+"""
+
+import sys
+import time
+from decimal import Decimal
+
+from src.models.cart import Cart
+from src.models.discount import Discount, DiscountType
+from src.models.product import Product
+from src.services.checkout_service import CheckoutService
+from src.services.discount_index import DiscountIndex
+from src.services.tax_calculator import TaxCalculator
+
+TAX_RATES = {
+    "food": Decimal("0.10"),
+    "electronics": Decimal("0.20"),
+    "clothing": Decimal("0.15"),
+    "other": Decimal("0.18"),
+}
+CATEGORIES = [None] + list(TAX_RATES) + [f"cat{i}" for i in range(40)]
+
+
+def main() -> None:
+    """Affiche la durée des deux recherches et vérifie qu'elles concordent."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    discounts = [
+        Discount(
+            code=f"CODE{i:06d}",
+            discount_type=DiscountType.PERCENTAGE if i % 2 else DiscountType.FIXED,
+            value=Decimal(i * 7919 % 3000) / 100,
+            min_amount=Decimal(i * 104729 % 50_000) / 100 if i % 4 else None,
+            category=CATEGORIES[i % len(CATEGORIES)],
+        )
+        for i in range(count)
+    ]
+    cart = Cart()
+    for i in range(30):
+        cart.add_item(
+            Product(
+                id=f"prod{i}",
+                name="Produit",
+                price=Decimal(i * 613 % 20_000) / 100,
+                category=list(TAX_RATES)[i % len(TAX_RATES)],
+            ),
+            i % 3 + 1,
+        )
+    checkout_service = CheckoutService(TaxCalculator(TAX_RATES))
+
+    start = time.perf_counter()
+    index = DiscountIndex(discounts)
+    index.best_discount(cart)
+    build = time.perf_counter() - start
+
+    rounds = 1000
+    start = time.perf_counter()
+    for _ in range(rounds):
+        best_discount, _amount = index.best_discount(cart)
+    indexed = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    exhaustive_total = min(
+        checkout_service.calculate_total(cart, discount)["total"] for discount in discounts
+    )
+    exhaustive = time.perf_counter() - start
+
+    print(f"Codes de remise : {count}")
+    print(f"Construction de l'index      : {build * 1e3:>10.1f} ms (une fois)")
+    print(f"Évaluation de chaque code    : {exhaustive * 1e3:>10.1f} ms")
+    print(f"Recherche dans l'index       : {indexed * 1e6:>10.1f} µs")
+    indexed_total = checkout_service.calculate_total(cart, best_discount)["total"]
+    print(f"Même total minimal : {indexed_total == exhaustive_total} ({best_discount.code})")
+
+
+if __name__ == "__main__":
+    main()
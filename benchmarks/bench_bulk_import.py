@@ -0,0 +1,53 @@
+"""
+Benchmark de l'import en masse de produits (POST /products/bulk).
+
+Envoie N produits en NDJSON par une seule requête, avec le client de test
+Flask, et affiche le débit obtenu ; à titre de comparaison, le débit de
+POST /products (un produit par requête) est mesuré sur un échantillon.
+
+Usage :
+    python -m benchmarks.bench_bulk_import [nombre_de_produits]
+"""
+
+import json
+import logging
+import sys
+import time
+
+from src.api import payloads
+from src.api.app import create_app
+
+CATEGORIES = ["food", "electronics", "clothing", "other"]
+
+
+def main() -> None:
+    """Affiche le débit de l'import en masse et de l'import unitaire."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    logging.disable(logging.INFO)
+    records = [
+        {"id": f"prod{i}", "name": f"Produit {i}", "price": f"{i % 10_000}.99",
+         "category": CATEGORIES[i % len(CATEGORIES)]}
+        for i in range(count)
+    ]
+    body = "\n".join(json.dumps(record) for record in records).encode("utf-8")
+    print(f"Produits : {count} ({len(body) / 1e6:.1f} Mo), "
+          f"analyseur : {payloads.loads_json.__module__}")
+
+    client = create_app().test_client()
+    start = time.perf_counter()
+    summary = client.post("/products/bulk", data=body).get_json()
+    elapsed = time.perf_counter() - start
+    assert summary["created"] == count, summary
+    print(f"POST /products/bulk : {elapsed:.2f} s, {count / elapsed:,.0f} produits/s")
+
+    client = create_app().test_client()
+    sample = records[:2000]
+    start = time.perf_counter()
+    for record in sample:
+        client.post("/products", json=record)
+    elapsed = time.perf_counter() - start
+    print(f"POST /products      : {len(sample) / elapsed:,.0f} produits/s")
+
+
+if __name__ == "__main__":
+    main()
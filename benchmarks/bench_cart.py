@@ -0,0 +1,56 @@
+"""
+Benchmark de construction du panier.
+
+Mesure le coût par ligne de la construction d'un panier (ajout, fusion,
+mise à jour et suppression) pour des tailles allant de 10 à 100 000 lignes.
+Avec l'index par ID de produit, le coût par ligne doit rester stable.
+
+Usage :
+    python -m benchmarks.bench_cart
+"""
+
+import time
+from decimal import Decimal
+from typing import List
+
+from src.models.cart import Cart
+from src.models.product import Product
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+
+
+def build_products(count: int) -> List[Product]:
+    """Crée des produits de test."""
+    return [
+        Product(id=f"prod{i}", name=f"Produit {i}", price=Decimal("9.99"), category="other")
+        for i in range(count)
+    ]
+
+
+def run_once(products: List[Product]) -> float:
+    """Construit, modifie puis vide un panier ; retourne la durée en secondes."""
+    start = time.perf_counter()
+    cart = Cart()
+    for product in products:
+        cart.add_item(product, 1)
+    for product in products:
+        cart.add_item(product, 1)
+    for product in products:
+        cart.update_quantity(product.id, 3)
+    for product in products:
+        cart.remove_item(product.id)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Affiche le coût par ligne pour chaque taille de panier."""
+    print(f"{'lignes':>10} | {'total (ms)':>12} | {'par ligne (µs)':>15}")
+    print("-" * 44)
+    for size in SIZES:
+        products = build_products(size)
+        elapsed = min(run_once(products) for _ in range(3))
+        print(f"{size:>10} | {elapsed * 1000:>12.2f} | {elapsed / size * 1e6:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark du checkout en un seul parcours.
+
+Compare l'algorithme d'origine, qui parcourt les articles trois fois
+(sous-total, sous-total de la catégorie remisée, taxes) en recalculant
+item.subtotal à chaque fois, avec le calcul fusionné de CheckoutService,
+qui parcourt une seule fois les sous-totaux par catégorie du panier.
+
+Usage :
+    python -m benchmarks.bench_checkout [nombre_de_lignes]
+"""
+
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from typing import Callable, Dict, List, Tuple
+
+from src.models.cart import Cart
+from src.models.discount import Discount, DiscountType
+from src.models.product import Product
+from src.services.checkout_service import CheckoutService
+from src.services.tax_calculator import TaxCalculator
+
+TAX_RATES = {
+    "food": Decimal("0.10"),
+    "electronics": Decimal("0.20"),
+    "clothing": Decimal("0.15"),
+    "other": Decimal("0.18"),
+}
+CATEGORIES = list(TAX_RATES)
+
+
+def legacy_calculate_total(cart: Cart, discount: Discount, counter: List[int]) -> Dict:
+    """Algorithme d'origine ; counter[0] compte les articles parcourus."""
+    subtotal = Decimal("0")
+    for item in cart.items:
+        counter[0] += 1
+        subtotal += item.subtotal
+
+    category_subtotal = Decimal("0")
+    for item in cart.items:
+        counter[0] += 1
+        if item.product.category == discount.category:
+            category_subtotal += item.subtotal
+    discount_amount = discount.calculate_discount(category_subtotal)
+    subtotal_after_discount = subtotal - discount_amount
+
+    tax_amount = Decimal("0")
+    for item in cart.items:
+        counter[0] += 1
+        tax_amount += item.subtotal * TAX_RATES.get(item.product.category, Decimal("0"))
+    if subtotal > 0:
+        tax_amount = tax_amount * (subtotal_after_discount / subtotal)
+
+    return {
+        "subtotal": subtotal,
+        "discount_amount": discount_amount,
+        "subtotal_after_discount": subtotal_after_discount,
+        "tax_amount": tax_amount,
+        "total": subtotal_after_discount + tax_amount,
+    }
+
+
+def measure(run: Callable[[], Dict], rounds: int) -> Tuple[float, int, Dict]:
+    """Retourne (durée par appel, pic mémoire transitoire, résultat)."""
+    result = run()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        run()
+    elapsed = (time.perf_counter() - start) / rounds
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main() -> None:
+    """Affiche passes, pic mémoire et durée des deux algorithmes."""
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    cart = Cart()
+    for i in range(lines):
+        product = Product(
+            id=f"prod{i}",
+            name=f"Produit {i}",
+            price=Decimal(i % 10_000) / 100,
+            category=CATEGORIES[i % len(CATEGORIES)],
+        )
+        cart.add_item(product, i % 5 + 1)
+    discount = Discount(
+        code="FOOD10",
+        discount_type=DiscountType.PERCENTAGE,
+        value=Decimal("10"),
+        category="food",
+    )
+    checkout_service = CheckoutService(TaxCalculator(TAX_RATES))
+
+    counter = [0]
+    legacy_calculate_total(cart, discount, counter)
+    visits = counter[0]
+    legacy = measure(lambda: legacy_calculate_total(cart, discount, [0]), rounds=10)
+    fused = measure(lambda: checkout_service.calculate_total(cart, discount), rounds=1000)
+
+    print(f"Lignes : {lines}")
+    print(f"{'algorithme':>10} | {'éléments parcourus':>18} | {'pic mémoire (o)':>15} | "
+          f"{'durée (µs)':>10}")
+    print("-" * 64)
+    print(f"{'origine':>10} | {visits:>18} | {legacy[1]:>15} | {legacy[0] * 1e6:>10.1f}")
+    print(f"{'fusionné':>10} | {len(cart.category_subtotals):>18} | {fused[1]:>15} | "
+          f"{fused[0] * 1e6:>10.1f}")
+    print(f"Résultats identiques : {legacy[2] == fused[2]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark du cache des résultats de checkout.
+
+Compare, pour des paniers de tailles croissantes, le traitement d'une
+requête /checkout sans cache (construction du panier depuis le catalogue
+puis checkout) et le traitement d'une requête identique servie par
+CheckoutCache (empreinte des lignes demandées).
+
+Usage :
+    python -m benchmarks.bench_checkout_cache
+"""
+
+import timeit
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from src.models.cart import Cart
+from src.models.product import Product
+from src.services.checkout_cache import CheckoutCache
+from src.services.checkout_service import CheckoutService
+from src.services.tax_calculator import TaxCalculator
+
+TAX_RATES = {
+    "food": Decimal("0.10"),
+    "electronics": Decimal("0.20"),
+    "clothing": Decimal("0.15"),
+    "other": Decimal("0.18"),
+}
+CATEGORIES = list(TAX_RATES)
+
+
+def main() -> None:
+    """Affiche la durée d'une requête sans cache et servie par le cache."""
+    catalog: Dict[str, Product] = {
+        f"prod{i}": Product(
+            id=f"prod{i}",
+            name=f"Produit {i}",
+            price=Decimal(i % 10_000) / 100,
+            category=CATEGORIES[i % len(CATEGORIES)],
+        )
+        for i in range(1000)
+    }
+    tax_calculator = TaxCalculator(TAX_RATES)
+    checkout_service = CheckoutService(tax_calculator)
+    cache = CheckoutCache(tax_calculator)
+
+    print(f"{'lignes':>6} | {'sans cache (µs)':>15} | {'succès du cache (µs)':>20}")
+    print("-" * 48)
+    for size in (1, 10, 50, 200):
+        lines: List[Tuple[str, int]] = [(f"prod{i * 7 % 1000}", i % 3 + 1) for i in range(size)]
+
+        def compute() -> dict:
+            return checkout_service.calculate_total(Cart.from_lines(lines, catalog))
+
+        expected = compute()
+        assert cache.get_or_compute(lines, None, compute) == expected
+        rounds = 2000
+        uncached = timeit.timeit(compute, number=rounds) / rounds
+        cached = timeit.timeit(
+            lambda: cache.get_or_compute(lines, None, compute), number=rounds
+        ) / rounds
+        print(f"{size:>6} | {uncached * 1e6:>15.1f} | {cached * 1e6:>20.1f}")
+    print(f"Statistiques : {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
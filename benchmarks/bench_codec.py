@@ -0,0 +1,121 @@
+"""
+Benchmark de la sérialisation binaire des paniers face au JSON.
+
+Le JSON reproduit le format de l'API (prix en chaîne, relus avec
+Decimal(str(...)) comme dans create_product).
+
+Usage :
+    python -m benchmarks.bench_codec [nombre_de_paniers]
+"""
+
+import io
+import json
+import sys
+import time
+from decimal import Decimal
+from typing import List
+
+from src.models import codec
+from src.models.cart import Cart
+from src.models.product import Product
+
+CATEGORIES = ["food", "electronics", "clothing", "other"]
+
+
+def build_carts(count: int, lines: int = 20) -> List[Cart]:
+    """Crée des paniers de test."""
+    carts = []
+    for c in range(count):
+        cart = Cart()
+        for i in range(lines):
+            product = Product(
+                id=f"prod{c}-{i}",
+                name=f"Produit {i}",
+                price=Decimal(i * 137 + c) / 100,
+                category=CATEGORIES[i % 4],
+            )
+            cart.add_item(product, i % 5 + 1)
+        carts.append(cart)
+    return carts
+
+
+def json_dump(carts: List[Cart]) -> str:
+    """Sérialise les paniers en JSON, une ligne par panier."""
+    return "\n".join(
+        json.dumps(
+            [
+                {
+                    "id": item.product.id,
+                    "name": item.product.name,
+                    "price": str(item.product.price),
+                    "category": item.product.category,
+                    "quantity": item.quantity,
+                }
+                for item in cart
+            ]
+        )
+        for cart in carts
+    )
+
+
+def json_load(data: str) -> List[Cart]:
+    """Relit les paniers sérialisés par json_dump."""
+    carts = []
+    for line in data.split("\n"):
+        cart = Cart()
+        cart.add_items(
+            (
+                Product(
+                    id=entry["id"],
+                    name=entry["name"],
+                    price=Decimal(str(entry["price"])),
+                    category=entry["category"],
+                ),
+                entry["quantity"],
+            )
+            for entry in json.loads(line)
+        )
+        carts.append(cart)
+    return carts
+
+
+def binary_dump(carts: List[Cart]) -> bytes:
+    """Sérialise les paniers avec le codec binaire."""
+    stream = io.BytesIO()
+    codec.write_carts(stream, carts)
+    return stream.getvalue()
+
+
+def binary_load(data: bytes) -> List[Cart]:
+    """Relit les paniers sérialisés par binary_dump."""
+    return list(codec.iter_carts(data))
+
+
+def timed(function, argument, repeat: int = 5):  # type: ignore[no-untyped-def]
+    """Exécute une fonction plusieurs fois et retourne (résultat, meilleure durée)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(argument)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main() -> None:
+    """Affiche le débit des deux formats."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    carts = build_carts(count)
+
+    print(f"{'format':>8} | {'taille (Ko)':>11} | {'encodage (paniers/s)':>20} | "
+          f"{'décodage (paniers/s)':>20}")
+    print("-" * 70)
+    for name, dump, load in [("JSON", json_dump, json_load), ("binaire", binary_dump, binary_load)]:
+        data, encode_time = timed(dump, carts)
+        decoded, decode_time = timed(load, data)
+        assert decoded == carts
+        print(f"{name:>8} | {len(data) / 1024:>11.0f} | {count / encode_time:>20.0f} | "
+              f"{count / decode_time:>20.0f}")
+
+
+if __name__ == "__main__":
+    main()
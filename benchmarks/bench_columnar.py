@@ -0,0 +1,74 @@
+"""
+Benchmark du panier colonnaire.
+
+Compare le temps de construction et de calcul (sous-total, taxes) d'un
+Cart et d'un ColumnarCart, et vérifie que les deux donnent le même total.
+
+Usage :
+    python -m benchmarks.bench_columnar [nombre_de_lignes]
+"""
+
+import sys
+import time
+from decimal import Decimal
+from typing import List
+
+from src.models.cart import Cart
+from src.models.columnar_cart import ColumnarCart
+from src.models.product import Product
+from src.services.checkout_service import CheckoutService
+from src.services.tax_calculator import TaxCalculator
+
+TAX_RATES = {
+    "food": Decimal("0.10"),
+    "electronics": Decimal("0.20"),
+    "clothing": Decimal("0.15"),
+    "other": Decimal("0.18"),
+}
+CATEGORIES = list(TAX_RATES)
+
+
+def build_products(count: int) -> List[Product]:
+    """Crée des produits de test."""
+    return [
+        Product(
+            id=f"prod{i}",
+            name=f"Produit {i}",
+            price=Decimal(i % 100_000) / 100,
+            category=CATEGORIES[i % len(CATEGORIES)],
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    """Affiche les durées des deux moteurs."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    products = build_products(count)
+    checkout_service = CheckoutService(TaxCalculator(TAX_RATES))
+
+    start = time.perf_counter()
+    cart = Cart()
+    for i, product in enumerate(products):
+        cart.add_item(product, i % 5 + 1)
+    built = time.perf_counter()
+    expected = checkout_service.calculate_total(cart)
+    cart_times = (built - start, time.perf_counter() - built)
+
+    start = time.perf_counter()
+    columnar = ColumnarCart()
+    columnar.extend((product, i % 5 + 1) for i, product in enumerate(products))
+    built = time.perf_counter()
+    result = checkout_service.calculate_total(columnar)
+    columnar_times = (built - start, time.perf_counter() - built)
+
+    print(f"Lignes : {count}")
+    print(f"{'moteur':>14} | {'construction (s)':>16} | {'calcul (s)':>10}")
+    print("-" * 48)
+    print(f"{'Cart':>14} | {cart_times[0]:>16.3f} | {cart_times[1]:>10.4f}")
+    print(f"{'ColumnarCart':>14} | {columnar_times[0]:>16.3f} | {columnar_times[1]:>10.4f}")
+    print(f"Totaux identiques : {result == expected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark de l'évaluation des remises en lot.
+
+Évalue toutes les remises actives sur un ensemble de montants de panier
+(bannières « meilleure offre ») : boucle sur la méthode unitaire
+d'origine, puis évaluateurs précompilés appelés en lot.
+
+Usage :
+    python -m benchmarks.bench_discounts [nombre_de_remises]
+"""
+
+import sys
+import time
+from decimal import Decimal
+from typing import List
+
+from src.models.discount import Discount, DiscountType, calculate_discounts
+
+
+def legacy_calculate_discount(discount: Discount, amount: Decimal) -> Decimal:
+    """Implémentation d'origine de Discount.calculate_discount."""
+    if discount.min_amount is not None and amount < discount.min_amount:
+        return Decimal("0")
+
+    if discount.discount_type == DiscountType.PERCENTAGE:
+        return amount * (discount.value / Decimal("100"))
+    else:  # FIXED
+        return min(discount.value, amount)
+
+
+def build_discounts(count: int) -> List[Discount]:
+    """Crée des remises variées."""
+    discounts = []
+    for i in range(count):
+        discount_type = DiscountType.PERCENTAGE if i % 2 else DiscountType.FIXED
+        discounts.append(
+            Discount(
+                code=f"CODE{i}",
+                discount_type=discount_type,
+                value=Decimal(i % 50 + 1),
+                min_amount=Decimal(i % 200) if i % 3 else None,
+            )
+        )
+    return discounts
+
+
+def main() -> None:
+    """Affiche les durées des deux approches."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    discounts = build_discounts(count)
+    amounts = [Decimal(f"{i * 17.31:.2f}") for i in range(100)]
+
+    start = time.perf_counter()
+    expected = [[legacy_calculate_discount(d, amount) for d in discounts] for amount in amounts]
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = [calculate_discounts(discounts, amount) for amount in amounts]
+    compiled = time.perf_counter() - start
+
+    evaluations = count * len(amounts)
+    print(f"Évaluations : {evaluations}")
+    print(f"Méthode d'origine  : {legacy / evaluations * 1e9:8.1f} ns / évaluation")
+    print(f"Évaluateurs en lot : {compiled / evaluations * 1e9:8.1f} ns / évaluation")
+    print(f"Résultats identiques : {batch == expected}")
+
+
+if __name__ == "__main__":
+    main()
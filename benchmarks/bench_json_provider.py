@@ -0,0 +1,117 @@
+"""
+Benchmark du fournisseur JSON, endpoint par endpoint.
+
+Pour chaque endpoint renvoyant des montants, mesure la durée d'une requête
+(client de test Flask, cache de checkout actif) avec :
+- le fournisseur JSON par défaut de Flask ;
+- CheckoutJSONProvider, backend json ;
+- CheckoutJSONProvider, backend orjson (s'il est installé).
+La durée de la seule sérialisation du corps de la réponse est aussi
+mesurée ; pour le fournisseur par défaut, elle inclut la conversion
+préalable des montants en chaînes, comme avant CheckoutJSONProvider.
+
+Usage :
+    python -m benchmarks.bench_json_provider
+"""
+
+import timeit
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Tuple
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from src.api import json_provider
+from src.api.app import create_app
+from src.models.cart import Cart
+from src.models.product import Product
+from src.services.checkout_service import CheckoutService
+from src.services.tax_calculator import DEFAULT_TAX_RATES, TaxCalculator
+
+CATEGORIES = ["food", "electronics", "clothing", "other"]
+
+
+def build_app(provider: str) -> Tuple[Flask, Dict[str, Callable[[], Any]]]:
+    """Crée une application peuplée et les requêtes à mesurer."""
+    app = create_app()
+    if provider == "flask":
+        app.json = DefaultJSONProvider(app)
+    else:
+        app.json.backend = provider
+    app.config["CHECKOUT_BATCH_MAX_SIZE"] = 1000
+    client = app.test_client()
+    for i in range(200):
+        client.post(
+            "/products",
+            json={"id": f"p{i}", "name": "Produit", "price": f"{i}.99",
+                  "category": CATEGORIES[i % len(CATEGORIES)]},
+        )
+    client.post("/discounts", json={"code": "PCT10", "type": "percentage", "value": "10"})
+    cart = {"items": [{"product_id": f"p{i}", "quantity": i % 3 + 1} for i in range(10)],
+            "discount_code": "PCT10"}
+    carts: List[Dict[str, Any]] = [
+        {"items": [{"product_id": f"p{(n + i) % 200}", "quantity": 1} for i in range(5)]}
+        for n in range(500)
+    ]
+    requests = {
+        "POST /checkout": lambda: client.post("/checkout", json=cart),
+        "POST /checkout/batch": lambda: client.post("/checkout/batch", json={"carts": carts}),
+        "POST /checkout/best-discount": lambda: client.post("/checkout/best-discount", json=cart),
+        "GET /stats": lambda: client.get("/stats"),
+    }
+    for request in requests.values():
+        assert request().status_code == 200
+    return app, requests
+
+
+def payload(endpoint: str, result: Dict[str, Any], stringify: bool) -> Any:
+    """
+    Construit l'objet passé à jsonify par un endpoint, à partir d'un résultat de checkout.
+
+    Avec stringify, les montants sont d'abord convertis en chaînes, comme
+    le faisaient les routes avant CheckoutJSONProvider.
+    """
+    if stringify:
+        result = {key: str(value) for key, value in result.items()}
+    if endpoint == "POST /checkout/batch":
+        results = [dict(result, index=n) for n in range(500)]
+        if stringify:
+            results = [{key: str(value) for key, value in item.items()} for item in results]
+        return {"results": results, "errors": 0}
+    if endpoint == "POST /checkout/best-discount":
+        return dict(result, discount_code="PCT10")
+    if endpoint == "GET /stats":
+        return {"checkout_cache": {"hits": 1, "hit_ratio": 0.5}}
+    return result
+
+
+def main() -> None:
+    """Affiche la durée de chaque endpoint et de la sérialisation de sa réponse."""
+    providers = ["flask", "json"] + (["orjson"] if json_provider.orjson is not None else [])
+    apps = {provider: build_app(provider) for provider in providers}
+    cart = Cart()
+    for i in range(10):
+        cart.add_item(Product(id=f"p{i}", name="Produit", price=Decimal(f"{i}.99"),
+                              category=CATEGORIES[i % len(CATEGORIES)]), i % 3 + 1)
+    result = CheckoutService(TaxCalculator(dict(DEFAULT_TAX_RATES))).calculate_total(cart)
+    header = " | ".join(f"{provider:>14}" for provider in providers)
+    print(f"{'endpoint (requête / sérialisation, µs)':>40} | {header}")
+    print("-" * (43 + 17 * len(providers)))
+    for endpoint in apps["flask"][1]:
+        cells = []
+        for provider in providers:
+            app, requests = apps[provider]
+            request = requests[endpoint]
+            stringify = provider == "flask"
+            number = 20 if "batch" in endpoint else 500
+            total = timeit.timeit(request, number=number) / number
+            with app.app_context():
+                dumps = timeit.timeit(
+                    lambda: app.json.response(payload(endpoint, result, stringify)), number=number
+                ) / number
+            cells.append(f"{total * 1e6:>6.0f} / {dumps * 1e6:>5.0f}")
+        print(f"{endpoint:>40} | " + " | ".join(f"{cell:>14}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark mémoire du catalogue de produits.
+
+Compare l'empreinte par produit d'un catalogue (dictionnaire indexé par
+ID, comme le dépôt en mémoire de create_app) entre l'ancienne dataclass avec
+``__dict__`` et le modèle Product actuel (slots, catégorie internée).
+
+Usage :
+    python -m benchmarks.bench_memory [nombre_de_produits]
+"""
+
+import gc
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable, Dict
+
+from src.models.product import Product
+
+CATEGORIES = ["food", "electronics", "clothing", "other"]
+
+
+@dataclass
+class LegacyProduct:
+    """Produit tel que défini avant le passage aux slots."""
+
+    id: str
+    name: str
+    price: Decimal
+    category: str
+
+    def __post_init__(self) -> None:
+        """Valide les données du produit."""
+        if not self.id:
+            raise ValueError("L'ID du produit ne peut pas être vide")
+        if not self.name:
+            raise ValueError("Le nom du produit ne peut pas être vide")
+        if self.price < 0:
+            raise ValueError("Le prix ne peut pas être négatif")
+
+
+def measure(factory: Callable[..., Any], count: int) -> float:
+    """Construit un catalogue et retourne le nombre d'octets par produit."""
+    gc.collect()
+    tracemalloc.start()
+    catalog: Dict[str, Any] = {}
+    for i in range(count):
+        # json.loads reproduit les chaînes distinctes d'une requête POST /products
+        data = json.loads(
+            f'{{"id": "prod{i}", "name": "Produit {i}", "category": "{CATEGORIES[i % 4]}"}}'
+        )
+        catalog[data["id"]] = factory(
+            id=data["id"],
+            name=data["name"],
+            price=Decimal("19.99"),
+            category=data["category"],
+        )
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del catalog
+    return current / count
+
+
+def main() -> None:
+    """Affiche les octets par produit avant et après."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    before = measure(LegacyProduct, count)
+    after = measure(Product, count)
+    print(f"Produits             : {count}")
+    print(f"Avant (dataclass)    : {before:8.1f} octets/produit")
+    print(f"Après (slots+intern) : {after:8.1f} octets/produit")
+    print(f"Gain                 : {(1 - after / before) * 100:8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark du chemin Money (centimes entiers) face au chemin Decimal.
+
+Mesure calculate_total sur des paniers de 1 000 lignes avec les deux
+chemins. Avec --verify, compare en plus les deux chemins champ par champ
+sur des paniers aléatoires (dont la moitié avec des prix au millième) et
+échoue à la première divergence.
+
+Usage :
+    python -m benchmarks.bench_money [--verify NOMBRE_DE_PANIERS]
+"""
+
+import argparse
+import random
+import time
+from decimal import Decimal
+from typing import List, Optional
+
+from src.models.cart import Cart
+from src.models.discount import Discount, DiscountType
+from src.models.money import Rounding
+from src.models.product import Product
+from src.services.checkout_service import CheckoutService
+from src.services.tax_calculator import TaxCalculator
+
+TAX_RATES = {
+    "food": Decimal("0.055"),
+    "electronics": Decimal("0.20"),
+    "clothing": Decimal("0.15"),
+    "other": Decimal("0.18"),
+}
+CATEGORIES = list(TAX_RATES) + ["unknown"]
+
+
+def random_cart(rng: random.Random, lines: int, sub_cent: bool = False) -> Cart:
+    """Crée un panier aléatoire avec des prix au centime (ou au millième)."""
+    cart = Cart()
+    scale = 3 if sub_cent else 2
+    for i in range(lines):
+        product = Product(
+            id=f"prod{i}",
+            name=f"Produit {i}",
+            price=Decimal(rng.randint(1, 500_000)).scaleb(-scale),
+            category=rng.choice(CATEGORIES),
+        )
+        cart.add_item(product, rng.randint(1, 20))
+    return cart
+
+
+def random_discount(rng: random.Random) -> Optional[Discount]:
+    """Crée une remise aléatoire (ou aucune)."""
+    kind = rng.randint(0, 3)
+    if kind == 0:
+        return None
+    if kind == 1:
+        value = Decimal(rng.randint(1, 10_000)) / 100
+        return Discount(code="FIXED", discount_type=DiscountType.FIXED, value=value)
+    return Discount(
+        code="PCT",
+        discount_type=DiscountType.PERCENTAGE,
+        value=Decimal(rng.randint(1, 1_000)) / 10,
+        category=rng.choice(CATEGORIES) if kind == 3 else None,
+    )
+
+
+def benchmark(checkout_service: CheckoutService, carts: List[Cart], rounds: int) -> None:
+    """Affiche le temps par checkout pour chaque chemin."""
+    discount = Discount(code="SAVE10", discount_type=DiscountType.PERCENTAGE, value=Decimal("10"))
+    paths = {
+        "Decimal": lambda cart: checkout_service.calculate_total(cart, discount),
+        "Money": lambda cart: checkout_service.calculate_total_money(cart, discount),
+    }
+    print(f"{'chemin':>10} | {'µs / checkout':>14}")
+    print("-" * 28)
+    for name, run in paths.items():
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for cart in carts:
+                run(cart)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>10} | {elapsed / (rounds * len(carts)) * 1e6:>14.2f}")
+
+
+def verify(checkout_service: CheckoutService, rng: random.Random, count: int) -> None:
+    """Vérifie que les deux chemins donnent les mêmes montants au centime."""
+    for index in range(count):
+        cart = random_cart(rng, rng.randint(1, 50), sub_cent=index % 2 == 1)
+        discount = random_discount(rng)
+        for rounding in Rounding:
+            mismatches = checkout_service.verify_money_path(cart, discount, rounding)
+            if mismatches:
+                raise SystemExit(
+                    f"Divergence sur le panier {index} ({rounding.name}) : {mismatches}"
+                )
+    print(f"Vérification : {count} paniers × {len(Rounding)} modes d'arrondi, aucune divergence")
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--verify", type=int, default=0, help="nombre de paniers à vérifier")
+    parser.add_argument("--carts", type=int, default=50, help="nombre de paniers de 1 000 lignes")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    checkout_service = CheckoutService(TaxCalculator(TAX_RATES))
+    carts = [random_cart(rng, 1_000) for _ in range(args.carts)]
+    benchmark(checkout_service, carts, rounds=20)
+    if args.verify:
+        verify(checkout_service, rng, args.verify)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark du checkout parallèle (CheckoutService.calculate_total_many).
+
+Mesure le débit du repricing d'un lot de paniers pour un nombre croissant
+de processus, jusqu'au nombre de cœurs disponibles, et vérifie que les
+résultats sont identiques au calcul séquentiel. Les paniers sont des
+paniers enregistrés (flux write_carts) : leur décodage domine le coût et
+se répartit entre les processus.
+
+Usage :
+    python -m benchmarks.bench_parallel [nombre_de_paniers] [processus_max]
+"""
+
+import io
+import os
+import sys
+import time
+from decimal import Decimal
+from typing import List
+
+from src.models import codec
+from src.models.cart import Cart
+from src.models.discount import Discount, DiscountType
+from src.models.product import Product
+from src.services.checkout_service import CheckoutService
+from src.services.tax_calculator import TaxCalculator
+
+TAX_RATES = {
+    "food": Decimal("0.10"),
+    "electronics": Decimal("0.20"),
+    "clothing": Decimal("0.15"),
+    "other": Decimal("0.18"),
+}
+CATEGORIES = list(TAX_RATES)
+
+
+def build_carts(count: int) -> List[Cart]:
+    """Construit des paniers de 1 à 20 lignes."""
+    catalog = {
+        f"prod{i}": Product(
+            id=f"prod{i}",
+            name=f"Produit {i}",
+            price=Decimal(i * 613 % 10_000) / 100,
+            category=CATEGORIES[i % len(CATEGORIES)],
+        )
+        for i in range(500)
+    }
+    return [
+        Cart.from_lines(
+            [(f"prod{(n * 7 + i) % 500}", i % 3 + 1) for i in range(n % 20 + 1)], catalog
+        )
+        for n in range(count)
+    ]
+
+
+def main() -> None:
+    """Affiche le débit et l'accélération pour chaque nombre de processus."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    carts = build_carts(count)
+    discount = Discount(
+        code="FOOD10",
+        discount_type=DiscountType.PERCENTAGE,
+        value=Decimal("10"),
+        category="food",
+    )
+    checkout_service = CheckoutService(TaxCalculator(TAX_RATES))
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != max_workers:
+        worker_counts.append(max_workers)
+
+    stream = io.BytesIO()
+    codec.write_carts(stream, carts)
+    data = stream.getvalue()
+
+    print(f"Paniers : {count} (cœurs disponibles : {os.cpu_count()})")
+    print(f"{'processus':>9} | {'durée (s)':>9} | {'paniers/s':>10} | {'accélération':>12}")
+    print("-" * 50)
+    reference = None
+    baseline = 0.0
+    for workers in worker_counts:
+        start = time.perf_counter()
+        results = checkout_service.calculate_total_many(data, discount, workers=workers)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference, baseline = results, elapsed
+        assert results == reference
+        print(f"{workers:>9} | {elapsed:>9.2f} | {count / elapsed:>10.0f} | "
+              f"{baseline / elapsed:>11.2f}x")
+    print("Résultats identiques : True")
+
+
+if __name__ == "__main__":
+    main()
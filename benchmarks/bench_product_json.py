@@ -0,0 +1,64 @@
+"""
+Benchmark du cache JSON des produits.
+
+Compare la construction du corps d'une page de GET /products et d'une
+réponse GET /products/<id> :
+- sans cache : dict par produit, conversion du prix et jsonify ;
+- avec ProductJsonCache : concaténation des fragments sérialisés à l'écriture.
+
+Usage :
+    python -m benchmarks.bench_product_json
+"""
+
+import timeit
+from decimal import Decimal
+
+from flask import jsonify
+
+from src.api.app import create_app
+from src.api.payloads import product_payload
+from src.models.product import Product
+
+CATEGORIES = ["food", "electronics", "clothing", "other"]
+
+
+def main() -> None:
+    """Affiche la durée de construction des réponses, avec et sans cache."""
+    app = create_app()
+    products = [
+        Product(id=f"prod{i}", name=f"Produit {i}", price=Decimal(i % 10_000) / 100,
+                category=CATEGORIES[i % len(CATEGORIES)])
+        for i in range(10_000)
+    ]
+    app.extensions["repository"].add_products(products)
+    cache = app.extensions["product_json_cache"]
+    cache.put_many(products)
+
+    rounds = 2000
+    print(f"{'réponse':>14} | {'sans cache (µs)':>15} | {'avec cache (µs)':>15}")
+    print("-" * 52)
+    with app.app_context():
+        for size in (1, 100, 1000):
+            page = products[:size]
+            if size == 1:
+                uncached = lambda: jsonify(product_payload(page[0])).get_data()  # noqa: E731
+                cached = lambda: app.response_class(  # noqa: E731
+                    cache.get(page[0]), mimetype="application/json"
+                ).get_data()
+            else:
+                uncached = lambda: jsonify(  # noqa: E731
+                    {"products": [product_payload(product) for product in page]}
+                ).get_data()
+                cached = lambda: app.response_class(  # noqa: E731
+                    b'{"products":' + cache.dumps_list(page) + b"}", mimetype="application/json"
+                ).get_data()
+            number = max(1, rounds // size)
+            before = timeit.timeit(uncached, number=number) / number
+            after = timeit.timeit(cached, number=number) / number
+            label = "1 produit" if size == 1 else f"page de {size}"
+            print(f"{label:>14} | {before * 1e6:>15.1f} | {after * 1e6:>15.1f}")
+    print(f"Statistiques : {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
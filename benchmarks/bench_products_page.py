@@ -0,0 +1,55 @@
+"""
+Benchmark de la pagination de GET /products.
+
+Compare, pour des catalogues de tailles croissantes, la durée d'une page
+de 100 produits (première page et page au milieu du catalogue, via le
+curseur) et celle de l'ancienne liste complète du catalogue.
+
+Usage :
+    python -m benchmarks.bench_products_page
+"""
+
+import json
+import logging
+import timeit
+from decimal import Decimal
+
+from src.api.app import create_app
+from src.api.payloads import encode_cursor, product_payload
+from src.models.product import Product
+
+CATEGORIES = ["food", "electronics", "clothing", "other"]
+
+
+def main() -> None:
+    """Affiche la durée d'une page et de la liste complète par taille de catalogue."""
+    logging.disable(logging.INFO)
+    print(f"{'produits':>9} | {'1re page (ms)':>13} | {'page du milieu (ms)':>19} | "
+          f"{'liste complète (ms)':>19}")
+    print("-" * 71)
+    for size in (10_000, 100_000, 500_000):
+        app = create_app()
+        client = app.test_client()
+        products = [
+            Product(id=f"prod{i}", name=f"Produit {i}", price=Decimal(i % 10_000) / 100,
+                    category=CATEGORIES[i % len(CATEGORIES)])
+            for i in range(size)
+        ]
+        # Remplissage direct du dépôt de l'application, sans passer par HTTP
+        app.extensions["repository"].add_products(products)
+
+        middle = encode_cursor(size // 2)
+        rounds = 200
+        first = timeit.timeit(lambda: client.get("/products?limit=100"), number=rounds) / rounds
+        mid = timeit.timeit(
+            lambda: client.get(f"/products?limit=100&cursor={middle}"), number=rounds
+        ) / rounds
+        full = timeit.timeit(
+            lambda: json.dumps({"products": [product_payload(p) for p in products]}),
+            number=1,
+        )
+        print(f"{size:>9} | {first * 1000:>13.2f} | {mid * 1000:>19.2f} | {full * 1000:>19.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark des dépôts de produits.
+
+Compare le dépôt en mémoire, le dépôt SQLite et le dépôt SQLite derrière
+CachedRepository :
+- écriture de N produits par lots de 1000 (une transaction par lot), et,
+  sur un échantillon, un produit par transaction ;
+- lecture des produits d'un panier de 10 lignes (get_products) ;
+- lecture d'une page de 100 produits (page_products).
+
+Usage :
+    python -m benchmarks.bench_repository [nombre_de_produits]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import timeit
+from decimal import Decimal
+from typing import Callable, Dict, List
+
+from src.models.product import Product
+from src.repositories import (
+    CachedRepository,
+    CatalogRepository,
+    InMemoryRepository,
+    SQLiteRepository,
+)
+
+CATEGORIES = ["food", "electronics", "clothing", "other"]
+BATCH_SIZE = 1000
+
+
+def main() -> None:
+    """Affiche le débit d'écriture et la durée des lectures de chaque dépôt."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    products = [
+        Product(id=f"prod{i}", name=f"Produit {i}", price=Decimal(i % 10_000) / 100,
+                category=CATEGORIES[i % len(CATEGORIES)])
+        for i in range(count)
+    ]
+    rng = random.Random(0)
+    carts = [[f"prod{rng.randrange(count)}" for _ in range(10)] for _ in range(1000)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        factories: Dict[str, Callable[[str], CatalogRepository]] = {
+            "mémoire": lambda path: InMemoryRepository(),
+            "SQLite": SQLiteRepository,
+            "SQLite + cache": lambda path: CachedRepository(SQLiteRepository(path)),
+        }
+        print(f"Produits : {count}")
+        print(f"{'dépôt':>15} | {'écriture (produits/s)':>21} | {'panier (µs)':>11} | "
+              f"{'page de 100 (µs)':>16}")
+        print("-" * 74)
+        for index, (label, factory) in enumerate(factories.items()):
+            repository = factory(os.path.join(directory, f"bench{index}.db"))
+            start = time.perf_counter()
+            for offset in range(0, count, BATCH_SIZE):
+                repository.add_products(products[offset:offset + BATCH_SIZE])
+            write_rate = count / (time.perf_counter() - start)
+
+            cart_iter = iter(carts * 100)
+            cart = timeit.timeit(lambda: repository.get_products(next(cart_iter)), number=5000)
+            cursors: List[int] = [0]
+            for _ in range(50):
+                next_cursor = repository.page_products(cursors[-1], 100)[1]
+                if next_cursor is None:
+                    break
+                cursors.append(next_cursor)
+            cursor_iter = iter(cursors * 100)
+            page = timeit.timeit(
+                lambda: repository.page_products(next(cursor_iter), 100), number=2000
+            )
+            print(f"{label:>15} | {write_rate:>21,.0f} | {cart / 5000 * 1e6:>11.1f} | "
+                  f"{page / 2000 * 1e6:>16.1f}")
+            repository.close()
+
+        single = SQLiteRepository(os.path.join(directory, "single.db"))
+        sample = products[:2000]
+        start = time.perf_counter()
+        for product in sample:
+            single.add_product(product)
+        elapsed = time.perf_counter() - start
+        print(f"SQLite, un produit par transaction : {len(sample) / elapsed:,.0f} produits/s")
+        single.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark des modes de service de l'API.
+
+Lance ``python -m src.main`` dans un sous-processus, une fois avec le
+serveur de développement Flask (``--dev``, app.run) et une fois avec le
+serveur prefork, sur une base SQLite temporaire. Des threads clients
+envoient ensuite des requêtes concurrentes (une connexion par requête).
+Le benchmark affiche le débit et les latences de GET /products/<id> et
+de POST /checkout.
+
+Usage :
+    python -m benchmarks.bench_server [--workers 4] [--requests 2000] [--concurrency 8]
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def _free_port() -> int:
+    """Retourne un port TCP libre."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+def _request(url: str, body: Optional[bytes] = None) -> None:
+    """Envoie une requête et lit la réponse."""
+    request = urllib.request.Request(
+        url, data=body, headers={"Content-Type": "application/json"} if body else {}
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        response.read()
+
+
+def _start(args: Sequence[str], port: int) -> "subprocess.Popen[bytes]":
+    """Lance l'API et attend qu'elle réponde."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.main", "--host", "127.0.0.1", "--port", str(port), *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            _request(f"http://127.0.0.1:{port}/health")
+            return process
+        except OSError:
+            if time.monotonic() > deadline:
+                process.kill()
+                raise
+            time.sleep(0.1)
+
+
+def _load(
+    url: str, body: Optional[bytes], requests: int, concurrency: int
+) -> Tuple[float, float, float]:
+    """Envoie des requêtes concurrentes ; retourne (débit, latence p50, latence p99)."""
+    latencies: List[float] = []
+    lock = threading.Lock()
+    per_thread = requests // concurrency
+
+    def client() -> None:
+        local: List[float] = []
+        for _ in range(per_thread):
+            start = time.perf_counter()
+            _request(url, body)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return (
+        len(latencies) / elapsed,
+        latencies[len(latencies) // 2],
+        latencies[int(len(latencies) * 0.99)],
+    )
+
+
+def main() -> None:
+    """Affiche le débit et les latences de chaque mode de service."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_server")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    modes: Dict[str, List[str]] = {
+        "app.run (threads)": ["--dev"],
+        f"prefork ({args.workers} workers)": ["--workers", str(args.workers)],
+    }
+    checkout = json.dumps(
+        {"items": [{"product_id": f"prod{i}", "quantity": i + 1} for i in range(5)]}
+    ).encode("utf-8")
+    print(f"Processeurs : {os.cpu_count()}, requêtes : {args.requests}, "
+          f"clients concurrents : {args.concurrency}")
+    print(f"{'serveur':>22} | {'requête':>18} | {'req/s':>7} | {'p50 (ms)':>8} | "
+          f"{'p99 (ms)':>8}")
+    print("-" * 76)
+    with tempfile.TemporaryDirectory() as directory:
+        for index, (label, mode_args) in enumerate(modes.items()):
+            port = _free_port()
+            database = os.path.join(directory, f"bench{index}.db")
+            process = _start([*mode_args, "--database", database], port)
+            try:
+                base = f"http://127.0.0.1:{port}"
+                for i in range(5):
+                    product = {"id": f"prod{i}", "name": f"Produit {i}", "price": "9.99",
+                               "category": "food"}
+                    _request(base + "/products", json.dumps(product).encode("utf-8"))
+                for name, url, body in (
+                    ("GET /products/<id>", base + "/products/prod1", None),
+                    ("POST /checkout", base + "/checkout", checkout),
+                ):
+                    _load(url, body, args.concurrency * 10, args.concurrency)  # préchauffage
+                    rate, p50, p99 = _load(url, body, args.requests, args.concurrency)
+                    print(f"{label:>22} | {name:>18} | {rate:>7,.0f} | {p50 * 1000:>8.1f} | "
+                          f"{p99 * 1000:>8.1f}")
+            finally:
+                process.terminate()
+                process.wait(timeout=60)
+
+
+if __name__ == "__main__":
+    main()
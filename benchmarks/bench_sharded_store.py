@@ -0,0 +1,94 @@
+"""
+Benchmark du dictionnaire partitionné (ShardedStore).
+
+Compare, pour 1 à 8 threads, le débit total :
+- des lectures : ShardedStore.get (sans verrou) et un dict protégé par un
+  verrou global, pris à chaque lecture ;
+- des ajouts si absent : ShardedStore.insert_if_absent (verrou de la
+  partition) et un dict protégé par un verrou global.
+
+Usage :
+    python -m benchmarks.bench_sharded_store [opérations_par_thread]
+"""
+
+import sys
+import threading
+import time
+from typing import Callable, Dict, List
+
+from src.models.sharded_store import ShardedStore
+
+
+class LockedDict:
+    """Dict protégé par un verrou unique (référence)."""
+
+    def __init__(self) -> None:
+        self._data: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> object:
+        with self._lock:
+            return self._data.get(key)
+
+    def insert_if_absent(self, key: str, value: int) -> bool:
+        with self._lock:
+            if key in self._data:
+                return False
+            self._data[key] = value
+            return True
+
+
+def _throughput(thread_count: int, work: Callable[[int], None], operations: int) -> float:
+    """Exécute work dans thread_count threads et retourne le débit total (opérations/s)."""
+    barrier = threading.Barrier(thread_count + 1)
+
+    def run(worker: int) -> None:
+        barrier.wait()
+        work(worker)
+
+    threads = [threading.Thread(target=run, args=(worker,)) for worker in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return thread_count * operations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Affiche le débit des lectures et des ajouts selon le nombre de threads."""
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    keys: List[str] = [f"prod{i}" for i in range(10_000)]
+    print(f"{'threads':>7} | {'lectures partitionnées':>22} | {'lectures verrou global':>22} | "
+          f"{'ajouts partitionnés':>19} | {'ajouts verrou global':>20}")
+    print("-" * 104)
+    for thread_count in (1, 2, 4, 8):
+        results = []
+        for factory in (ShardedStore, LockedDict):
+            store = factory()
+            for index, key in enumerate(keys):
+                store.insert_if_absent(key, index)
+
+            def read(worker: int, store=store) -> None:
+                get = store.get
+                for index in range(operations):
+                    get(keys[index % 10_000])
+
+            results.append(_throughput(thread_count, read, operations))
+        for factory in (ShardedStore, LockedDict):
+            store = factory()
+
+            def insert(worker: int, store=store) -> None:
+                add = store.insert_if_absent
+                for index in range(operations):
+                    add(f"{worker}-{index}", index)
+
+            results.append(_throughput(thread_count, insert, operations))
+        print(f"{thread_count:>7} | " + " | ".join(
+            f"{rate:>{width},.0f}" for rate, width in zip(results, (22, 22, 19, 20))
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark du calcul de taxes groupé par catégorie.
+
+Simule la réconciliation nocturne des taxes sur un historique de commandes :
+l'approche d'origine recherche le taux et multiplie pour chaque ligne,
+calculate_tax_for_lines regroupe les lignes par catégorie et n'applique
+chaque taux qu'une fois, et calculate_tax_batch taxe des paniers déjà
+agrégés avec une table de taux partagée.
+
+Usage :
+    python -m benchmarks.bench_tax [nombre_de_commandes] [lignes_par_commande]
+"""
+
+import sys
+import time
+from decimal import Decimal
+from typing import Callable, List, Tuple, TypeVar
+
+from src.models.cart import Cart
+from src.models.product import Product
+from src.services.tax_calculator import TaxCalculator
+
+TAX_RATES = {
+    "food": Decimal("0.10"),
+    "electronics": Decimal("0.20"),
+    "clothing": Decimal("0.15"),
+    "other": Decimal("0.18"),
+}
+CATEGORIES = list(TAX_RATES) + ["gift"]
+
+T = TypeVar("T")
+
+Order = List[Tuple[str, Decimal]]
+
+
+def per_line_tax(order: Order) -> Decimal:
+    """Algorithme d'origine : une recherche et une multiplication par ligne."""
+    total_tax = Decimal("0")
+    for category, amount in order:
+        total_tax += amount * TAX_RATES.get(category, Decimal("0"))
+    return total_tax
+
+
+def measure(run: Callable[[], T]) -> Tuple[float, T]:
+    """Retourne (durée totale, résultat) du meilleur de trois essais."""
+    best = float("inf")
+    result = run()
+    for _ in range(3):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    """Affiche la durée des trois approches sur le même historique."""
+    orders_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    lines_per_order = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    calculator = TaxCalculator(TAX_RATES)
+
+    orders: List[Order] = []
+    carts: List[Cart] = []
+    for n in range(orders_count):
+        cart = Cart(journal_size=0)
+        order: Order = []
+        for i in range(lines_per_order):
+            product = Product(
+                id=f"prod{i}",
+                name="Produit",
+                price=Decimal((n * 31 + i * 17) % 10_000) / 100,
+                category=CATEGORIES[(n + i) % len(CATEGORIES)],
+            )
+            cart.add_item(product, i % 3 + 1)
+            order.append((product.category, product.price * (i % 3 + 1)))
+        orders.append(order)
+        carts.append(cart)
+
+    legacy = measure(lambda: [per_line_tax(order) for order in orders])
+    grouped = measure(lambda: [calculator.calculate_tax_for_lines(order) for order in orders])
+    batch = measure(lambda: calculator.calculate_tax_batch(carts))
+
+    print(f"Commandes : {orders_count} x {lines_per_order} lignes")
+    print(f"{'approche':>22} | {'durée (ms)':>10}")
+    print("-" * 36)
+    print(f"{'par ligne (origine)':>22} | {legacy[0] * 1e3:>10.2f}")
+    print(f"{'lignes groupées':>22} | {grouped[0] * 1e3:>10.2f}")
+    print(f"{'lot de paniers':>22} | {batch[0] * 1e3:>10.2f}")
+    print(f"Résultats identiques : {legacy[1] == grouped[1] == batch[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,104 @@
 """Application Flask principale."""
 
 import logging
-from decimal import Decimal
-from typing import Dict, Optional
+from typing import Optional
 
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 
-from ..models.cart import Cart
-from ..models.discount import Discount, DiscountType
-from ..models.product import Product
+from ..models.cart import MissingProductsError
+from ..models.discount import Discount
+from ..models.money import Rounding
+from ..repositories.base import CatalogRepository, DuplicateError
+from ..repositories.cached import CachedRepository
+from ..repositories.memory import InMemoryRepository
+from ..services.checkout_cache import CheckoutCache
 from ..services.checkout_service import CheckoutService
-from ..services.tax_calculator import TaxCalculator
+from ..services.discount_index import DiscountIndex
+from ..services.tax_calculator import DEFAULT_TAX_RATES, TaxCalculator
+from .checkout import cached_checkout
+from .extended_routes import extended_routes
+from .json_cache import ProductJsonCache
+from .json_provider import CheckoutJSONProvider
+from .payloads import (
+    decode_cursor,
+    dumps_json,
+    encode_cursor,
+    discount_from_payload,
+    product_from_payload,
+)
 
 logger = logging.getLogger(__name__)
 
 
-def create_app() -> Flask:
-    """Crée et configure l'application Flask."""
+def _page_limit(limit_arg: Optional[str], default: int, max_limit: int) -> int:
+    """
+    Valide le paramètre limit de GET /products.
+
+    Raises:
+        ValueError: Si limit n'est pas un entier compris entre 1 et max_limit
+    """
+    limit = default
+    if limit_arg is not None:
+        limit = int(limit_arg) if limit_arg.isdigit() else 0
+    if not 0 < limit <= max_limit:
+        raise ValueError(f"limit doit être compris entre 1 et {max_limit}")
+    return limit
+
+
+def create_app(
+    money_rounding: Optional[Rounding] = None, repository: Optional[CatalogRepository] = None
+) -> Flask:
+    """
+    Crée et configure l'application Flask.
+
+    Args:
+        money_rounding: Si fourni, le checkout est calculé en centimes entiers
+            (type Money) avec ce mode d'arrondi ; les montants ne sont
+            convertis en chaînes qu'au moment de la réponse JSON
+        repository: Dépôt des produits et des remises (par défaut, un dépôt
+            en mémoire propre à l'application)
+    """
     app = Flask(__name__)
+    # Montants et modèles encodés directement, par orjson s'il est installé
+    app.json = CheckoutJSONProvider(app)
     
     # Configuration CORS pour permettre les requêtes depuis le navigateur
     CORS(app, resources={r"/*": {"origins": "*"}})
 
     # Configuration des taux de taxe par défaut
-    default_tax_rates = {
-        "food": Decimal("0.10"),
-        "electronics": Decimal("0.20"),
-        "clothing": Decimal("0.15"),
-        "other": Decimal("0.18"),
-    }
-
-    tax_calculator = TaxCalculator(default_tax_rates)
-    checkout_service = CheckoutService(tax_calculator)
-
-    # Stockage en mémoire (pour la démo, utiliser une DB en production)
-    products_db: Dict[str, Product] = {}
-    discounts_db: Dict[str, Discount] = {}
+    tax_calculator = TaxCalculator(dict(DEFAULT_TAX_RATES))
+    checkout_service = CheckoutService(tax_calculator, money_rounding=money_rounding)
+    app.extensions["checkout_service"] = checkout_service
+    # Les clients renvoient souvent le même panier : résultats mémorisés par empreinte
+    checkout_cache = CheckoutCache(tax_calculator)
+    app.extensions["checkout_cache"] = checkout_cache
+    # Nombre maximal de paniers par requête /checkout/batch
+    app.config.setdefault("CHECKOUT_BATCH_MAX_SIZE", 500)
+    # Imports en masse : enregistrements insérés par lot, erreurs détaillées au plus
+    app.config.setdefault("BULK_IMPORT_BATCH_SIZE", 1000)
+    app.config.setdefault("BULK_IMPORT_MAX_ERRORS", 100)
+    # Pagination de GET /products
+    app.config.setdefault("PRODUCTS_PAGE_DEFAULT_LIMIT", 100)
+    app.config.setdefault("PRODUCTS_PAGE_MAX_LIMIT", 1000)
+
+    # Produits et remises : en mémoire par défaut, SQLite en production (voir main)
+    if repository is None:
+        repository = InMemoryRepository()
+    app.extensions["repository"] = repository
+    # JSON de chaque produit, sérialisé à l'écriture et réutilisé par les lectures ;
+    # borné comme le cache du dépôt, pour ne pas retenir plus de produits que lui
+    product_json_cache = ProductJsonCache(
+        repository.max_entries if isinstance(repository, CachedRepository) else 100_000
+    )
+    app.extensions["product_json_cache"] = product_json_cache
+    # Index des remises pour /checkout/best-discount, tenu à jour avec le dépôt :
+    # chaque recherche lit d'abord les remises ajoutées depuis, par tout processus
+    discount_index = DiscountIndex()
+    discount_index.refresh(repository.discounts_after)
+    app.extensions["discount_index"] = discount_index
+    # Imports en masse, checkout par lot, meilleure remise et statistiques
+    app.register_blueprint(extended_routes)
 
     @app.route("/health", methods=["GET"])
     def health_check() -> tuple:
@@ -51,19 +113,19 @@ def create_app() -> Flask:
             if not data:
                 return jsonify({"error": "Données JSON requises"}), 400
 
-            product = Product(
-                id=data["id"],
-                name=data["name"],
-                price=Decimal(str(data["price"])),
-                category=data.get("category", "other"),
-            )
+            product = product_from_payload(data)
 
-            if product.id in products_db:
+            try:
+                repository.add_product(product)
+            except DuplicateError:
                 return jsonify({"error": "Produit déjà existant"}), 409
 
-            products_db[product.id] = product
+            product_json_cache.put(product)
+            checkout_cache.invalidate_product(product.id)
 
-            logger.info("Produit créé", extra={"product_id": product.id, "product_name": product.name})
+            logger.info(
+                "Produit créé", extra={"product_id": product.id, "product_name": product.name}
+            )
             return jsonify({"id": product.id, "name": product.name}), 201
 
         except KeyError as e:
@@ -72,25 +134,47 @@ def create_app() -> Flask:
         except ValueError as e:
             logger.warning("Données invalides", extra={"error": str(e)})
             return jsonify({"error": str(e)}), 400
-        except Exception as e:
+        except Exception:
             logger.error("Erreur lors de la création du produit", exc_info=True)
             return jsonify({"error": "Erreur interne du serveur"}), 500
 
     @app.route("/products", methods=["GET"])
     def list_products() -> tuple:
-        """Liste tous les produits."""
+        """
+        Liste les produits, page par page.
+
+        Paramètres : limit (taille de page), category (filtre) et cursor
+        (le next_cursor de la page précédente). Les produits sont dans leur
+        ordre de création ; next_cursor vaut null sur la dernière page.
+        """
         try:
-            products = [
-                {
-                    "id": product.id,
-                    "name": product.name,
-                    "price": str(product.price),
-                    "category": product.category,
-                }
-                for product in products_db.values()
-            ]
-            return jsonify({"products": products}), 200
-        except Exception as e:
+            category = request.args.get("category") or None
+            limit = _page_limit(
+                request.args.get("limit"),
+                app.config["PRODUCTS_PAGE_DEFAULT_LIMIT"],
+                app.config["PRODUCTS_PAGE_MAX_LIMIT"],
+            )
+            cursor = request.args.get("cursor")
+            position = decode_cursor(cursor, category) if cursor else 0
+
+            page, next_position = repository.page_products(position, limit, category)
+            next_cursor = (
+                encode_cursor(next_position, category) if next_position is not None else None
+            )
+            body = b"".join(
+                (
+                    b'{"products":',
+                    product_json_cache.dumps_list(page),
+                    b',"next_cursor":',
+                    dumps_json(next_cursor),
+                    b"}",
+                )
+            )
+            return app.response_class(body, mimetype="application/json"), 200
+        except ValueError as e:
+            logger.warning("Paramètres de pagination invalides", extra={"error": str(e)})
+            return jsonify({"error": str(e)}), 400
+        except Exception:
             logger.error("Erreur lors de la récupération des produits", exc_info=True)
             return jsonify({"error": "Erreur interne du serveur"}), 500
 
@@ -98,23 +182,16 @@ def create_app() -> Flask:
     def get_product(product_id: str) -> tuple:
         """Récupère un produit par son ID."""
         try:
-            product = products_db.get(product_id)
+            product = repository.get_product(product_id)
             if not product:
                 logger.warning("Produit non trouvé", extra={"product_id": product_id})
                 return jsonify({"error": "Produit non trouvé"}), 404
 
             return (
-                jsonify(
-                    {
-                        "id": product.id,
-                        "name": product.name,
-                        "price": str(product.price),
-                        "category": product.category,
-                    }
-                ),
+                app.response_class(product_json_cache.get(product), mimetype="application/json"),
                 200,
             )
-        except Exception as e:
+        except Exception:
             logger.error("Erreur lors de la récupération du produit", exc_info=True)
             return jsonify({"error": "Erreur interne du serveur"}), 500
 
@@ -126,19 +203,15 @@ def create_app() -> Flask:
             if not data:
                 return jsonify({"error": "Données JSON requises"}), 400
 
-            discount_type = DiscountType(data["type"])
-            discount = Discount(
-                code=data["code"],
-                discount_type=discount_type,
-                value=Decimal(str(data["value"])),
-                min_amount=Decimal(str(data["min_amount"])) if data.get("min_amount") else None,
-                category=data.get("category"),
-            )
+            discount = discount_from_payload(data)
 
-            if discount.code in discounts_db:
+            try:
+                repository.add_discount(discount)
+            except DuplicateError:
                 return jsonify({"error": "Code de remise déjà existant"}), 409
 
-            discounts_db[discount.code] = discount
+            discount_index.add(discount)
+            checkout_cache.invalidate_discount(discount.code)
 
             logger.info("Remise créée", extra={"code": discount.code})
             return jsonify({"code": discount.code}), 201
@@ -149,7 +222,7 @@ def create_app() -> Flask:
         except ValueError as e:
             logger.warning("Données invalides", extra={"error": str(e)})
             return jsonify({"error": str(e)}), 400
-        except Exception as e:
+        except Exception:
             logger.error("Erreur lors de la création de la remise", exc_info=True)
             return jsonify({"error": "Erreur interne du serveur"}), 500
 
@@ -165,41 +238,26 @@ def create_app() -> Flask:
             if not items:
                 return jsonify({"error": "Le panier ne peut pas être vide"}), 400
 
-            cart = Cart()
-            for item_data in items:
-                product_id = item_data["product_id"]
-                quantity = item_data["quantity"]
-
-                product = products_db.get(product_id)
-                if not product:
-                    logger.warning("Produit non trouvé dans le panier", extra={"product_id": product_id})
-                    return jsonify({"error": f"Produit {product_id} non trouvé"}), 404
-
-                cart.add_item(product, quantity)
+            lines = [(item_data["product_id"], item_data["quantity"]) for item_data in items]
 
             discount_code = data.get("discount_code")
             discount: Optional[Discount] = None
             if discount_code:
-                discount = discounts_db.get(discount_code)
+                discount = repository.get_discount(discount_code)
                 if not discount:
                     logger.warning("Code de remise invalide", extra={"code": discount_code})
                     return jsonify({"error": f"Code de remise {discount_code} invalide"}), 404
 
-            result = checkout_service.calculate_total(cart, discount)
+            try:
+                result = cached_checkout(lines, discount_code, discount)
+            except MissingProductsError as e:
+                logger.warning(
+                    "Produits non trouvés dans le panier", extra={"product_ids": e.product_ids}
+                )
+                return jsonify({"error": str(e), "missing_products": e.product_ids}), 404
 
             logger.info("Checkout calculé", extra={"total": str(result["total"])})
-            return (
-                jsonify(
-                    {
-                        "subtotal": str(result["subtotal"]),
-                        "discount_amount": str(result["discount_amount"]),
-                        "subtotal_after_discount": str(result["subtotal_after_discount"]),
-                        "tax_amount": str(result["tax_amount"]),
-                        "total": str(result["total"]),
-                    }
-                ),
-                200,
-            )
+            return jsonify(result), 200
 
         except KeyError as e:
             logger.warning("Champ manquant dans la requête", extra={"field": str(e)})
@@ -207,9 +265,8 @@ def create_app() -> Flask:
         except ValueError as e:
             logger.warning("Données invalides", extra={"error": str(e)})
             return jsonify({"error": str(e)}), 400
-        except Exception as e:
+        except Exception:
             logger.error("Erreur lors du checkout", exc_info=True)
             return jsonify({"error": "Erreur interne du serveur"}), 500
 
     return app
-
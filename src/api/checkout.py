@@ -0,0 +1,53 @@
+"""
+Checkout via le cache, partagé par les routes de l'API.
+
+Les routes de base (create_app) et les routes étendues (extended_routes)
+calculent leurs checkouts par cached_checkout, à partir des composants
+partagés rangés dans ``app.extensions``.
+"""
+
+from typing import Any, List, Mapping, Optional, Tuple
+
+from flask import current_app
+
+from ..models.cart import Cart
+from ..models.discount import Discount
+from ..models.product import Product
+from ..repositories.base import CatalogRepository
+from ..services.checkout_cache import CheckoutCache
+from ..services.checkout_service import CheckoutService
+
+
+def app_component(name: str) -> Any:
+    """Retourne un composant partagé de l'application (dépôt, caches, services)."""
+    return current_app.extensions[name]
+
+
+def cached_checkout(
+    lines: List[Tuple[str, int]],
+    discount_code: Optional[str],
+    discount: Optional[Discount],
+    catalog: Optional[Mapping[str, Product]] = None,
+) -> dict:
+    """
+    Calcule le checkout de lignes (ID de produit, quantité), via le cache.
+
+    Les produits sont lus dans catalog s'il est fourni, sinon dans le
+    dépôt, et seulement si le résultat est absent du cache.
+
+    Raises:
+        MissingProductsError: Si des produits sont absents du catalogue
+        ValueError: Si des quantités sont invalides
+    """
+    repository: CatalogRepository = app_component("repository")
+    checkout_service: CheckoutService = app_component("checkout_service")
+    checkout_cache: CheckoutCache = app_component("checkout_cache")
+
+    def compute() -> dict:
+        """Construit le panier et calcule le checkout (absent du cache)."""
+        products = catalog
+        if products is None:
+            products = repository.get_products(product_id for product_id, _ in lines)
+        return checkout_service.calculate_total(Cart.from_lines(lines, products), discount)
+
+    return checkout_cache.get_or_compute(lines, discount_code, compute)
@@ -0,0 +1,308 @@
+"""
+Routes étendues de l'API, au-delà des routes de base de create_app.
+
+Imports NDJSON de produits et de remises, checkout par lot, recherche de la
+meilleure remise et statistiques des caches. Ces routes forment un
+blueprint enregistré par create_app ; elles partagent avec les routes de
+base le dépôt, les caches et le service de checkout, rangés dans
+``app.extensions`` (voir checkout.app_component).
+"""
+
+import logging
+from typing import IO, Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, TypeVar
+
+from flask import Blueprint, current_app, jsonify, request
+
+from ..models.cart import Cart, MissingProductsError
+from ..models.discount import Discount
+from ..models.product import Product
+from ..repositories.cached import CachedRepository
+from .checkout import app_component, cached_checkout
+from .payloads import discount_from_payload, iter_ndjson_lines, loads_json, product_from_payload
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+# Ligne refusée d'un import en masse : (numéro de ligne, message)
+BulkError = Tuple[int, str]
+
+extended_routes = Blueprint("extended", __name__)
+
+
+def _numbered_records(stream: IO[bytes]) -> Iterator[List[Tuple[int, bytes]]]:
+    """Lit un corps NDJSON par blocs : ses lignes non vides, avec leur numéro."""
+    number = 0
+    for lines in iter_ndjson_lines(stream):
+        block = []
+        for line in lines:
+            number += 1
+            if line.strip():
+                block.append((number, line))
+        yield block
+
+
+def bulk_import(
+    build: Callable[[Any], T], insert: Callable[[List[Tuple[int, T]]], List[BulkError]]
+) -> Optional[Dict[str, object]]:
+    """
+    Importe les enregistrements NDJSON du corps de la requête.
+
+    Le corps est lu et analysé par blocs, sans être chargé en entier.
+    Chaque ligne non vide est validée par build ; les enregistrements
+    valides sont transmis à insert par lots de BULK_IMPORT_BATCH_SIZE,
+    et les lignes refusées sont signalées avec leur numéro.
+
+    Args:
+        build: Construit le modèle d'un enregistrement JSON
+        insert: Insère un lot de (numéro de ligne, modèle) et retourne
+            les lignes refusées (numéro de ligne, message)
+
+    Returns:
+        Le bilan de l'import (created, error_count, errors), ou None si
+        le corps ne contient aucun enregistrement
+    """
+    batch_size = current_app.config["BULK_IMPORT_BATCH_SIZE"]
+    max_errors = current_app.config["BULK_IMPORT_MAX_ERRORS"]
+    records = created = error_count = 0
+    errors: List[Dict[str, object]] = []
+    batch: List[Tuple[int, T]] = []
+    # Lignes invalides du lot en cours, signalées avec ses refus d'insertion
+    invalid: List[BulkError] = []
+
+    def flush() -> None:
+        nonlocal created, error_count
+        refused = insert(batch) if batch else []
+        created += len(batch) - len(refused)
+        rejected = sorted(invalid + refused)
+        error_count += len(rejected)
+        for number, message in rejected[: max(0, max_errors - len(errors))]:
+            errors.append({"line": number, "error": message})
+        batch.clear()
+        invalid.clear()
+
+    for records_block in _numbered_records(request.stream):
+        records += len(records_block)
+        for number, line in records_block:
+            try:
+                batch.append((number, build(loads_json(line))))
+            except KeyError as e:
+                invalid.append((number, f"Champ requis manquant: {e}"))
+            except (TypeError, ValueError) as e:
+                invalid.append((number, str(e) or "Enregistrement invalide"))
+        if len(batch) + len(invalid) >= batch_size:
+            flush()
+    flush()
+
+    if not records:
+        return None
+    return {"created": created, "error_count": error_count, "errors": errors}
+
+
+def _bulk_response(
+    build: Callable[[Any], T], insert: Callable[[List[Tuple[int, T]]], List[BulkError]], what: str
+) -> tuple:
+    """Importe le corps NDJSON de la requête et construit la réponse (what : "produits"...)."""
+    try:
+        summary = bulk_import(build, insert)
+        if summary is None:
+            return jsonify({"error": "Données NDJSON requises"}), 400
+        logger.info(
+            f"Import de {what} terminé",
+            extra={"created": summary["created"], "error_count": summary["error_count"]},
+        )
+        return jsonify(summary), 200
+    except Exception:
+        logger.error(f"Erreur lors de l'import des {what}", exc_info=True)
+        return jsonify({"error": "Erreur interne du serveur"}), 500
+
+
+@extended_routes.route("/stats", methods=["GET"])
+def cache_stats() -> tuple:
+    """Retourne les statistiques des caches de l'API."""
+    repository = app_component("repository")
+    stats: Dict[str, object] = {
+        "checkout_cache": app_component("checkout_cache").stats(),
+        "product_json_cache": app_component("product_json_cache").stats(),
+    }
+    if isinstance(repository, CachedRepository):
+        stats["repository_cache"] = repository.stats()
+    return jsonify(stats), 200
+
+
+@extended_routes.route("/products/bulk", methods=["POST"])
+def bulk_create_products() -> tuple:
+    """Crée des produits à partir d'un corps NDJSON (un produit par ligne)."""
+    repository = app_component("repository")
+
+    def insert(batch: List[Tuple[int, Product]]) -> List[BulkError]:
+        # Une seule écriture (une transaction SQLite) par lot
+        rejected = set(repository.add_products([product for _, product in batch]))
+        added = [product for index, (_, product) in enumerate(batch) if index not in rejected]
+        app_component("checkout_cache").invalidate_products(product.id for product in added)
+        return [(batch[index][0], "Produit déjà existant") for index in sorted(rejected)]
+
+    return _bulk_response(product_from_payload, insert, "produits")
+
+
+@extended_routes.route("/discounts/bulk", methods=["POST"])
+def bulk_create_discounts() -> tuple:
+    """Crée des remises à partir d'un corps NDJSON (une remise par ligne)."""
+    repository = app_component("repository")
+
+    def insert(batch: List[Tuple[int, Discount]]) -> List[BulkError]:
+        rejected = set(repository.add_discounts([discount for _, discount in batch]))
+        for index, (_, discount) in enumerate(batch):
+            if index not in rejected:
+                app_component("discount_index").add(discount)
+                app_component("checkout_cache").invalidate_discount(discount.code)
+        message = "Code de remise déjà existant"
+        return [(batch[index][0], message) for index in sorted(rejected)]
+
+    return _bulk_response(discount_from_payload, insert, "remises")
+
+
+def _batch_product_ids(carts: List[Any]) -> Dict[str, None]:
+    """Retourne les IDs de produit de tous les paniers d'un lot, sans doublon."""
+    product_ids: Dict[str, None] = {}
+    for cart_data in carts:
+        if isinstance(cart_data, dict) and isinstance(cart_data.get("items"), list):
+            for item_data in cart_data["items"]:
+                if isinstance(item_data, dict) and isinstance(item_data.get("product_id"), str):
+                    product_ids[item_data["product_id"]] = None
+    return product_ids
+
+
+def _batch_cart_lines(cart_data: object) -> Tuple[List[Tuple[str, int]], Optional[str]]:
+    """
+    Retourne les lignes (ID de produit, quantité) et le code de remise d'un panier du lot.
+
+    Raises:
+        KeyError: Si un champ d'une ligne est absent
+        TypeError: Si une ligne n'est pas un objet
+        ValueError: Si le panier est invalide ou vide
+    """
+    if not isinstance(cart_data, dict):
+        raise ValueError("Panier invalide")
+    items = cart_data.get("items")
+    if not items or not isinstance(items, list):
+        raise ValueError("Le panier ne peut pas être vide")
+    lines = [(item_data["product_id"], item_data["quantity"]) for item_data in items]
+    return lines, cart_data.get("discount_code")
+
+
+def _batch_cart_result(
+    index: int, cart_data: object, catalog: Mapping[str, Product]
+) -> Dict[str, object]:
+    """Calcule le résultat d'un panier du lot, ou son erreur."""
+    payload: Dict[str, object] = {"index": index}
+    if isinstance(cart_data, dict) and "id" in cart_data:
+        payload["id"] = cart_data["id"]
+    try:
+        lines, discount_code = _batch_cart_lines(cart_data)
+        discount: Optional[Discount] = None
+        if discount_code:
+            discount = app_component("repository").get_discount(discount_code)
+            if not discount:
+                payload["error"] = f"Code de remise {discount_code} invalide"
+                payload["status"] = 404
+                return payload
+
+        payload.update(cached_checkout(lines, discount_code, discount, catalog))
+    except MissingProductsError as e:
+        payload.update(error=str(e), status=404, missing_products=e.product_ids)
+    except KeyError as e:
+        payload.update(error=f"Champ requis manquant: {e}", status=400)
+    except TypeError:
+        payload.update(error="Ligne de panier invalide", status=400)
+    except ValueError as e:
+        payload.update(error=str(e), status=400)
+    return payload
+
+
+@extended_routes.route("/checkout/batch", methods=["POST"])
+def batch_checkout() -> tuple:
+    """
+    Calcule le checkout de plusieurs paniers en une requête.
+
+    Corps : {"carts": [{"items": [...], "discount_code": ...}, ...]},
+    chaque panier ayant le format de /checkout (plus un champ "id"
+    optionnel, renvoyé tel quel). Les produits de tous les paniers sont
+    résolus en une seule lecture du dépôt. La réponse contient un
+    résultat par panier, dans l'ordre : les montants, ou une erreur
+    ("error" et "status", le code HTTP qu'aurait renvoyé /checkout)
+    sans faire échouer le reste du lot.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "Données JSON requises"}), 400
+
+        carts = data.get("carts")
+        if not isinstance(carts, list) or not carts:
+            return jsonify({"error": "Le lot doit contenir au moins un panier"}), 400
+        max_size = current_app.config["CHECKOUT_BATCH_MAX_SIZE"]
+        if len(carts) > max_size:
+            return jsonify({"error": f"Le lot ne peut pas dépasser {max_size} paniers"}), 413
+
+        # Une seule lecture du dépôt pour les produits de tous les paniers
+        catalog = app_component("repository").get_products(_batch_product_ids(carts))
+        results = [
+            _batch_cart_result(index, cart_data, catalog) for index, cart_data in enumerate(carts)
+        ]
+        errors = sum(1 for result in results if "error" in result)
+        logger.info("Lot de checkouts calculé", extra={"carts": len(carts), "errors": errors})
+        return jsonify({"results": results, "errors": errors}), 200
+
+    except Exception:
+        logger.error("Erreur lors du checkout par lot", exc_info=True)
+        return jsonify({"error": "Erreur interne du serveur"}), 500
+
+
+@extended_routes.route("/checkout/best-discount", methods=["POST"])
+def best_discount_checkout() -> tuple:
+    """Calcule le checkout avec la meilleure remise applicable au panier."""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "Données JSON requises"}), 400
+
+        items = data.get("items", [])
+        if not items:
+            return jsonify({"error": "Le panier ne peut pas être vide"}), 400
+
+        lines = [(item_data["product_id"], item_data["quantity"]) for item_data in items]
+        try:
+            products = app_component("repository").get_products(
+                product_id for product_id, _ in lines
+            )
+            cart = Cart.from_lines(lines, products)
+        except MissingProductsError as e:
+            logger.warning(
+                "Produits non trouvés dans le panier", extra={"product_ids": e.product_ids}
+            )
+            return jsonify({"error": str(e), "missing_products": e.product_ids}), 404
+
+        # Les remises créées par les autres workers sont visibles dès la requête suivante
+        discount_index = app_component("discount_index")
+        discount_index.refresh(app_component("repository").discounts_after)
+        best = discount_index.best_discount(cart)
+        discount = best[0] if best else None
+        result = app_component("checkout_service").calculate_total(cart, discount)
+
+        logger.info(
+            "Meilleure remise calculée",
+            extra={"code": discount.code if discount else None, "total": str(result["total"])},
+        )
+        payload: Dict[str, object] = {"discount_code": discount.code if discount else None}
+        payload.update(result)
+        return jsonify(payload), 200
+
+    except KeyError as e:
+        logger.warning("Champ manquant dans la requête", extra={"field": str(e)})
+        return jsonify({"error": f"Champ requis manquant: {e}"}), 400
+    except ValueError as e:
+        logger.warning("Données invalides", extra={"error": str(e)})
+        return jsonify({"error": str(e)}), 400
+    except Exception:
+        logger.error("Erreur lors de la recherche de la meilleure remise", exc_info=True)
+        return jsonify({"error": "Erreur interne du serveur"}), 500
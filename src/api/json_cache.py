@@ -0,0 +1,132 @@
+"""Cache des représentations JSON des produits."""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+from ..models.product import Product
+from .payloads import dumps_json, product_payload
+
+
+class ProductJsonCache:
+    """
+    Conserve le JSON sérialisé de chaque produit.
+
+    Le fragment JSON d'un produit est produit à son écriture unitaire (put),
+    ou à sa première lecture pour un produit importé en masse, puis
+    réutilisé tel quel par les lectures : une réponse de liste est la
+    concaténation des fragments de la page, sans construire de dict ni
+    reconvertir les prix. Chaque fragment est associé à l'instance du
+    produit sérialisé ; un produit remplacé sans invalidation n'est donc
+    jamais servi périmé, son fragment est simplement recalculé.
+
+    Le cache est un LRU borné à max_entries produits, comme CachedRepository :
+    les fragments les moins récemment lus sont évincés, avec la référence à
+    leur produit.
+
+    Le cache peut être partagé entre threads.
+    """
+
+    def __init__(self, max_entries: int = 100_000) -> None:
+        """
+        Initialise un cache vide.
+
+        Args:
+            max_entries: Nombre maximal de fragments en cache
+        """
+        if max_entries <= 0:
+            raise ValueError("La taille du cache doit être strictement positive")
+        self.max_entries = max_entries
+        # Deux dicts plutôt qu'un dict de paires : aucun objet suivi par le
+        # ramasse-miettes n'est créé par produit ; l'ordre LRU est celui des fragments
+        self._fragments: "OrderedDict[str, bytes]" = OrderedDict()
+        self._sources: Dict[str, Product] = {}
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, product: Product) -> bytes:
+        """Sérialise un produit écrit et conserve son fragment JSON."""
+        fragment = dumps_json(product_payload(product))
+        with self._lock:
+            self._store(((product, fragment),))
+        return fragment
+
+    def put_many(self, products: Iterable[Product]) -> None:
+        """Sérialise des produits écrits, en une seule prise du verrou."""
+        entries = [(product, dumps_json(product_payload(product))) for product in products]
+        with self._lock:
+            self._store(entries)
+
+    def _store(self, entries: Iterable[Tuple[Product, bytes]]) -> None:
+        """Remplace les fragments de produits et évince les moins récents (verrou détenu)."""
+        fragments = self._fragments
+        sources = self._sources
+        size = 0
+        for product, fragment in entries:
+            previous = fragments.get(product.id)
+            if previous is not None:
+                size -= len(previous)
+            fragments[product.id] = fragment
+            fragments.move_to_end(product.id)
+            sources[product.id] = product
+            size += len(fragment)
+        while len(fragments) > self.max_entries:
+            product_id, evicted = fragments.popitem(last=False)
+            del sources[product_id]
+            size -= len(evicted)
+        self.size_bytes += size
+
+    def invalidate(self, product_id: str) -> None:
+        """Supprime le fragment d'un produit modifié ou supprimé."""
+        with self._lock:
+            previous = self._fragments.pop(product_id, None)
+            if previous is not None:
+                del self._sources[product_id]
+                self.size_bytes -= len(previous)
+
+    def get(self, product: Product) -> bytes:
+        """Retourne le fragment JSON d'un produit, sérialisé si besoin."""
+        return self.get_many((product,))[0]
+
+    def get_many(self, products: Iterable[Product]) -> List[bytes]:
+        """Retourne les fragments JSON de produits, dans l'ordre."""
+        result: List[bytes] = []
+        missing: List[Tuple[int, Product]] = []
+        with self._lock:
+            fragments = self._fragments
+            sources = self._sources
+            for product in products:
+                if sources.get(product.id) is product:
+                    fragments.move_to_end(product.id)
+                    result.append(fragments[product.id])
+                else:
+                    missing.append((len(result), product))
+                    result.append(b"")
+            self.hits += len(result) - len(missing)
+            self.misses += len(missing)
+        for index, product in missing:
+            result[index] = self.put(product)
+        return result
+
+    def dumps_list(self, products: Iterable[Product]) -> bytes:
+        """Retourne le tableau JSON des produits, concaténation de leurs fragments."""
+        return b"[" + b",".join(self.get_many(products)) + b"]"
+
+    def __len__(self) -> int:
+        """Retourne le nombre de fragments en cache."""
+        return len(self._fragments)
+
+    def stats(self) -> Dict[str, float]:
+        """Retourne les compteurs du cache, sa taille en octets et son taux de succès."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._fragments),
+                "max_entries": self.max_entries,
+                "size_bytes": self.size_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
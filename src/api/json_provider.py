@@ -0,0 +1,97 @@
+"""Fournisseur JSON de l'application Flask."""
+
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+from ..models.cart import CartItem
+from ..models.discount import Discount
+from ..models.money import Money
+from ..models.product import Product
+from .payloads import discount_payload, product_payload
+
+try:  # Encodeur facultatif, plusieurs fois plus rapide que json
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+# Encodeurs des types de l'application, par type exact
+_ENCODERS: Dict[type, Callable[[Any], Any]] = {
+    Decimal: str,
+    Money: str,
+    Product: product_payload,
+    Discount: discount_payload,
+    CartItem: lambda item: {"product": item.product, "quantity": item.quantity},
+}
+
+
+def encode_default(o: Any) -> Any:
+    """
+    Convertit en valeur JSON un objet que l'encodeur ne connaît pas.
+
+    Les montants (Decimal, Money) deviennent des chaînes, sans perte de
+    précision ; les modèles ont la forme des corps de l'API.
+    """
+    encoder = _ENCODERS.get(type(o))
+    if encoder is not None:
+        return encoder(o)
+    if isinstance(o, Enum):
+        return o.value
+    return DefaultJSONProvider.default(o)
+
+
+class CheckoutJSONProvider(DefaultJSONProvider):
+    """
+    Fournisseur JSON encodant directement les montants et les modèles.
+
+    Les routes passent à jsonify les résultats de checkout et les modèles
+    tels quels, sans dict intermédiaire de chaînes. L'encodage est fait par
+    orjson s'il est installé (backend "orjson"), sinon par json (backend
+    "json") ; le backend peut être changé via l'attribut backend. Les deux
+    backends produisent les mêmes valeurs JSON (seuls les espaces et
+    l'échappement des caractères non ASCII peuvent différer).
+    """
+
+    default = staticmethod(encode_default)
+
+    def __init__(self, app: Flask) -> None:
+        """Initialise le fournisseur avec le backend le plus rapide disponible."""
+        super().__init__(app)
+        self._backend = "orjson" if orjson is not None else "json"
+
+    @property
+    def backend(self) -> str:
+        """Encodeur utilisé : "orjson" ou "json"."""
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend: str) -> None:
+        if backend not in ("orjson", "json"):
+            raise ValueError(f"Backend JSON inconnu : {backend}")
+        if backend == "orjson" and orjson is None:
+            raise ValueError("Le backend orjson n'est pas installé")
+        self._backend = backend
+
+    def dumps_bytes(self, obj: Any, indent: Optional[int] = None) -> bytes:
+        """Sérialise un objet en JSON (octets UTF-8)."""
+        if self._backend == "orjson" and indent in (None, 2):
+            option = orjson.OPT_PASSTHROUGH_DATACLASS
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=encode_default, option=option)
+        separators = (",", ":") if indent is None else None
+        return self.dumps(obj, indent=indent, separators=separators).encode("utf-8")
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Sérialise les arguments en JSON et retourne la réponse Flask."""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = 2 if (self.compact is None and self._app.debug) or self.compact is False else None
+        response: Response = self._app.response_class(
+            self.dumps_bytes(obj, indent) + b"\n", mimetype=self.mimetype
+        )
+        return response
@@ -0,0 +1,156 @@
+"""Conversion entre les corps JSON de l'API et les modèles."""
+
+import base64
+import json
+from decimal import Decimal, InvalidOperation
+from typing import IO, Any, Dict, Iterator, List, Optional
+
+from ..models.discount import Discount, DiscountType
+from ..models.product import Product
+
+try:  # orjson (requirements.txt) est plusieurs fois plus rapide que json ; repli sans lui
+    from orjson import dumps as dumps_json
+    from orjson import loads as loads_json
+except ImportError:  # pragma: no cover
+    from json import loads as loads_json  # noqa: F401
+
+    def dumps_json(obj: Any) -> bytes:  # type: ignore[misc]
+        """Sérialise un objet JSON en octets UTF-8 compacts."""
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+# Taille des blocs lus dans un corps NDJSON
+NDJSON_CHUNK_SIZE = 1 << 16
+
+
+def _mapping(data: Any) -> Dict[str, Any]:
+    """Vérifie qu'un enregistrement est un objet JSON."""
+    if not isinstance(data, dict):
+        raise ValueError("Objet JSON attendu")
+    return data
+
+
+def _decimal(value: Any, field: str) -> Decimal:
+    """Convertit un montant JSON (nombre ou chaîne) en Decimal."""
+    if isinstance(value, bool):
+        raise ValueError(f"Valeur invalide pour {field}: {value!r}")
+    try:
+        amount = Decimal(value) if isinstance(value, (str, int)) else Decimal(str(value))
+    except (InvalidOperation, TypeError):
+        raise ValueError(f"Valeur invalide pour {field}: {value!r}") from None
+    if not amount.is_finite():
+        raise ValueError(f"Valeur invalide pour {field}: {value!r}")
+    return amount
+
+
+def product_from_payload(data: Any) -> Product:
+    """
+    Construit un produit à partir du corps de POST /products.
+
+    Raises:
+        KeyError: Si un champ requis est absent
+        ValueError: Si une valeur est invalide
+    """
+    data = _mapping(data)
+    return Product(
+        id=data["id"],
+        name=data["name"],
+        price=_decimal(data["price"], "price"),
+        category=data.get("category", "other"),
+    )
+
+
+def discount_from_payload(data: Any) -> Discount:
+    """
+    Construit une remise à partir du corps de POST /discounts.
+
+    Raises:
+        KeyError: Si un champ requis est absent
+        ValueError: Si une valeur est invalide
+    """
+    data = _mapping(data)
+    min_amount = data.get("min_amount")
+    return Discount(
+        code=data["code"],
+        discount_type=DiscountType(data["type"]),
+        value=_decimal(data["value"], "value"),
+        min_amount=_decimal(min_amount, "min_amount") if min_amount else None,
+        category=data.get("category"),
+    )
+
+
+def product_payload(product: Product) -> Dict[str, str]:
+    """Convertit un produit en corps JSON (prix en chaîne)."""
+    return {
+        "id": product.id,
+        "name": product.name,
+        "price": str(product.price),
+        "category": product.category,
+    }
+
+
+def encode_cursor(position: int, category: Optional[str] = None) -> str:
+    """Encode une position de pagination (et son filtre) en curseur opaque."""
+    token = f"{position}:{category or ''}".encode("utf-8")
+    return base64.urlsafe_b64encode(token).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, category: Optional[str] = None) -> int:
+    """
+    Décode un curseur de pagination.
+
+    Raises:
+        ValueError: Si le curseur est invalide ou a été obtenu avec un
+            autre filtre de catégorie
+    """
+    try:
+        token = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        position, _, cursor_category = token.partition(":")
+        if cursor_category != (category or "") or not position.isdigit():
+            raise ValueError
+        return int(position)
+    except ValueError:  # binascii.Error et UnicodeDecodeError en dérivent
+        raise ValueError("Curseur invalide") from None
+
+
+def discount_payload(discount: Discount) -> Dict[str, Optional[str]]:
+    """Convertit une remise en corps JSON, au format de POST /discounts."""
+    return {
+        "code": discount.code,
+        "type": discount.discount_type.value,
+        "value": str(discount.value),
+        "min_amount": str(discount.min_amount) if discount.min_amount is not None else None,
+        "category": discount.category,
+    }
+
+
+def iter_ndjson_lines(
+    stream: IO[bytes], chunk_size: int = NDJSON_CHUNK_SIZE
+) -> Iterator[List[bytes]]:
+    """
+    Découpe un flux NDJSON en lignes, par blocs.
+
+    Le flux est lu par blocs de taille fixe : la mémoire utilisée ne dépend
+    pas de la taille du corps, et chaque lecture traite de nombreuses
+    lignes (un flux brut, comme le corps d'une requête WSGI, lirait sinon
+    octet par octet pour trouver les fins de ligne).
+
+    Args:
+        stream: Flux binaire
+        chunk_size: Taille des blocs lus
+
+    Returns:
+        Les lignes complètes de chaque bloc, sans fin de ligne ; les lignes
+        vides sont conservées, pour que leur position reste exacte
+    """
+    pending = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            if pending:
+                yield [pending]
+            return
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        if lines:
+            yield lines
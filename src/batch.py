@@ -0,0 +1,383 @@
+"""
+Checkout en lot d'un fichier de lignes de commande.
+
+Lit des lignes de commande au format JSONL ou CSV (une ligne par article :
+order_id, product_id, name, price, category, quantity et, optionnellement,
+discount_code), regroupe les lignes consécutives d'une même commande en un
+panier, calcule son checkout et écrit un résultat JSONL par commande.
+
+Les lignes d'une commande doivent être contiguës (fichier trié ou groupé
+par order_id) : une commande dont les lignes sont dispersées est traitée
+comme plusieurs commandes distinctes. Ce regroupement par lignes
+consécutives est ce qui permet la lecture en flux et la reprise ci-dessous.
+
+Le fichier est lu en flux : la mémoire utilisée ne dépend que de la taille
+d'une commande et du nombre de lots en cours, pas de celle du fichier.
+Chaque résultat contient ``next_offset``, la position (en octets) qui suit
+la dernière ligne de la commande : relancer avec ``--start-offset`` égal au
+dernier ``next_offset`` écrit reprend le traitement à la commande suivante.
+
+Usage :
+    python -m src.batch commandes.jsonl --output resultats.jsonl
+    python -m src.batch commandes.csv --workers 8 --chunk-size 2000
+    python -m src.batch commandes.jsonl --start-offset 123456789 >> resultats.jsonl
+"""
+
+import argparse
+import csv
+import json
+import logging
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from decimal import Decimal
+from typing import (
+    IO,
+    Any,
+    BinaryIO,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .api.payloads import discount_from_payload, product_from_payload
+from .models.cart import Cart
+from .models.discount import Discount
+from .models.product import Product
+from .services.checkout_service import CheckoutService
+from .services.tax_calculator import DEFAULT_TAX_RATES, TaxCalculator
+
+logger = logging.getLogger(__name__)
+
+# Ligne d'article : (product_id, name, price, category, quantity), valeurs brutes
+OrderLine = Tuple[Any, Any, Any, Any, Any]
+
+
+class Order(NamedTuple):
+    """Lignes consécutives d'une même commande."""
+
+    order_id: str
+    discount_code: Optional[str]
+    lines: List[OrderLine]
+    next_offset: int
+
+
+# --- Lecture ----------------------------------------------------------------
+
+
+def _jsonl_records(stream: BinaryIO) -> Iterator[Tuple[Optional[Dict[str, Any]], int]]:
+    """Lit les enregistrements JSONL et la position qui suit chacun."""
+    offset = stream.tell()
+    for raw in stream:
+        offset += len(raw)
+        if raw.strip():
+            yield json.loads(raw), offset
+
+
+def _csv_records(
+    stream: BinaryIO, header: Sequence[str]
+) -> Iterator[Tuple[Optional[Dict[str, Any]], int]]:
+    """Lit les enregistrements CSV (un enregistrement par ligne) et la position qui suit chacun."""
+    offset = stream.tell()
+    for raw in stream:
+        offset += len(raw)
+        if raw.strip():
+            row = next(csv.reader([raw.decode("utf-8")]))
+            yield dict(zip(header, row)), offset
+
+
+def read_orders(stream: BinaryIO, fmt: str = "jsonl", start_offset: int = 0) -> Iterator[Order]:
+    """
+    Regroupe en commandes les lignes consécutives de même order_id.
+
+    Le fichier doit être trié (ou groupé) par order_id : les lignes ne sont
+    pas regroupées au-delà de la commande en cours, si bien qu'un order_id
+    qui réapparaît plus loin produit une seconde commande. C'est ce qui
+    borne la mémoire à une commande et rend next_offset utilisable.
+
+    Args:
+        stream: Flux binaire positionnable (fichier ouvert en "rb")
+        fmt: Format des lignes, "jsonl" ou "csv" (avec ligne d'entête)
+        start_offset: Position de reprise (un next_offset déjà écrit), 0 pour le début
+
+    Yields:
+        Les commandes, dans l'ordre du fichier
+    """
+    if fmt == "csv":
+        stream.seek(0)
+        header = next(csv.reader([stream.readline().decode("utf-8-sig")]))
+        if start_offset > stream.tell():
+            stream.seek(start_offset)
+        records = _csv_records(stream, [name.strip() for name in header])
+    elif fmt == "jsonl":
+        stream.seek(start_offset)
+        records = _jsonl_records(stream)
+    else:
+        raise ValueError(f"Format inconnu : {fmt}")
+
+    current: Optional[Order] = None
+    for record, next_offset in records:
+        if not isinstance(record, dict) or record.get("order_id") in (None, ""):
+            raise ValueError(f"Ligne sans order_id avant la position {next_offset}")
+        order_id = str(record["order_id"])
+        if current is not None and order_id != current.order_id:
+            yield current
+            current = None
+        line = (
+            record.get("product_id"),
+            record.get("name"),
+            record.get("price"),
+            record.get("category"),
+            record.get("quantity"),
+        )
+        if current is None:
+            current = Order(order_id, record.get("discount_code") or None, [line], next_offset)
+        else:
+            current.lines.append(line)
+            current = current._replace(next_offset=next_offset)
+    if current is not None:
+        yield current
+
+
+# --- Calcul -----------------------------------------------------------------
+
+
+def _order_line(line: OrderLine) -> Tuple[Product, int]:
+    """Convertit une ligne brute (JSON ou CSV) en (produit, quantité)."""
+    product_id, name, price, category, quantity = line
+    if product_id in (None, ""):
+        raise ValueError("Champ requis manquant: product_id")
+    if price in (None, ""):
+        raise ValueError(f"Prix manquant pour le produit {product_id}")
+    try:
+        if quantity is None or isinstance(quantity, (bool, float)):
+            raise ValueError
+        quantity = int(quantity)
+    except ValueError:
+        raise ValueError(f"Quantité invalide pour le produit {product_id} : {quantity}") from None
+    product = product_from_payload(
+        {
+            "id": str(product_id),
+            "name": str(name) if name else str(product_id),
+            "price": price,
+            "category": str(category) if category else "other",
+        }
+    )
+    return product, quantity
+
+
+def checkout_order(
+    order: Order, checkout_service: CheckoutService, discounts: Mapping[str, Discount]
+) -> Dict[str, Any]:
+    """
+    Calcule le checkout d'une commande.
+
+    Args:
+        order: La commande
+        checkout_service: Service de checkout
+        discounts: Remises disponibles, par code
+
+    Returns:
+        L'enregistrement de résultat (montants en chaînes), ou un
+        enregistrement ``error`` si la commande est invalide
+    """
+    record: Dict[str, Any] = {"order_id": order.order_id, "discount_code": order.discount_code}
+    try:
+        discount = None
+        if order.discount_code:
+            discount = discounts.get(order.discount_code)
+            if discount is None:
+                raise ValueError(f"Code de remise {order.discount_code} invalide")
+        cart = Cart(journal_size=0)
+        cart.add_items([_order_line(line) for line in order.lines])
+        result = checkout_service.calculate_total(cart, discount)
+        record.update((key, str(value)) for key, value in result.items())
+    except (ArithmeticError, TypeError, ValueError) as e:
+        record["error"] = str(e)
+    record["next_offset"] = order.next_offset
+    return record
+
+
+_worker_state: Optional[Tuple[CheckoutService, Mapping[str, Discount]]] = None
+
+
+def _init_worker(tax_rates: Dict[str, Decimal], discounts: Dict[str, Discount]) -> None:
+    """Crée le service de checkout d'un processus du pool."""
+    global _worker_state
+    _worker_state = (CheckoutService(TaxCalculator(tax_rates)), discounts)
+
+
+def _checkout_chunk(orders: List[Order]) -> List[Dict[str, Any]]:
+    """Calcule un lot de commandes dans un processus du pool."""
+    if _worker_state is None:
+        raise RuntimeError("Le processus n'a pas été initialisé par _init_worker")
+    checkout_service, discounts = _worker_state
+    return [checkout_order(order, checkout_service, discounts) for order in orders]
+
+
+def _chunks(orders: Iterable[Order], size: int) -> Iterator[List[Order]]:
+    """Découpe un flux de commandes en lots."""
+    chunk: List[Order] = []
+    for order in orders:
+        chunk.append(order)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def process_orders(
+    orders: Iterable[Order],
+    tax_rates: Mapping[str, Decimal],
+    discounts: Mapping[str, Discount],
+    workers: int = 1,
+    chunk_size: int = 1000,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Calcule le checkout d'un flux de commandes, dans l'ordre.
+
+    Avec plusieurs processus, les commandes sont envoyées par lots et au
+    plus deux lots par processus sont en cours : la mémoire reste bornée
+    quelle que soit la taille du flux.
+
+    Args:
+        orders: Commandes à calculer
+        tax_rates: Taux de taxe par catégorie
+        discounts: Remises disponibles, par code
+        workers: Nombre de processus (1 : calcul dans le processus courant)
+        chunk_size: Nombre de commandes par lot
+
+    Yields:
+        Les enregistrements de résultat, dans l'ordre des commandes
+    """
+    if chunk_size <= 0:
+        raise ValueError("La taille des lots doit être strictement positive")
+    if workers <= 1:
+        checkout_service = CheckoutService(TaxCalculator(dict(tax_rates)))
+        for order in orders:
+            yield checkout_order(order, checkout_service, discounts)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(dict(tax_rates), dict(discounts)),
+    ) as executor:
+        pending: Deque["Future[List[Dict[str, Any]]]"] = deque()
+        for chunk in _chunks(orders, chunk_size):
+            pending.append(executor.submit(_checkout_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+# --- Ligne de commande ------------------------------------------------------
+
+
+def load_tax_rates(path: Optional[str]) -> Dict[str, Decimal]:
+    """Charge les taux de taxe d'un fichier JSON {catégorie: taux}, ou les taux par défaut."""
+    if path is None:
+        return dict(DEFAULT_TAX_RATES)
+    with open(path, encoding="utf-8") as f:
+        return {category: Decimal(str(rate)) for category, rate in json.load(f).items()}
+
+
+def load_discounts(path: Optional[str]) -> Dict[str, Discount]:
+    """
+    Charge les remises d'un fichier JSON (liste au format de POST /discounts).
+
+    Chaque remise est validée comme par POST /discounts.
+
+    Raises:
+        ValueError: Si une remise est invalide ou incomplète
+    """
+    if path is None:
+        return {}
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    discounts = {}
+    for item in data:
+        try:
+            discount = discount_from_payload(item)
+        except KeyError as e:
+            raise ValueError(f"Champ requis manquant: {e}") from None
+        discounts[discount.code] = discount
+    return discounts
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construit l'analyseur des arguments de la ligne de commande."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.batch",
+        description="Calcule en flux le checkout de commandes lues en JSONL ou CSV.",
+    )
+    parser.add_argument("input", help="Fichier de lignes de commande (.jsonl ou .csv)")
+    parser.add_argument("--output", help="Fichier de résultats JSONL (défaut : sortie standard)")
+    parser.add_argument(
+        "--format", choices=("jsonl", "csv"), help="Format d'entrée (défaut : selon l'extension)"
+    )
+    parser.add_argument(
+        "--start-offset", type=int, default=0, help="Position de reprise (un next_offset écrit)"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Nombre de processus de calcul")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Nombre de commandes par lot")
+    parser.add_argument("--tax-rates", help="Fichier JSON des taux de taxe par catégorie")
+    parser.add_argument("--discounts", help="Fichier JSON des remises disponibles")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Point d'entrée de ``python -m src.batch``.
+
+    Args:
+        argv: Arguments de la ligne de commande (défaut : sys.argv)
+
+    Returns:
+        Le code de sortie : 0 si toutes les commandes ont été calculées, 1
+        si certaines sont en erreur, 2 si le fichier contient une ligne
+        illisible (le traitement s'arrête avant elle)
+    """
+    args = build_parser().parse_args(argv)
+    fmt = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+    tax_rates = load_tax_rates(args.tax_rates)
+    discounts = load_discounts(args.discounts)
+
+    output: IO[str] = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    count = errors = 0
+    try:
+        with open(args.input, "rb") as stream:
+            orders = read_orders(stream, fmt, args.start_offset)
+            for record in process_orders(
+                orders, tax_rates, discounts, args.workers, args.chunk_size
+            ):
+                output.write(json.dumps(record, ensure_ascii=False))
+                output.write("\n")
+                count += 1
+                if "error" in record:
+                    errors += 1
+    except ValueError as e:
+        # Ligne illisible : les résultats déjà écrits indiquent où reprendre
+        logger.error("Fichier de commandes invalide : %s", e)
+        return 2
+    finally:
+        output.flush()
+        if args.output:
+            output.close()
+
+    logger.info("Commandes calculées : %d (dont %d en erreur)", count, errors)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    sys.exit(main())
@@ -1,9 +1,30 @@
-"""Point d'entrée principal de l'application."""
+"""
+Point d'entrée principal de l'application.
 
+Par défaut, l'API est servie par le serveur prefork (src.server) : un
+processus maître et plusieurs workers partageant la socket d'écoute.
+``--dev`` lance à la place le serveur de développement de Flask, utilisé
+aussi sur les systèmes sans fork.
+
+Usage :
+    python -m src.main --workers 4 --port 5001
+    python -m src.main --max-requests 10000 --max-requests-jitter 1000
+    python -m src.main --dev
+    kill -HUP <pid du maître>    # rechargement gracieux
+"""
+
+import argparse
 import logging
+import os
 import sys
+from typing import Optional, Sequence
+
+from flask import Flask
 
 from .api.app import create_app
+from .repositories.cached import CachedRepository
+from .repositories.sqlite import SQLiteRepository
+from .server import PREFORK_SUPPORTED, PreforkServer
 
 # Configuration du logging
 logging.basicConfig(
@@ -14,8 +35,99 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-if __name__ == "__main__":
-    app = create_app()
-    logger.info("Démarrage de l'application")
-    app.run(host="0.0.0.0", port=5001, debug=False)
 
+def load_app(database: str) -> Flask:
+    """
+    Crée l'application, avec les produits et remises persistés dans SQLite.
+
+    Les connexions SQLite ouvertes pendant la création sont refermées :
+    chaque worker ouvre les siennes, aucune n'est héritée d'un fork.
+    """
+    repository = CachedRepository(SQLiteRepository(database))
+    app = create_app(repository=repository)
+    repository.close()
+    return app
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construit l'analyseur des arguments de la ligne de commande."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.main", description="Démarre l'API de checkout."
+    )
+    parser.add_argument("--host", default="0.0.0.0", help="Adresse d'écoute")
+    parser.add_argument("--port", type=int, default=5001, help="Port d'écoute")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="Nombre de workers (défaut : nombre de processeurs)",
+    )
+    parser.add_argument(
+        "--backlog", type=int, default=1024, help="File des connexions en attente"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0,
+        help="Délai d'inactivité d'une connexion client, en secondes",
+    )
+    parser.add_argument(
+        "--graceful-timeout", type=float, default=30.0,
+        help="Délai d'arrêt d'un worker avant qu'il soit tué, en secondes",
+    )
+    parser.add_argument(
+        "--max-requests", type=int, default=0,
+        help="Requêtes après lesquelles un worker est remplacé (0 : jamais)",
+    )
+    parser.add_argument(
+        "--max-requests-jitter", type=int, default=0,
+        help="Variation aléatoire maximale de --max-requests par worker",
+    )
+    parser.add_argument(
+        "--database", default=os.environ.get("CHECKOUT_DATABASE", "checkout.db"),
+        help="Fichier SQLite des produits et des remises (défaut : $CHECKOUT_DATABASE "
+        "ou checkout.db)",
+    )
+    parser.add_argument(
+        "--dev", action="store_true", help="Serveur de développement Flask (un seul processus)"
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Point d'entrée de ``python -m src.main``.
+
+    Args:
+        argv: Arguments de la ligne de commande (défaut : sys.argv)
+
+    Returns:
+        Le code de sortie
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.dev and not PREFORK_SUPPORTED:
+        logger.warning("os.fork indisponible : serveur de développement Flask")
+        args.dev = True
+    if args.dev:
+        app = load_app(args.database)
+        logger.info("Démarrage de l'application")
+        app.run(host=args.host, port=args.port, debug=False)
+        return 0
+
+    try:
+        server = PreforkServer(
+            lambda: load_app(args.database),
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            backlog=args.backlog,
+            timeout=args.timeout,
+            graceful_timeout=args.graceful_timeout,
+            max_requests=args.max_requests,
+            max_requests_jitter=args.max_requests_jitter,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
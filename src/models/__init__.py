@@ -1,8 +1,24 @@
 """Modèles de données du projet."""
 
-from .cart import Cart, CartItem
+from .cart import Cart, CartChange, CartItem, MissingProductsError
+from .catalog import ProductCatalog
+from .category import CategoryRegistry, category_registry
+from .columnar_cart import ColumnarCart
 from .product import Product
+from .sharded_store import ShardedStore
 from .discount import Discount
 
-__all__ = ["Cart", "CartItem", "Product", "Discount"]
+__all__ = [
+    "Cart",
+    "CartChange",
+    "CartItem",
+    "CategoryRegistry",
+    "ColumnarCart",
+    "MissingProductsError",
+    "Product",
+    "ProductCatalog",
+    "ShardedStore",
+    "Discount",
+    "category_registry",
+]
 
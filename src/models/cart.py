@@ -1,15 +1,44 @@
 """Modèle de panier d'achat."""
 
-from dataclasses import dataclass, field
+from collections import deque
 from decimal import Decimal
-from typing import List
+from itertools import islice
+from types import MappingProxyType
+from typing import Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
+from .category import category_registry
+from .money import Money
 from .product import Product
+from .slots import slotted_dataclass
 
 
-@dataclass
+class MissingProductsError(LookupError):
+    """Levée lorsque des produits demandés sont absents du catalogue."""
+
+    def __init__(self, product_ids: List[str]) -> None:
+        """
+        Initialise l'erreur.
+
+        Args:
+            product_ids: IDs des produits introuvables, dans l'ordre de la demande
+        """
+        self.product_ids = product_ids
+        if len(product_ids) == 1:
+            message = f"Produit {product_ids[0]} non trouvé"
+        else:
+            message = f"Produits non trouvés : {', '.join(product_ids)}"
+        super().__init__(message)
+
+
+@slotted_dataclass(frozen=True)
 class CartItem:
-    """Représente un article dans le panier."""
+    """
+    Représente un article dans le panier (immuable).
+
+    Une modification de quantité remplace l'article dans le panier, qui
+    maintient ainsi ses sous-totaux : un article lu via Cart.items ne peut
+    pas les désynchroniser.
+    """
 
     product: Product
     quantity: int
@@ -24,12 +53,173 @@ class CartItem:
         """Calcule le sous-total de l'article."""
         return self.product.price * Decimal(self.quantity)
 
+    @property
+    def subtotal_money(self) -> Money:
+        """Calcule le sous-total de l'article en centimes."""
+        return self.product.price_money * self.quantity
+
+
+@slotted_dataclass(frozen=True)
+class CartChange:
+    """Mutation du panier enregistrée dans son journal."""
+
+    version: int
+    product_id: str
+    category: str
+    category_code: int
+    quantity_delta: int
+    amount_delta: Decimal
+
 
-@dataclass
 class Cart:
-    """Représente un panier d'achat."""
+    """
+    Représente un panier d'achat.
+
+    Les articles sont indexés par ID de produit dans un dictionnaire, qui
+    conserve l'ordre d'insertion : la recherche, la fusion, la mise à jour
+    et la suppression d'un article se font en temps constant, quelle que
+    soit la taille du panier.
+
+    Le sous-total global et les sous-totaux par catégorie (indexés par code
+    de catégorie) sont maintenus au fil des mutations (add_item,
+    update_quantity, remove_item) et se lisent donc en temps constant. Les
+    CartItem sont immuables : les quantités ne se modifient que via ces
+    méthodes.
+
+    Chaque mutation incrémente la version du panier et est enregistrée dans
+    un journal borné (CartChange), ce qui permet de mettre à jour un
+    checkout précédent à partir des seules variations.
+    """
+
+    # Nombre de décimales des sous-totaux en centimes entiers
+    scale = 2
+
+    def __init__(
+        self, items: Optional[Iterable[CartItem]] = None, journal_size: int = 256
+    ) -> None:
+        """
+        Initialise le panier.
+
+        Args:
+            items: Articles initiaux (les doublons de produit sont fusionnés)
+            journal_size: Nombre maximal de mutations conservées dans le journal
+        """
+        self.version = 0
+        self._journal: Deque[CartChange] = deque(maxlen=journal_size)
+        self._items: Dict[str, CartItem] = {}
+        self._subtotal = Decimal("0")
+        self._code_subtotals: Dict[int, Decimal] = {}
+        self._code_counts: Dict[int, int] = {}
+        # Sous-totaux en centimes des lignes exactes au centime, et quantité
+        # totale des lignes dont le prix ne l'est pas
+        self._subtotal_minor = 0
+        self._code_minor: Dict[int, int] = {}
+        self._sub_cent_quantity = 0
+        if items:
+            self.add_items((item.product, item.quantity) for item in items)
+
+    @classmethod
+    def from_lines(
+        cls, lines: Iterable[Tuple[str, int]], catalog: Mapping[str, Product]
+    ) -> "Cart":
+        """
+        Construit un panier à partir de lignes (ID de produit, quantité).
+
+        Les produits sont résolus en un seul passage sur le catalogue et tous
+        les produits absents sont signalés ensemble.
+
+        Args:
+            lines: Lignes (ID de produit, quantité)
+            catalog: Catalogue des produits indexé par ID
+
+        Returns:
+            Le panier construit
+
+        Raises:
+            MissingProductsError: Si des produits sont absents du catalogue
+            ValueError: Si des quantités sont invalides
+        """
+        resolved: List[Tuple[Product, int]] = []
+        missing: Dict[str, None] = {}
+        for product_id, quantity in lines:
+            product = catalog.get(product_id)
+            if product is None:
+                missing[product_id] = None
+            else:
+                resolved.append((product, quantity))
+        if missing:
+            raise MissingProductsError(list(missing))
+
+        cart = cls()
+        cart.add_items(resolved)
+        return cart
+
+    @classmethod
+    def _restore(cls, lines: Iterable[Tuple[Product, int]]) -> "Cart":
+        """
+        Reconstruit un panier désérialisé, sans fusion ni journal.
+
+        Les lignes doivent déjà être fusionnées (un produit par ligne) ; le
+        panier obtenu est en version 0, avec un journal vide.
+
+        Raises:
+            ValueError: Si un produit apparaît deux fois ou si une quantité est invalide
+        """
+        cart = cls()
+        items = cart._items
+        code_subtotals = cart._code_subtotals
+        code_counts = cart._code_counts
+        code_minor = cart._code_minor
+        zero = Decimal("0")
+        for product, quantity in lines:
+            if product.id in items:
+                raise ValueError(f"Produit {product.id} présent deux fois dans le panier")
+            item = CartItem(product, quantity)
+            items[product.id] = item
+            code = product.category_code
+            code_subtotals[code] = code_subtotals.get(code, zero) + item.subtotal
+            code_counts[code] = code_counts.get(code, 0) + 1
+            if product.price_minor is None:
+                cart._sub_cent_quantity += quantity
+            else:
+                code_minor[code] = code_minor.get(code, 0) + product.price_minor * quantity
+        if items:
+            cart._subtotal = sum(code_subtotals.values(), zero)
+            cart._subtotal_minor = sum(code_minor.values())
+        return cart
+
+    @property
+    def items(self) -> Tuple[CartItem, ...]:
+        """
+        Retourne les articles du panier, dans l'ordre d'ajout.
+
+        Le tuple est une copie en lecture seule : un append ou une affectation
+        échoue au lieu d'être ignorée. Le panier se modifie via add_item,
+        update_quantity et remove_item.
+        """
+        return tuple(self._items.values())
 
-    items: List[CartItem] = field(default_factory=list)
+    def __iter__(self) -> Iterator[CartItem]:
+        """Itère sur les articles sans copier la liste."""
+        return iter(self._items.values())
+
+    def __len__(self) -> int:
+        """Retourne le nombre de lignes du panier."""
+        return len(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare deux paniers article par article, ordre compris."""
+        if not isinstance(other, Cart):
+            return NotImplemented
+        return self.items == other.items
+
+    def __repr__(self) -> str:
+        """Représentation lisible du panier."""
+        return f"Cart(items={self.items!r})"
+
+    def get_item(self, product_id: str) -> Optional[CartItem]:
+        """Retourne l'article correspondant au produit, ou None."""
+        return self._items.get(product_id)
 
     def add_item(self, product: Product, quantity: int = 1) -> None:
         """Ajoute un produit au panier."""
@@ -37,17 +227,78 @@ class Cart:
             raise ValueError("La quantité doit être strictement positive")
 
         # Vérifie si le produit existe déjà dans le panier
-        for item in self.items:
-            if item.product.id == product.id:
-                item.quantity += quantity
-                return
+        item = self._items.get(product.id)
+        if item is not None:
+            self._items[product.id] = CartItem(item.product, item.quantity + quantity)
+            self._apply_delta(item.product, quantity)
+            return
 
         # Ajoute un nouvel article
-        self.items.append(CartItem(product=product, quantity=quantity))
+        item = CartItem(product=product, quantity=quantity)
+        self._items[product.id] = item
+        self._code_counts[product.category_code] = (
+            self._code_counts.get(product.category_code, 0) + 1
+        )
+        self._apply_delta(product, quantity)
+
+    def add_items(self, lines: Iterable[Tuple[Product, int]]) -> None:
+        """
+        Ajoute plusieurs produits au panier en une seule opération.
+
+        Les doublons sont fusionnés en un seul passage et toutes les
+        quantités sont validées avant toute modification : en cas d'erreur,
+        le panier reste inchangé.
+
+        Args:
+            lines: Lignes (produit, quantité)
+
+        Raises:
+            ValueError: Si des quantités ne sont pas des entiers strictement positifs
+        """
+        merged: Dict[str, List] = {}
+        invalid: Dict[str, None] = {}
+        for product, quantity in lines:
+            if not isinstance(quantity, int) or isinstance(quantity, bool) or quantity <= 0:
+                invalid[product.id] = None
+                continue
+            line = merged.get(product.id)
+            if line is None:
+                merged[product.id] = [product, quantity]
+            else:
+                line[1] += quantity
+        if invalid:
+            raise ValueError(
+                "La quantité doit être strictement positive "
+                f"(produits : {', '.join(invalid)})"
+            )
+
+        for product_id, (product, quantity) in merged.items():
+            item = self._items.get(product_id)
+            if item is not None:
+                product = item.product
+                self._items[product_id] = CartItem(product, item.quantity + quantity)
+            else:
+                self._items[product_id] = CartItem(product=product, quantity=quantity)
+                self._code_counts[product.category_code] = (
+                    self._code_counts.get(product.category_code, 0) + 1
+                )
+            self._apply_delta(product, quantity)
 
     def remove_item(self, product_id: str) -> None:
         """Retire un produit du panier."""
-        self.items = [item for item in self.items if item.product.id != product_id]
+        item = self._items.pop(product_id, None)
+        if item is None:
+            return
+
+        code = item.product.category_code
+        self._apply_delta(item.product, -item.quantity)
+        self._code_counts[code] -= 1
+        if not self._code_counts[code]:
+            del self._code_counts[code]
+            del self._code_subtotals[code]
+            self._code_minor.pop(code, None)
+        if not self._items:
+            self._subtotal = Decimal("0")
 
     def update_quantity(self, product_id: str, quantity: int) -> None:
         """Met à jour la quantité d'un produit."""
@@ -55,19 +306,109 @@ class Cart:
             self.remove_item(product_id)
             return
 
-        for item in self.items:
-            if item.product.id == product_id:
-                item.quantity = quantity
-                return
+        item = self._items.get(product_id)
+        if item is None:
+            raise ValueError(f"Produit {product_id} non trouvé dans le panier")
+        self._items[product_id] = CartItem(item.product, quantity)
+        self._apply_delta(item.product, quantity - item.quantity)
+
+    def _apply_delta(self, product: Product, quantity_delta: int) -> None:
+        """Reporte une variation de quantité sur les sous-totaux et le journal."""
+        delta = product.price * Decimal(quantity_delta)
+        code = product.category_code
+        self._subtotal += delta
+        self._code_subtotals[code] = self._code_subtotals.get(code, Decimal("0")) + delta
+        minor = product.price_minor
+        if minor is None:
+            self._sub_cent_quantity += quantity_delta
+        else:
+            minor *= quantity_delta
+            self._subtotal_minor += minor
+            self._code_minor[code] = self._code_minor.get(code, 0) + minor
+        self.version += 1
+        self._journal.append(
+            CartChange(self.version, product.id, product.category, code, quantity_delta, delta)
+        )
+
+    def changes_since(self, version: int) -> Optional[List[CartChange]]:
+        """
+        Retourne les mutations postérieures à une version du panier.
 
-        raise ValueError(f"Produit {product_id} non trouvé dans le panier")
+        Args:
+            version: Version de référence
+
+        Returns:
+            Les mutations dans l'ordre, ou None si le journal a été tronqué
+            (ou si la version est inconnue) : il faut alors tout recalculer
+        """
+        if version == self.version:
+            return []
+        if version > self.version or not self._journal:
+            return None
+        first = self._journal[0].version
+        if first > version + 1:
+            return None
+        return list(islice(self._journal, version + 1 - first, None))
 
     @property
     def subtotal(self) -> Decimal:
-        """Calcule le sous-total du panier (sans taxes ni remises)."""
-        return sum(item.subtotal for item in self.items)
+        """Retourne le sous-total du panier (sans taxes ni remises)."""
+        return self._subtotal
+
+    @property
+    def subtotal_money(self) -> Money:
+        """Retourne le sous-total du panier en centimes."""
+        if self._sub_cent_quantity:
+            return Money.from_decimal(self._subtotal)
+        return Money(self._subtotal_minor)
+
+    @property
+    def code_subtotals(self) -> Mapping[int, Decimal]:
+        """Retourne une vue en lecture seule des sous-totaux par code de catégorie."""
+        return MappingProxyType(self._code_subtotals)
+
+    @property
+    def category_subtotals(self) -> Mapping[str, Decimal]:
+        """Retourne les sous-totaux par nom de catégorie."""
+        name = category_registry.name
+        return {name(code): subtotal for code, subtotal in self._code_subtotals.items()}
+
+    def category_subtotal(self, category: str) -> Decimal:
+        """Retourne le sous-total d'une catégorie (0 si absente du panier)."""
+        code = category_registry.get(category)
+        if code is None:
+            return Decimal("0")
+        return self._code_subtotals.get(code, Decimal("0"))
+
+    def category_subtotal_money(self, category: str) -> Money:
+        """Retourne le sous-total d'une catégorie en centimes."""
+        if self._sub_cent_quantity:
+            return Money.from_decimal(self.category_subtotal(category))
+        code = category_registry.get(category)
+        return Money(self._code_minor.get(code, 0) if code is not None else 0)
+
+    def scaled_subtotals(self) -> Tuple[Mapping[int, int], int]:
+        """
+        Retourne les sous-totaux par code de catégorie en unités mineures entières.
+
+        Les sous-totaux en centimes sont maintenus au fil des mutations. Si
+        un prix du panier n'est pas exact au centime, les sous-totaux Decimal
+        sont convertis à l'échelle du plus fin d'entre eux, sans arrondi.
+
+        Returns:
+            (sous-totaux, échelle) : l'unité mineure vaut 10 ** -échelle
+        """
+        if not self._sub_cent_quantity:
+            return MappingProxyType(self._code_minor), self.scale
+        scale = self.scale
+        for subtotal in self._code_subtotals.values():
+            exponent = subtotal.as_tuple().exponent
+            if isinstance(exponent, int) and -exponent > scale:
+                scale = -exponent
+        return {
+            code: int(subtotal.scaleb(scale)) for code, subtotal in self._code_subtotals.items()
+        }, scale
 
     def is_empty(self) -> bool:
         """Vérifie si le panier est vide."""
-        return len(self.items) == 0
-
+        return not self._items
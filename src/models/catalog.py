@@ -0,0 +1,149 @@
+"""Catalogue des produits."""
+
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from .category import category_registry
+from .product import Product
+from .sharded_store import DEFAULT_SHARD_COUNT, ShardedStore
+
+
+class ProductCatalog(Mapping[str, Product]):
+    """
+    Catalogue des produits indexé par ID, parcourable par pages.
+
+    Les produits sont conservés dans leur ordre d'ajout, globalement et par
+    catégorie. Le catalogue n'accepte que des ajouts : une position dans
+    cet ordre reste valable indéfiniment et sert de curseur de pagination.
+    Une page est une tranche de liste, dont le coût ne dépend que de sa
+    taille, et non de celle du catalogue.
+
+    Le catalogue peut être partagé entre threads : l'index par ID est un
+    ShardedStore, dont les ajouts d'IDs distincts ne s'attendent pas et
+    dont les lectures ne prennent aucun verrou. Un produit est trouvable
+    par son ID dès son ajout, et apparaît dans les pages juste après.
+    """
+
+    def __init__(
+        self, products: Iterable[Product] = (), shard_count: int = DEFAULT_SHARD_COUNT
+    ) -> None:
+        """
+        Initialise le catalogue.
+
+        Args:
+            products: Produits initiaux
+            shard_count: Nombre de partitions de l'index par ID
+        """
+        self._products: ShardedStore[str, Product] = ShardedStore(shard_count)
+        self._order: List[Product] = []
+        self._by_category: Dict[int, List[Product]] = {}
+        self.add_many(products)
+
+    def __getitem__(self, product_id: str) -> Product:
+        """Retourne un produit par son ID."""
+        return self._products[product_id]
+
+    def get(  # type: ignore[override]
+        self, product_id: str, default: Optional[Product] = None
+    ) -> Optional[Product]:
+        """Retourne un produit par son ID, ou default s'il est absent."""
+        return self._products.get(product_id, default)
+
+    def __contains__(self, product_id: object) -> bool:
+        """Vérifie si un produit est présent."""
+        return product_id in self._products
+
+    def __iter__(self) -> Iterator[str]:
+        """Parcourt les IDs des produits présents au début du parcours, dans l'ordre d'ajout."""
+        # Copie de la liste (atomique) : les ajouts concurrents n'affectent pas le parcours
+        return (product.id for product in self._order[:])
+
+    def __len__(self) -> int:
+        """Retourne le nombre de produits."""
+        return len(self._order)
+
+    def add(self, product: Product) -> None:
+        """
+        Ajoute un produit.
+
+        Raises:
+            ValueError: Si un produit de même ID existe déjà
+        """
+        self.add_many((product,))
+
+    def add_many(self, products: Iterable[Product]) -> None:
+        """
+        Ajoute des produits, atomiquement.
+
+        Raises:
+            ValueError: Si un produit de même ID existe déjà (aucun produit
+                n'est alors ajouté)
+        """
+        if self._add(list(products), all_or_nothing=True):
+            raise ValueError("Produit déjà existant")
+
+    def add_absent(self, products: Sequence[Product]) -> List[int]:
+        """
+        Ajoute les produits dont l'ID est absent.
+
+        La vérification et l'ajout sont atomiques : de deux ajouts
+        concurrents d'un même ID, un seul réussit.
+
+        Returns:
+            Les positions des produits non ajoutés (ID existant ou déjà vu
+            plus tôt dans le lot), croissantes
+        """
+        return self._add(products, all_or_nothing=False)
+
+    def _add(self, products: Sequence[Product], all_or_nothing: bool) -> List[int]:
+        """
+        Ajoute des produits à l'index, puis aux listes de pagination.
+
+        Les IDs et les catégories sont tous lus avant la première écriture :
+        un produit invalide fait échouer l'ajout sans qu'aucun produit du
+        lot ne soit trouvable ni listé.
+        """
+        entries = [(product.id, product) for product in products]
+        codes = [product.category_code for product in products]
+        rejected = self._products.insert_many(entries, all_or_nothing)
+        if rejected and all_or_nothing:
+            return rejected
+        skipped = set(rejected)
+        added = [index for index in range(len(entries)) if index not in skipped]
+        # list.extend et dict.setdefault sont atomiques : pas de verrou global
+        self._order.extend(entries[index][1] for index in added)
+        for index in added:
+            category_products = self._by_category.get(codes[index])
+            if category_products is None:
+                category_products = self._by_category.setdefault(codes[index], [])
+            category_products.append(entries[index][1])
+        return rejected
+
+    def page(
+        self, position: int = 0, limit: int = 100, category: Optional[str] = None
+    ) -> Tuple[List[Product], Optional[int]]:
+        """
+        Retourne une page de produits, dans l'ordre d'ajout.
+
+        Args:
+            position: Position du premier produit (0, ou la position
+                suivante retournée par la page précédente)
+            limit: Nombre maximal de produits de la page
+            category: Si fournie, seuls les produits de cette catégorie sont
+                parcourus (les positions sont alors propres à la catégorie)
+
+        Returns:
+            (produits, position de la page suivante ou None s'il n'y en a pas)
+        """
+        if position < 0:
+            raise ValueError("La position ne peut pas être négative")
+        if limit <= 0:
+            raise ValueError("La taille de page doit être strictement positive")
+        if category is None:
+            products = self._order
+        else:
+            code = category_registry.get(category)
+            products = self._by_category.get(code, []) if code is not None else []
+        # La liste ne fait que croître : une tranche est cohérente sans verrou
+        end = position + limit
+        page = products[position:end]
+        return page, end if len(products) > end else None
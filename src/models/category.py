@@ -0,0 +1,55 @@
+"""Registre des catégories de produits."""
+
+import sys
+import threading
+from typing import Dict, List, Optional
+
+
+class CategoryRegistry:
+    """
+    Associe chaque nom de catégorie à un petit code entier.
+
+    Les codes sont attribués dans l'ordre d'enregistrement, à partir de 0,
+    et ne changent plus ensuite : ils peuvent servir d'index dans un
+    tableau (taux de taxe) et se comparent sans hacher de chaîne. Ils ne
+    sont valables que dans le processus courant et ne doivent pas être
+    sérialisés.
+    """
+
+    def __init__(self) -> None:
+        """Initialise un registre vide."""
+        self._codes: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+
+    def code(self, name: str) -> int:
+        """Retourne le code d'une catégorie, en l'enregistrant si besoin."""
+        code = self._codes.get(name)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(name)
+                if code is None:
+                    code = len(self._names)
+                    self._names.append(sys.intern(name))
+                    self._codes[self._names[code]] = code
+        return code
+
+    def get(self, name: str) -> Optional[int]:
+        """Retourne le code d'une catégorie, ou None si elle est inconnue."""
+        return self._codes.get(name)
+
+    def name(self, code: int) -> str:
+        """Retourne le nom de la catégorie correspondant à un code."""
+        return self._names[code]
+
+    def __len__(self) -> int:
+        """Retourne le nombre de catégories enregistrées."""
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        """Vérifie si une catégorie est enregistrée."""
+        return name in self._codes
+
+
+# Registre partagé par les produits, les remises et les calculateurs de taxes
+category_registry = CategoryRegistry()
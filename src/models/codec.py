@@ -0,0 +1,375 @@
+"""Sérialisation binaire compacte des modèles (stockage de session)."""
+
+import struct
+from decimal import Decimal
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+
+from .cart import Cart, CartItem
+from .discount import Discount, DiscountType
+from .product import Product
+
+Buffer = Union[bytes, bytearray, memoryview]
+T = TypeVar("T")
+
+#: Entête de chaque message : magie, version du format, type d'objet
+MAGIC = b"CK"
+FORMAT_VERSION = 1
+
+_TAG_PRODUCT = 1
+_TAG_DISCOUNT = 2
+_TAG_CART_ITEM = 3
+_TAG_CART = 4
+
+_HEADER = struct.Struct("<2sBB")
+_STR_LEN = struct.Struct("<H")
+_DECIMAL = struct.Struct("<qb")
+# Produit : longueurs de l'ID, du nom et de la catégorie, prix, puis les chaînes
+_PRODUCT = struct.Struct("<HHHqb")
+# Article : produit suivi de la quantité (uint32), dans un seul bloc fixe
+_ITEM = struct.Struct("<HHHqbI")
+_UINT32 = struct.Struct("<I")
+_UINT8 = struct.Struct("<B")
+
+_DISCOUNT_TYPES = [DiscountType.PERCENTAGE, DiscountType.FIXED]
+_DISCOUNT_TYPE_CODES = {discount_type: code for code, discount_type in enumerate(_DISCOUNT_TYPES)}
+_HAS_MIN_AMOUNT = 0x01
+_HAS_CATEGORY = 0x02
+
+
+# --- Encodage -------------------------------------------------------------
+
+
+def _pack_str(parts: List[bytes], value: str) -> None:
+    """Ajoute une chaîne UTF-8 préfixée par sa longueur (uint16)."""
+    data = value.encode("utf-8")
+    if len(data) > 0xFFFF:
+        raise ValueError("Chaîne trop longue pour le format binaire (64 Ko maximum)")
+    parts.append(_STR_LEN.pack(len(data)))
+    parts.append(data)
+
+
+def _decimal_parts(value: Decimal) -> Tuple[int, int]:
+    """Décompose un Decimal en (coefficient, exposant)."""
+    if not value.is_finite():
+        raise ValueError(f"Montant non fini non sérialisable : {value}")
+    text = str(value)
+    if "E" not in text:
+        # Notation positionnelle ("-12.30") : plus rapide que as_tuple()
+        units, _, fraction = text.partition(".")
+        return int(units + fraction), -len(fraction)
+    exponent = value.as_tuple().exponent
+    return int(value.scaleb(-exponent)), exponent  # type: ignore[operator, return-value]
+
+
+def _pack_decimal(parts: List[bytes], value: Decimal) -> None:
+    """Ajoute un Decimal sous forme (coefficient int64, exposant int8)."""
+    try:
+        parts.append(_DECIMAL.pack(*_decimal_parts(value)))
+    except struct.error:
+        raise ValueError(f"Montant hors des limites du format binaire : {value}") from None
+
+
+def _pack_product(parts: List[bytes], product: Product, quantity: Optional[int] = None) -> None:
+    """Ajoute les champs d'un produit, suivis de la quantité si fournie."""
+    id_bytes = product.id.encode("utf-8")
+    name_bytes = product.name.encode("utf-8")
+    category_bytes = product.category.encode("utf-8")
+    lengths = (len(id_bytes), len(name_bytes), len(category_bytes))
+    if max(lengths) > 0xFFFF:
+        raise ValueError("Chaîne trop longue pour le format binaire (64 Ko maximum)")
+    try:
+        if quantity is None:
+            head = _PRODUCT.pack(*lengths, *_decimal_parts(product.price))
+        else:
+            head = _ITEM.pack(*lengths, *_decimal_parts(product.price), quantity)
+    except struct.error:
+        raise ValueError(
+            f"Prix ou quantité hors des limites du format binaire : {product.id}"
+        ) from None
+    parts += (head, id_bytes, name_bytes, category_bytes)
+
+
+def _pack_discount(parts: List[bytes], discount: Discount) -> None:
+    """Ajoute les champs d'une remise."""
+    _pack_str(parts, discount.code)
+    flags = (_HAS_MIN_AMOUNT if discount.min_amount is not None else 0) | (
+        _HAS_CATEGORY if discount.category is not None else 0
+    )
+    parts.append(_UINT8.pack(_DISCOUNT_TYPE_CODES[discount.discount_type]))
+    _pack_decimal(parts, discount.value)
+    parts.append(_UINT8.pack(flags))
+    if discount.min_amount is not None:
+        _pack_decimal(parts, discount.min_amount)
+    if discount.category is not None:
+        _pack_str(parts, discount.category)
+
+
+def _encode(tag: int, pack: Callable[[List[bytes]], None]) -> bytes:
+    """Encode un message complet (entête + contenu)."""
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, tag)]
+    pack(parts)
+    return b"".join(parts)
+
+
+def encode_product(product: Product) -> bytes:
+    """Encode un produit."""
+    return _encode(_TAG_PRODUCT, lambda parts: _pack_product(parts, product))
+
+
+def encode_discount(discount: Discount) -> bytes:
+    """Encode une remise."""
+    return _encode(_TAG_DISCOUNT, lambda parts: _pack_discount(parts, discount))
+
+
+def encode_cart_item(item: CartItem) -> bytes:
+    """Encode un article de panier."""
+
+    def pack(parts: List[bytes]) -> None:
+        """Ajoute le produit et la quantité."""
+        _pack_product(parts, item.product, item.quantity)
+
+    return _encode(_TAG_CART_ITEM, pack)
+
+
+def encode_cart(cart: Cart) -> bytes:
+    """Encode un panier (ses articles, dans l'ordre)."""
+
+    def pack(parts: List[bytes]) -> None:
+        """Ajoute le nombre d'articles puis chaque article."""
+        parts.append(_UINT32.pack(len(cart)))
+        for item in cart:
+            _pack_product(parts, item.product, item.quantity)
+
+    return _encode(_TAG_CART, pack)
+
+
+# --- Décodage -------------------------------------------------------------
+
+
+class _Reader:
+    """Lit des champs dans un tampon sans copier ses octets."""
+
+    __slots__ = ("view", "offset")
+
+    def __init__(self, data: Buffer) -> None:
+        """Initialise la lecture au début du tampon."""
+        self.view = memoryview(data)
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct) -> Tuple:
+        """Lit des valeurs de taille fixe."""
+        values = fmt.unpack_from(self.view, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def read_str(self) -> str:
+        """Lit une chaîne préfixée par sa longueur."""
+        (length,) = self.unpack(_STR_LEN)
+        start = self.offset
+        self.offset += length
+        if self.offset > len(self.view):
+            raise struct.error("chaîne tronquée")
+        return str(self.view[start : self.offset], "utf-8")
+
+    def read_decimal(self) -> Decimal:
+        """Lit un Decimal (coefficient, exposant)."""
+        coefficient, exponent = self.unpack(_DECIMAL)
+        return Decimal(coefficient).scaleb(exponent)
+
+    def read_product(self, fmt: struct.Struct = _PRODUCT) -> Tuple[Product, Tuple]:
+        """Lit un produit ; retourne aussi les champs fixes qui suivent le prix."""
+        id_len, name_len, category_len, coefficient, exponent, *rest = fmt.unpack_from(
+            self.view, self.offset
+        )
+        view = self.view
+        start = self.offset + fmt.size
+        name_start = start + id_len
+        category_start = name_start + name_len
+        self.offset = category_start + category_len
+        if self.offset > len(view):
+            raise struct.error("produit tronqué")
+        # Les trois chaînes sont contiguës : un seul décodage si elles sont en ASCII
+        text = str(view[start : self.offset], "utf-8")
+        if len(text) == self.offset - start:
+            id_end = id_len + name_len
+            id_, name, category = text[:id_len], text[id_len:id_end], text[id_end:]
+        else:
+            id_ = str(view[start:name_start], "utf-8")
+            name = str(view[name_start:category_start], "utf-8")
+            category = str(view[category_start : self.offset], "utf-8")
+        product = Product(
+            id=id_,
+            name=name,
+            price=Decimal(coefficient).scaleb(exponent),
+            category=category,
+        )
+        return product, tuple(rest)
+
+    def read_item(self) -> Tuple[Product, int]:
+        """Lit un article (produit, quantité)."""
+        product, (quantity,) = self.read_product(_ITEM)
+        return product, quantity
+
+    def read_discount(self) -> Discount:
+        """Lit une remise."""
+        code = self.read_str()
+        (type_code,) = self.unpack(_UINT8)
+        value = self.read_decimal()
+        (flags,) = self.unpack(_UINT8)
+        if type_code >= len(_DISCOUNT_TYPES):
+            raise ValueError(f"Type de remise inconnu : {type_code}")
+        return Discount(
+            code=code,
+            discount_type=_DISCOUNT_TYPES[type_code],
+            value=value,
+            min_amount=self.read_decimal() if flags & _HAS_MIN_AMOUNT else None,
+            category=self.read_str() if flags & _HAS_CATEGORY else None,
+        )
+
+    def read_cart(self) -> Cart:
+        """Lit un panier."""
+        (count,) = self.unpack(_UINT32)
+        return Cart._restore(self.read_item() for _ in range(count))
+
+
+def _decode(data: Buffer, tag: int, read: Callable[[_Reader], T]) -> T:
+    """Vérifie l'entête puis décode le contenu d'un message."""
+    reader = _Reader(data)
+    try:
+        magic, version, actual_tag = reader.unpack(_HEADER)
+        if magic != MAGIC:
+            raise ValueError("Format binaire invalide")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Version de format binaire non supportée : {version}")
+        if actual_tag != tag:
+            raise ValueError(f"Type d'objet inattendu : {actual_tag} (attendu : {tag})")
+        value = read(reader)
+    except struct.error:
+        raise ValueError("Données binaires tronquées") from None
+    if reader.offset != len(reader.view):
+        raise ValueError("Données binaires en trop après l'objet")
+    return value
+
+
+def decode_product(data: Buffer) -> Product:
+    """Décode un produit depuis bytes, bytearray ou memoryview."""
+    return _decode(data, _TAG_PRODUCT, lambda reader: reader.read_product()[0])
+
+
+def decode_discount(data: Buffer) -> Discount:
+    """Décode une remise depuis bytes, bytearray ou memoryview."""
+    return _decode(data, _TAG_DISCOUNT, _Reader.read_discount)
+
+
+def decode_cart_item(data: Buffer) -> CartItem:
+    """Décode un article de panier depuis bytes, bytearray ou memoryview."""
+    return _decode(
+        data,
+        _TAG_CART_ITEM,
+        lambda reader: CartItem(*reader.read_item()),
+    )
+
+
+def decode_cart(data: Buffer) -> Cart:
+    """Décode un panier depuis bytes, bytearray ou memoryview."""
+    return _decode(data, _TAG_CART, _Reader.read_cart)
+
+
+# --- Flux -----------------------------------------------------------------
+
+
+def write_carts(stream: BinaryIO, carts: Iterable[Cart]) -> int:
+    """
+    Écrit une suite de paniers dans un flux binaire.
+
+    Chaque panier est précédé de la longueur de son message (uint32), ce
+    qui permet de les relire un par un sans charger tout le flux.
+
+    Args:
+        stream: Flux binaire ouvert en écriture
+        carts: Paniers à écrire
+
+    Returns:
+        Le nombre de paniers écrits
+    """
+    count = 0
+    for cart in carts:
+        data = encode_cart(cart)
+        stream.write(_UINT32.pack(len(data)))
+        stream.write(data)
+        count += 1
+    return count
+
+
+def read_carts(stream: BinaryIO) -> Iterator[Cart]:
+    """
+    Relit un à un les paniers écrits par write_carts.
+
+    Args:
+        stream: Flux binaire ouvert en lecture
+
+    Yields:
+        Les paniers, dans l'ordre d'écriture
+    """
+    while True:
+        prefix = stream.read(_UINT32.size)
+        if not prefix:
+            return
+        if len(prefix) != _UINT32.size:
+            raise ValueError("Données binaires tronquées")
+        (length,) = _UINT32.unpack(prefix)
+        data = stream.read(length)
+        if len(data) != length:
+            raise ValueError("Données binaires tronquées")
+        yield decode_cart(data)
+
+
+def frame_offsets(data: Buffer) -> List[int]:
+    """
+    Retourne la position de chaque panier d'un tampon produit par write_carts.
+
+    Seuls les préfixes de longueur sont lus : les paniers ne sont pas
+    décodés, ce qui permet de découper un flux en lots à moindre coût.
+
+    Args:
+        data: Contenu complet du flux (bytes, bytearray ou memoryview)
+
+    Returns:
+        La position du préfixe de chaque panier, suivie de la taille du tampon
+    """
+    view = memoryview(data)
+    offsets = []
+    offset = 0
+    while offset < len(view):
+        if offset + _UINT32.size > len(view):
+            raise ValueError("Données binaires tronquées")
+        offsets.append(offset)
+        (length,) = _UINT32.unpack_from(view, offset)
+        offset += _UINT32.size + length
+    if offset > len(view):
+        raise ValueError("Données binaires tronquées")
+    offsets.append(offset)
+    return offsets
+
+
+def iter_carts(data: Buffer) -> Iterator[Cart]:
+    """
+    Décode les paniers d'un tampon produit par write_carts, sans copie.
+
+    Args:
+        data: Contenu complet du flux (bytes, bytearray ou memoryview)
+
+    Yields:
+        Les paniers, dans l'ordre d'écriture
+    """
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        if offset + _UINT32.size > len(view):
+            raise ValueError("Données binaires tronquées")
+        (length,) = _UINT32.unpack_from(view, offset)
+        offset += _UINT32.size
+        if offset + length > len(view):
+            raise ValueError("Données binaires tronquées")
+        yield decode_cart(view[offset : offset + length])
+        offset += length
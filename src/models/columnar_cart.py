@@ -0,0 +1,156 @@
+"""Panier colonnaire pour le calcul en masse."""
+
+from array import array
+from decimal import Decimal
+from operator import mul
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from .cart import Cart
+from .category import category_registry
+from .money import Money
+from .product import Product
+
+
+class ColumnarCart:
+    """
+    Panier stocké en colonnes, destiné aux repricings de millions de lignes.
+
+    Les prix sont stockés en unités mineures (centimes) dans des tableaux
+    typés ``array('q')``, les quantités dans un tableau d'entiers et les
+    catégories sous forme de leurs codes entiers (partagés via
+    CategoryRegistry). Le sous-total et les sous-totaux par catégorie sont
+    calculés par des boucles sur ces tableaux, en entiers Python : ils ne
+    peuvent pas déborder. Un prix ou une quantité hors de l'intervalle
+    d'un entier 64 bits est refusé à l'ajout (OverflowError).
+
+    Le panier expose la même interface de lecture que Cart (subtotal,
+    code_subtotals, category_subtotals, category_subtotal, is_empty) et
+    peut donc être passé tel quel à CheckoutService.calculate_total. Les
+    lignes ne sont pas fusionnées par produit, ce qui ne change pas les
+    totaux.
+    """
+
+    def __init__(self, scale: int = 2) -> None:
+        """
+        Initialise un panier colonnaire vide.
+
+        Args:
+            scale: Nombre de décimales des unités mineures (2 pour les centimes)
+        """
+        self.scale = scale
+        self._prices = array("q")
+        self._quantities = array("q")
+        self._codes = array("q")
+        self._present_codes: Dict[int, None] = {}
+        self._subtotal_minor: Optional[int] = None
+        self._code_minor: Optional[Dict[int, int]] = None
+
+    @classmethod
+    def from_cart(cls, cart: Cart, scale: int = 2) -> "ColumnarCart":
+        """Construit un panier colonnaire à partir d'un Cart."""
+        columnar = cls(scale=scale)
+        columnar.extend((item.product, item.quantity) for item in cart)
+        return columnar
+
+    def __len__(self) -> int:
+        """Retourne le nombre de lignes du panier."""
+        return len(self._quantities)
+
+    def is_empty(self) -> bool:
+        """Vérifie si le panier est vide."""
+        return not self._quantities
+
+    def add_line(self, product: Product, quantity: int = 1) -> None:
+        """Ajoute une ligne au panier."""
+        if quantity <= 0:
+            raise ValueError("La quantité doit être strictement positive")
+
+        # Conversion groupée avant tout ajout : une valeur refusée (OverflowError,
+        # TypeError) ne laisse pas les colonnes de longueurs différentes
+        price, quantity, code = array(
+            "q", (self._to_minor(product.price), quantity, product.category_code)
+        )
+        self._prices.append(price)
+        self._quantities.append(quantity)
+        self._codes.append(code)
+        self._present_codes[code] = None
+        self._subtotal_minor = None
+        self._code_minor = None
+
+    def extend(self, lines: Iterable[Tuple[Product, int]]) -> None:
+        """Ajoute plusieurs lignes (produit, quantité) au panier."""
+        for product, quantity in lines:
+            self.add_line(product, quantity)
+
+    def _to_minor(self, price: Decimal) -> int:
+        """Convertit un prix en unités mineures, sans arrondi."""
+        minor = price.scaleb(self.scale)
+        if minor != minor.to_integral_value():
+            raise ValueError(f"Le prix {price} n'est pas exprimable avec {self.scale} décimales")
+        return int(minor)
+
+    def _to_decimal(self, minor: int) -> Decimal:
+        """Convertit un montant en unités mineures en Decimal."""
+        return Decimal(minor).scaleb(-self.scale)
+
+    @property
+    def subtotal_minor(self) -> int:
+        """Retourne le sous-total en unités mineures."""
+        if self._subtotal_minor is None:
+            self._subtotal_minor = sum(map(mul, self._prices, self._quantities))
+        return self._subtotal_minor
+
+    def code_subtotals_minor(self) -> Mapping[int, int]:
+        """Retourne les sous-totaux par code de catégorie, en unités mineures."""
+        if self._code_minor is None:
+            totals = [0] * (max(self._present_codes, default=-1) + 1)
+            for code, line_total in zip(self._codes, map(mul, self._prices, self._quantities)):
+                totals[code] += line_total
+            self._code_minor = {code: totals[code] for code in self._present_codes}
+        return MappingProxyType(self._code_minor)
+
+    def scaled_subtotals(self) -> Tuple[Mapping[int, int], int]:
+        """Retourne les sous-totaux par code de catégorie en unités mineures, et l'échelle."""
+        return self.code_subtotals_minor(), self.scale
+
+    def category_subtotals_minor(self) -> Mapping[str, int]:
+        """Retourne les sous-totaux par catégorie, en unités mineures."""
+        name = category_registry.name
+        return {name(code): minor for code, minor in self.code_subtotals_minor().items()}
+
+    @property
+    def subtotal(self) -> Decimal:
+        """Retourne le sous-total du panier (sans taxes ni remises)."""
+        return self._to_decimal(self.subtotal_minor)
+
+    @property
+    def subtotal_money(self) -> Money:
+        """Retourne le sous-total du panier en centimes."""
+        return Money.from_decimal(self.subtotal)
+
+    @property
+    def code_subtotals(self) -> Mapping[int, Decimal]:
+        """Retourne les sous-totaux par code de catégorie."""
+        return {
+            code: self._to_decimal(minor) for code, minor in self.code_subtotals_minor().items()
+        }
+
+    @property
+    def category_subtotals(self) -> Mapping[str, Decimal]:
+        """Retourne les sous-totaux par catégorie."""
+        return {
+            category: self._to_decimal(minor)
+            for category, minor in self.category_subtotals_minor().items()
+        }
+
+    def category_subtotal(self, category: str) -> Decimal:
+        """Retourne le sous-total d'une catégorie (0 si absente du panier)."""
+        code = category_registry.get(category)
+        if code is None:
+            return self._to_decimal(0)
+        return self._to_decimal(self.code_subtotals_minor().get(code, 0))
+
+    def category_subtotal_money(self, category: str) -> Money:
+        """Retourne le sous-total d'une catégorie en centimes."""
+        return Money.from_decimal(self.category_subtotal(category))
@@ -1,9 +1,13 @@
 """Modèle de remise."""
 
-from dataclasses import dataclass
+from dataclasses import field
 from decimal import Decimal
 from enum import Enum
-from typing import Optional
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from .category import category_registry
+from .money import Money, Rounding
+from .slots import slotted_dataclass
 
 
 class DiscountType(Enum):
@@ -13,15 +17,51 @@ class DiscountType(Enum):
     FIXED = "fixed"
 
 
-@dataclass
+DiscountEvaluator = Callable[[Decimal], Decimal]
+
+_ZERO = Decimal("0")
+
+
+def compile_discount(
+    discount_type: DiscountType, value: Decimal, min_amount: Optional[Decimal]
+) -> DiscountEvaluator:
+    """
+    Compile une remise en une fonction spécialisée montant -> remise.
+
+    Le type de remise et la présence d'un montant minimum sont résolus une
+    fois pour toutes, et le taux d'une remise en pourcentage est précalculé.
+    Les résultats sont identiques à ceux de Discount.calculate_discount.
+
+    Args:
+        discount_type: Type de remise
+        value: Valeur de la remise (pourcentage ou montant fixe)
+        min_amount: Montant minimum optionnel
+
+    Returns:
+        La fonction d'évaluation
+    """
+    if discount_type == DiscountType.PERCENTAGE:
+        rate = value / Decimal("100")
+        if min_amount is None:
+            return lambda amount: amount * rate
+        return lambda amount: _ZERO if amount < min_amount else amount * rate
+
+    if min_amount is None:
+        return lambda amount: min(value, amount)
+    return lambda amount: _ZERO if amount < min_amount else min(value, amount)
+
+
+@slotted_dataclass(frozen=True)
 class Discount:
-    """Représente une remise applicable au panier."""
+    """Représente une remise applicable au panier (immuable)."""
 
     code: str
     discount_type: DiscountType
     value: Decimal
     min_amount: Optional[Decimal] = None
     category: Optional[str] = None
+    category_code: Optional[int] = field(init=False, repr=False, compare=False)
+    _evaluate: DiscountEvaluator = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """Valide les données de la remise."""
@@ -33,14 +73,69 @@ class Discount:
             raise ValueError("Une remise en pourcentage ne peut pas dépasser 100%")
         if self.min_amount is not None and self.min_amount < 0:
             raise ValueError("Le montant minimum ne peut pas être négatif")
+        if self.category is not None and not isinstance(self.category, str):
+            raise ValueError("La catégorie de la remise doit être une chaîne")
+        if self.category == "":
+            # Une catégorie vide équivaut à une remise sur tout le panier
+            object.__setattr__(self, "category", None)
+        code = None
+        if self.category is not None:
+            code = category_registry.code(self.category)
+            object.__setattr__(self, "category", category_registry.name(code))
+        object.__setattr__(self, "category_code", code)
+        object.__setattr__(
+            self, "_evaluate", compile_discount(self.discount_type, self.value, self.min_amount)
+        )
 
     def calculate_discount(self, amount: Decimal) -> Decimal:
         """Calcule le montant de la remise pour un montant donné."""
-        if self.min_amount is not None and amount < self.min_amount:
-            return Decimal("0")
+        return self._evaluate(amount)
+
+    def calculate_discounts(self, amounts: Iterable[Decimal]) -> List[Decimal]:
+        """Calcule la remise pour plusieurs montants en un seul appel."""
+        return list(map(self._evaluate, amounts))
+
+    def calculate_discount_money(
+        self, amount: Money, rounding: Rounding = Rounding.HALF_UP
+    ) -> Money:
+        """Calcule la remise en centimes, arrondie une seule fois."""
+        return Money.from_ratio(*self.scaled_discount(amount.minor), rounding)
+
+    def scaled_discount(self, amount: int, scale: int = 2) -> Tuple[int, int]:
+        """
+        Calcule la remise exacte, sans arrondi, d'un montant en unités mineures.
+
+        Args:
+            amount: Montant en unités mineures (10 ** -scale)
+            scale: Nombre de décimales des unités mineures (2 pour les centimes)
 
+        Returns:
+            (numérateur, dénominateur) de la remise exacte, en unités mineures
+        """
+        unit = 10**scale
+        if self.min_amount is not None:
+            min_numerator, min_denominator = self.min_amount.as_integer_ratio()
+            if amount * min_denominator < min_numerator * unit:
+                return 0, 1
+
+        numerator, denominator = self.value.as_integer_ratio()
         if self.discount_type == DiscountType.PERCENTAGE:
-            return amount * (self.value / Decimal("100"))
-        else:  # FIXED
-            return min(self.value, amount)
+            return amount * numerator, denominator * 100
+        # FIXED : la remise ne dépasse pas le montant
+        if numerator * unit >= amount * denominator:
+            return amount, 1
+        return numerator * unit, denominator
+
+
+def calculate_discounts(discounts: Sequence[Discount], amount: Decimal) -> List[Decimal]:
+    """
+    Calcule la remise de plusieurs remises pour un même montant.
+
+    Args:
+        discounts: Remises à évaluer
+        amount: Montant commun
 
+    Returns:
+        Les montants de remise, dans l'ordre des remises
+    """
+    return [discount._evaluate(amount) for discount in discounts]
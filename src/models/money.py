@@ -0,0 +1,172 @@
+"""Montants monétaires en centimes entiers."""
+
+from decimal import (
+    ROUND_CEILING,
+    ROUND_DOWN,
+    ROUND_FLOOR,
+    ROUND_HALF_EVEN,
+    ROUND_HALF_UP,
+    ROUND_UP,
+    Decimal,
+)
+from enum import Enum
+from functools import total_ordering
+from typing import Optional
+
+from .slots import slotted_dataclass
+
+
+class Rounding(Enum):
+    """Mode d'arrondi au centime (mêmes sémantiques que le module decimal)."""
+
+    HALF_UP = ROUND_HALF_UP
+    HALF_EVEN = ROUND_HALF_EVEN
+    DOWN = ROUND_DOWN
+    UP = ROUND_UP
+    FLOOR = ROUND_FLOOR
+    CEILING = ROUND_CEILING
+
+
+# Lire un membre d'Enum sur sa classe est lent : round_ratio compare à ces alias
+_FLOOR = Rounding.FLOOR
+_CEILING = Rounding.CEILING
+_DOWN = Rounding.DOWN
+_UP = Rounding.UP
+_HALF_UP = Rounding.HALF_UP
+
+
+def round_ratio(numerator: int, denominator: int, rounding: Rounding) -> int:
+    """
+    Arrondit numerator / denominator à l'entier selon le mode donné.
+
+    Args:
+        numerator: Numérateur
+        denominator: Dénominateur (non nul)
+        rounding: Mode d'arrondi
+
+    Returns:
+        Le quotient arrondi
+    """
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    quotient, remainder = divmod(numerator, denominator)
+    if not remainder:
+        return quotient
+
+    # divmod arrondit vers -inf : quotient < valeur exacte < quotient + 1
+    if rounding is _FLOOR:
+        return quotient
+    if rounding is _CEILING:
+        return quotient + 1
+    if rounding is _DOWN:
+        return quotient if numerator >= 0 else quotient + 1
+    if rounding is _UP:
+        return quotient + 1 if numerator >= 0 else quotient
+
+    twice = 2 * remainder
+    if twice != denominator:
+        return quotient + 1 if twice > denominator else quotient
+    if rounding is _HALF_UP:
+        return quotient + 1 if numerator >= 0 else quotient
+    return quotient + (quotient & 1)  # HALF_EVEN
+
+
+@total_ordering
+@slotted_dataclass(frozen=True)
+class Money:
+    """
+    Montant en virgule fixe, stocké en centimes entiers.
+
+    Les additions, soustractions et multiplications par une quantité sont
+    exactes. Toute opération qui peut produire des fractions de centime
+    prend un mode d'arrondi explicite. La conversion en chaîne (``str``)
+    est réservée à la frontière de l'API.
+    """
+
+    minor: int
+
+    def __post_init__(self) -> None:
+        """Valide le montant."""
+        if not isinstance(self.minor, int) or isinstance(self.minor, bool):
+            raise ValueError("Le montant doit être un nombre entier de centimes")
+
+    @classmethod
+    def zero(cls) -> "Money":
+        """Retourne un montant nul."""
+        return cls(0)
+
+    @classmethod
+    def from_ratio(
+        cls, numerator: int, denominator: int, rounding: Rounding = Rounding.HALF_UP
+    ) -> "Money":
+        """Construit un montant à partir de la valeur exacte numerator / denominator centimes."""
+        return cls(round_ratio(numerator, denominator, rounding))
+
+    @classmethod
+    def from_decimal(cls, amount: Decimal, rounding: Optional[Rounding] = None) -> "Money":
+        """
+        Construit un montant à partir d'un Decimal en unités (euros).
+
+        Args:
+            amount: Montant en unités
+            rounding: Mode d'arrondi ; si None, le montant doit être exact au centime
+
+        Returns:
+            Le montant en centimes
+        """
+        numerator, denominator = amount.as_integer_ratio()
+        numerator *= 100
+        if rounding is None:
+            if numerator % denominator:
+                raise ValueError(f"Le montant {amount} n'est pas exprimable en centimes")
+            return cls(numerator // denominator)
+        return cls(round_ratio(numerator, denominator, rounding))
+
+    def to_decimal(self) -> Decimal:
+        """Convertit le montant en Decimal (unités)."""
+        return Decimal(self.minor).scaleb(-2)
+
+    def __str__(self) -> str:
+        """Formate le montant avec deux décimales (ex: "-12.05")."""
+        sign = "-" if self.minor < 0 else ""
+        units, cents = divmod(abs(self.minor), 100)
+        return f"{sign}{units}.{cents:02d}"
+
+    def __bool__(self) -> bool:
+        """Un montant nul est faux."""
+        return self.minor != 0
+
+    def __lt__(self, other: "Money") -> bool:
+        """Compare deux montants."""
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.minor < other.minor
+
+    def __add__(self, other: "Money") -> "Money":
+        """Additionne deux montants."""
+        if not isinstance(other, Money):
+            return NotImplemented
+        return Money(self.minor + other.minor)
+
+    def __sub__(self, other: "Money") -> "Money":
+        """Soustrait deux montants."""
+        if not isinstance(other, Money):
+            return NotImplemented
+        return Money(self.minor - other.minor)
+
+    def __neg__(self) -> "Money":
+        """Retourne l'opposé du montant."""
+        return Money(-self.minor)
+
+    def __mul__(self, quantity: int) -> "Money":
+        """Multiplie le montant par une quantité entière."""
+        if not isinstance(quantity, int) or isinstance(quantity, bool):
+            return NotImplemented
+        return Money(self.minor * quantity)
+
+    __rmul__ = __mul__
+
+    def multiply(self, factor: Decimal, rounding: Rounding = Rounding.HALF_UP) -> "Money":
+        """Multiplie le montant par un facteur décimal (ex: un taux), puis arrondit."""
+        numerator, denominator = factor.as_integer_ratio()
+        return Money(round_ratio(self.minor * numerator, denominator, rounding))
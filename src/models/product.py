@@ -1,17 +1,31 @@
 """Modèle de produit."""
 
-from dataclasses import dataclass
+from dataclasses import field
 from decimal import Decimal
+from typing import Optional
 
+from .category import category_registry
+from .money import Money
+from .slots import slotted_dataclass
 
-@dataclass
+
+@slotted_dataclass(frozen=True)
 class Product:
-    """Représente un produit dans le catalogue."""
+    """
+    Représente un produit dans le catalogue.
+
+    Les produits sont immuables et sans ``__dict__`` ; leur catégorie est
+    internée pour que tous les produits d'une même catégorie partagent la
+    même chaîne, et son code entier (voir CategoryRegistry) est calculé à
+    la création.
+    """
 
     id: str
     name: str
     price: Decimal
     category: str
+    category_code: int = field(init=False, repr=False, compare=False)
+    price_minor: Optional[int] = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """Valide les données du produit."""
@@ -21,4 +35,20 @@ class Product:
             raise ValueError("Le nom du produit ne peut pas être vide")
         if self.price < 0:
             raise ValueError("Le prix ne peut pas être négatif")
+        if not isinstance(self.category, str) or not self.category:
+            raise ValueError("La catégorie du produit doit être une chaîne non vide")
+        code = category_registry.code(self.category)
+        object.__setattr__(self, "category", category_registry.name(code))
+        object.__setattr__(self, "category_code", code)
+        cents = self.price.scaleb(2)
+        object.__setattr__(
+            self, "price_minor", int(cents) if cents == cents.to_integral_value() else None
+        )
+
+    @property
+    def price_money(self) -> Money:
+        """Retourne le prix en centimes (le prix doit être exact au centime)."""
+        if self.price_minor is None:
+            return Money.from_decimal(self.price)
+        return Money(self.price_minor)
 
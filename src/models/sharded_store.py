@@ -0,0 +1,123 @@
+"""Dictionnaire partitionné pour les accès concurrents."""
+
+import threading
+from contextlib import ExitStack
+from typing import Dict, Generic, Hashable, List, Optional, Sequence, Set, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+DEFAULT_SHARD_COUNT = 16
+
+
+class ShardedStore(Generic[K, V]):
+    """
+    Dictionnaire réparti en partitions, chacune protégée par son verrou.
+
+    Une clé appartient toujours à la même partition (selon son hachage).
+    Les écritures sur des partitions différentes ne s'attendent pas ; un
+    lot d'écritures prend les verrous de ses partitions dans l'ordre de
+    leur indice, ce qui exclut tout interblocage, et s'applique donc
+    atomiquement vis-à-vis des autres écrivains.
+
+    Les valeurs ne sont jamais remplacées ni supprimées : une lecture
+    n'a besoin d'aucun verrou, la recherche dans un dict étant atomique.
+    snapshot retourne une copie cohérente de l'ensemble du contenu.
+    """
+
+    def __init__(self, shard_count: int = DEFAULT_SHARD_COUNT) -> None:
+        """
+        Initialise un dictionnaire vide.
+
+        Args:
+            shard_count: Nombre de partitions (une puissance de 2)
+        """
+        if shard_count <= 0 or shard_count & (shard_count - 1):
+            raise ValueError("Le nombre de partitions doit être une puissance de 2")
+        self._mask = shard_count - 1
+        self._shards: List[Dict[K, V]] = [{} for _ in range(shard_count)]
+        self._locks = [threading.Lock() for _ in range(shard_count)]
+
+    @property
+    def shard_count(self) -> int:
+        """Nombre de partitions."""
+        return len(self._shards)
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Retourne la valeur d'une clé, ou default si elle est absente (sans verrou)."""
+        return self._shards[hash(key) & self._mask].get(key, default)
+
+    def __getitem__(self, key: K) -> V:
+        """Retourne la valeur d'une clé (sans verrou)."""
+        return self._shards[hash(key) & self._mask][key]
+
+    def __contains__(self, key: object) -> bool:
+        """Vérifie si une clé est présente (sans verrou)."""
+        return key in self._shards[hash(key) & self._mask]
+
+    def __len__(self) -> int:
+        """Retourne le nombre de clés (approché pendant des écritures concurrentes)."""
+        return sum(len(shard) for shard in self._shards)
+
+    def insert_if_absent(self, key: K, value: V) -> bool:
+        """
+        Ajoute une valeur si la clé est absente.
+
+        Returns:
+            True si la valeur a été ajoutée, False si la clé existait déjà
+        """
+        index = hash(key) & self._mask
+        shard = self._shards[index]
+        with self._locks[index]:
+            if key in shard:
+                return False
+            shard[key] = value
+            return True
+
+    def insert_many(self, items: Sequence[Tuple[K, V]], all_or_nothing: bool = False) -> List[int]:
+        """
+        Ajoute un lot de valeurs dont la clé est absente.
+
+        Les partitions du lot restent verrouillées pendant toute
+        l'opération : aucun autre écrivain ne peut s'intercaler.
+
+        Args:
+            items: Paires (clé, valeur) ; une clé déjà vue plus tôt dans le
+                lot est refusée
+            all_or_nothing: Si vrai, rien n'est ajouté dès qu'une clé est
+                refusée
+
+        Returns:
+            Les positions dans le lot des paires refusées, croissantes
+        """
+        mask = self._mask
+        shards = self._shards
+        indexes = [hash(key) & mask for key, _ in items]
+        with ExitStack() as stack:
+            for index in sorted(set(indexes)):
+                stack.enter_context(self._locks[index])
+            rejected: List[int] = []
+            accepted: List[int] = []
+            seen: Set[K] = set()
+            for position, (key, _) in enumerate(items):
+                if key in seen or key in shards[indexes[position]]:
+                    rejected.append(position)
+                else:
+                    seen.add(key)
+                    accepted.append(position)
+            if rejected and all_or_nothing:
+                return rejected
+            for position in accepted:
+                key, value = items[position]
+                shards[indexes[position]][key] = value
+        return rejected
+
+    def snapshot(self) -> Dict[K, V]:
+        """Retourne une copie du contenu, prise avec tous les verrous."""
+        with ExitStack() as stack:
+            for lock in self._locks:
+                stack.enter_context(lock)
+            snapshot: Dict[K, V] = {}
+            for shard in self._shards:
+                snapshot.update(shard)
+        return snapshot
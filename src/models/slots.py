@@ -0,0 +1,71 @@
+"""Dataclasses compactes à base de __slots__."""
+
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple, Type, TypeVar, Union, cast
+
+T = TypeVar("T")
+
+
+def _add_slots(cls: Type[T], frozen: bool) -> Type[T]:
+    """Recrée la dataclass avec un __slots__ couvrant tous ses champs."""
+    field_names = tuple(f.name for f in fields(cls))  # type: ignore[arg-type]
+    # Les champs init=False sont dérivés : recalculés par __post_init__ au dépickling
+    state_names = tuple(f.name for f in fields(cls) if f.init)  # type: ignore[arg-type]
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = field_names
+    # Les valeurs par défaut sont déjà capturées par le __init__ généré
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+
+    if frozen:
+        # Le __setattr__ d'une dataclass gelée interdit la restauration
+        # par défaut de pickle : l'état est restauré via object.__setattr__.
+        def __getstate__(self: Any) -> Tuple[Any, ...]:
+            return tuple(getattr(self, name) for name in state_names)
+
+        def __setstate__(self: Any, state: Tuple[Any, ...]) -> None:
+            for name, value in zip(state_names, state):
+                object.__setattr__(self, name, value)
+            if state_names != field_names:
+                self.__post_init__()
+
+        cls_dict["__getstate__"] = __getstate__
+        cls_dict["__setstate__"] = __setstate__
+
+    new_cls = cast(Type[T], type(cls.__name__, cls.__bases__, cls_dict))
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
+
+
+if TYPE_CHECKING:
+    # Les vérificateurs de types ne reconnaissent que dataclasses.dataclass
+    from dataclasses import dataclass as slotted_dataclass
+else:
+
+    def slotted_dataclass(
+        cls: Optional[Type[T]] = None, *, frozen: bool = False
+    ) -> Union[Type[T], Callable[[Type[T]], Type[T]]]:
+        """
+        Équivalent de ``@dataclass(slots=True)`` compatible Python 3.9.
+
+        La classe est recréée avec un ``__slots__`` contenant ses champs : les
+        instances n'ont plus de ``__dict__``, ce qui réduit fortement leur
+        empreinte mémoire. Les méthodes de la classe ne doivent pas utiliser
+        ``super()`` sans argument (la classe d'origine est remplacée).
+
+        Args:
+            cls: Classe à décorer (usage sans parenthèses)
+            frozen: Rend les instances immuables (et hachables)
+
+        Returns:
+            La classe décorée, ou le décorateur si cls est omis
+        """
+
+        def wrap(klass: Type[T]) -> Type[T]:
+            return _add_slots(dataclass(frozen=frozen)(klass), frozen)
+
+        if cls is None:
+            return wrap
+        return wrap(cls)
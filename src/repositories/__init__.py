@@ -0,0 +1,14 @@
+"""Stockage persistant des produits et des remises."""
+
+from .base import CatalogRepository, DuplicateError
+from .cached import CachedRepository
+from .memory import InMemoryRepository
+from .sqlite import SQLiteRepository
+
+__all__ = [
+    "CachedRepository",
+    "CatalogRepository",
+    "DuplicateError",
+    "InMemoryRepository",
+    "SQLiteRepository",
+]
@@ -0,0 +1,144 @@
+"""Interface des dépôts de produits et de remises."""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..models.discount import Discount
+from ..models.product import Product
+
+
+class DuplicateError(Exception):
+    """Levée lorsqu'un produit ou une remise existe déjà."""
+
+    def __init__(self, keys: List[str]) -> None:
+        """
+        Initialise l'erreur.
+
+        Args:
+            keys: IDs de produits ou codes de remise déjà présents
+        """
+        self.keys = keys
+        super().__init__(f"Déjà existant : {', '.join(keys)}")
+
+
+class CatalogRepository(ABC):
+    """
+    Dépôt des produits et des remises de l'application.
+
+    Produits et remises sont immuables et ne sont jamais supprimés ni
+    remplacés : une écriture n'ajoute que des clés absentes. Les curseurs
+    de page_products sont des entiers opaques propres à chaque
+    implémentation (0 pour la première page).
+    """
+
+    @abstractmethod
+    def get_product(self, product_id: str) -> Optional[Product]:
+        """Retourne un produit par son ID, ou None s'il est absent."""
+
+    @abstractmethod
+    def get_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """
+        Retourne en une seule requête les produits trouvés parmi des IDs.
+
+        Args:
+            product_ids: IDs recherchés (les doublons sont ignorés)
+
+        Returns:
+            Les produits présents, indexés par ID
+        """
+
+    @abstractmethod
+    def add_products(self, products: Sequence[Product]) -> List[int]:
+        """
+        Ajoute des produits en une seule écriture.
+
+        Les produits dont l'ID existe déjà (ou apparaît plus tôt dans le
+        lot) ne sont pas ajoutés.
+
+        Args:
+            products: Produits à ajouter
+
+        Returns:
+            Les positions dans le lot des produits non ajoutés, croissantes
+        """
+
+    def add_product(self, product: Product) -> None:
+        """
+        Ajoute un produit.
+
+        Raises:
+            DuplicateError: Si un produit de même ID existe déjà
+        """
+        if self.add_products((product,)):
+            raise DuplicateError([product.id])
+
+    @abstractmethod
+    def page_products(
+        self, cursor: int = 0, limit: int = 100, category: Optional[str] = None
+    ) -> Tuple[List[Product], Optional[int]]:
+        """
+        Retourne une page de produits, dans leur ordre d'ajout.
+
+        Args:
+            cursor: 0, ou le curseur retourné par la page précédente
+            limit: Nombre maximal de produits de la page
+            category: Si fournie, seuls les produits de cette catégorie sont
+                parcourus (le curseur est alors propre à ce filtre)
+
+        Returns:
+            (produits, curseur de la page suivante ou None s'il n'y en a pas)
+        """
+
+    @abstractmethod
+    def count_products(self) -> int:
+        """Retourne le nombre de produits."""
+
+    @abstractmethod
+    def get_discount(self, code: str) -> Optional[Discount]:
+        """Retourne une remise par son code, ou None si elle est absente."""
+
+    @abstractmethod
+    def add_discounts(self, discounts: Sequence[Discount]) -> List[int]:
+        """
+        Ajoute des remises en une seule écriture.
+
+        Les remises dont le code existe déjà (ou apparaît plus tôt dans le
+        lot) ne sont pas ajoutées.
+
+        Returns:
+            Les positions dans le lot des remises non ajoutées, croissantes
+        """
+
+    def add_discount(self, discount: Discount) -> None:
+        """
+        Ajoute une remise.
+
+        Raises:
+            DuplicateError: Si une remise de même code existe déjà
+        """
+        if self.add_discounts((discount,)):
+            raise DuplicateError([discount.code])
+
+    @abstractmethod
+    def list_discounts(self) -> List[Discount]:
+        """Retourne toutes les remises, dans leur ordre d'ajout."""
+
+    def discounts_after(self, cursor: int = 0) -> Tuple[List[Discount], int]:
+        """
+        Retourne les remises ajoutées après un curseur, dans leur ordre d'ajout.
+
+        Permet de suivre les remises ajoutées par d'autres processus qui
+        partagent le dépôt sans relire celles déjà vues. L'implémentation
+        par défaut relit toutes les remises.
+
+        Args:
+            cursor: 0, ou le curseur retourné par l'appel précédent
+
+        Returns:
+            (remises ajoutées après le curseur, curseur de l'appel suivant)
+        """
+        discounts = self.list_discounts()
+        return discounts[cursor:], len(discounts)
+
+    def close(self) -> None:
+        """Libère les ressources du dépôt (connexions)."""
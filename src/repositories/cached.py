@@ -0,0 +1,153 @@
+"""Cache en lecture devant un dépôt."""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+from ..models.discount import Discount
+from ..models.product import Product
+from .base import CatalogRepository
+
+V = TypeVar("V")
+
+
+class CachedRepository(CatalogRepository):
+    """
+    Dépôt servant les lectures depuis un cache LRU en mémoire.
+
+    Une lecture absente du cache est transmise au dépôt sous-jacent puis
+    mise en cache ; les écritures sont transmises puis mises en cache. Les
+    produits et les remises n'étant jamais modifiés ni supprimés, une
+    entrée en cache ne devient jamais périmée, même si d'autres processus
+    écrivent dans le même dépôt. Les absences ne sont pas mises en cache :
+    un produit ajouté par un autre processus est trouvé dès sa création.
+
+    Le cache retourne toujours la même instance d'un produit, ce qui permet
+    aux caches indexés par instance (ProductJsonCache) de la réutiliser.
+
+    Le dépôt peut être partagé entre threads.
+    """
+
+    def __init__(self, backend: CatalogRepository, max_entries: int = 100_000) -> None:
+        """
+        Initialise le cache.
+
+        Args:
+            backend: Dépôt sous-jacent
+            max_entries: Nombre maximal de produits (et de remises) en cache
+        """
+        if max_entries <= 0:
+            raise ValueError("La taille du cache doit être strictement positive")
+        self.backend = backend
+        self.max_entries = max_entries
+        self._products: "OrderedDict[str, Product]" = OrderedDict()
+        self._discounts: "OrderedDict[str, Discount]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _store(self, cache: "OrderedDict[str, V]", entries: Iterable[Tuple[str, V]]) -> None:
+        """Met des entrées en cache et évince les moins récentes (verrou détenu)."""
+        for key, value in entries:
+            cache[key] = value
+            cache.move_to_end(key)
+        while len(cache) > self.max_entries:
+            cache.popitem(last=False)
+
+    def get_product(self, product_id: str) -> Optional[Product]:
+        """Retourne un produit par son ID, depuis le cache si possible."""
+        return self.get_products((product_id,)).get(product_id)
+
+    def get_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """Retourne les produits trouvés ; seuls les absents du cache sont lus."""
+        found: Dict[str, Product] = {}
+        missing: List[str] = []
+        with self._lock:
+            cache = self._products
+            for product_id in dict.fromkeys(product_ids):
+                product = cache.get(product_id)
+                if product is None:
+                    missing.append(product_id)
+                else:
+                    cache.move_to_end(product_id)
+                    found[product_id] = product
+            self.hits += len(found)
+            self.misses += len(missing)
+        if missing:
+            loaded = self.backend.get_products(missing)
+            with self._lock:
+                self._store(self._products, loaded.items())
+            found.update(loaded)
+        return found
+
+    def add_products(self, products: Sequence[Product]) -> List[int]:
+        """Ajoute des produits au dépôt, puis met les produits ajoutés en cache."""
+        rejected = self.backend.add_products(products)
+        skipped = set(rejected)
+        added = (product for index, product in enumerate(products) if index not in skipped)
+        with self._lock:
+            self._store(self._products, ((product.id, product) for product in added))
+        return rejected
+
+    def page_products(
+        self, cursor: int = 0, limit: int = 100, category: Optional[str] = None
+    ) -> Tuple[List[Product], Optional[int]]:
+        """Lit une page dans le dépôt, avec les instances en cache des produits."""
+        page, next_cursor = self.backend.page_products(cursor, limit, category)
+        with self._lock:
+            cache = self._products
+            page = [cache.get(product.id) or product for product in page]
+            self._store(cache, ((product.id, product) for product in page))
+        return page, next_cursor
+
+    def count_products(self) -> int:
+        """Retourne le nombre de produits du dépôt."""
+        return self.backend.count_products()
+
+    def get_discount(self, code: str) -> Optional[Discount]:
+        """Retourne une remise par son code, depuis le cache si possible."""
+        with self._lock:
+            discount = self._discounts.get(code)
+            if discount is not None:
+                self._discounts.move_to_end(code)
+                self.hits += 1
+                return discount
+            self.misses += 1
+        discount = self.backend.get_discount(code)
+        if discount is not None:
+            with self._lock:
+                self._store(self._discounts, ((code, discount),))
+        return discount
+
+    def add_discounts(self, discounts: Sequence[Discount]) -> List[int]:
+        """Ajoute des remises au dépôt, puis met les remises ajoutées en cache."""
+        rejected = self.backend.add_discounts(discounts)
+        skipped = set(rejected)
+        added = (discount for index, discount in enumerate(discounts) if index not in skipped)
+        with self._lock:
+            self._store(self._discounts, ((discount.code, discount) for discount in added))
+        return rejected
+
+    def list_discounts(self) -> List[Discount]:
+        """Retourne toutes les remises du dépôt."""
+        return self.backend.list_discounts()
+
+    def discounts_after(self, cursor: int = 0) -> Tuple[List[Discount], int]:
+        """Retourne les remises ajoutées après un curseur, lues dans le dépôt."""
+        return self.backend.discounts_after(cursor)
+
+    def close(self) -> None:
+        """Ferme le dépôt sous-jacent."""
+        self.backend.close()
+
+    def stats(self) -> Dict[str, float]:
+        """Retourne les compteurs du cache et son taux de succès."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "products": len(self._products),
+                "discounts": len(self._discounts),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
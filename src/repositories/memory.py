@@ -0,0 +1,78 @@
+"""Dépôt en mémoire (tests et démonstration)."""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..models.catalog import ProductCatalog
+from ..models.discount import Discount
+from ..models.product import Product
+from ..models.sharded_store import ShardedStore
+from .base import CatalogRepository
+
+
+class InMemoryRepository(CatalogRepository):
+    """
+    Dépôt conservant produits et remises dans le processus courant.
+
+    Produits et remises sont indexés par des ShardedStore : les ajouts
+    sont atomiques (un seul de deux ajouts concurrents d'une même clé
+    réussit) sans verrou global, et les lectures ne prennent aucun verrou.
+    Les données sont perdues à l'arrêt et propres à chaque processus.
+    """
+
+    def __init__(self) -> None:
+        """Initialise un dépôt vide."""
+        self.products = ProductCatalog()
+        self._discounts: ShardedStore[str, Discount] = ShardedStore()
+        self._discount_order: List[Discount] = []
+
+    def get_product(self, product_id: str) -> Optional[Product]:
+        """Retourne un produit par son ID, ou None s'il est absent."""
+        return self.products.get(product_id)
+
+    def get_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """Retourne les produits trouvés parmi des IDs."""
+        found: Dict[str, Product] = {}
+        get = self.products.get
+        for product_id in product_ids:
+            product = get(product_id)
+            if product is not None:
+                found[product_id] = product
+        return found
+
+    def add_products(self, products: Sequence[Product]) -> List[int]:
+        """Ajoute les produits dont l'ID est absent."""
+        return self.products.add_absent(products)
+
+    def page_products(
+        self, cursor: int = 0, limit: int = 100, category: Optional[str] = None
+    ) -> Tuple[List[Product], Optional[int]]:
+        """Retourne une page de produits (le curseur est une position)."""
+        return self.products.page(cursor, limit, category)
+
+    def count_products(self) -> int:
+        """Retourne le nombre de produits."""
+        return len(self.products)
+
+    def get_discount(self, code: str) -> Optional[Discount]:
+        """Retourne une remise par son code, ou None si elle est absente."""
+        return self._discounts.get(code)
+
+    def add_discounts(self, discounts: Sequence[Discount]) -> List[int]:
+        """Ajoute les remises dont le code est absent."""
+        rejected = self._discounts.insert_many(
+            [(discount.code, discount) for discount in discounts]
+        )
+        skipped = set(rejected)
+        self._discount_order.extend(
+            [discount for index, discount in enumerate(discounts) if index not in skipped]
+        )
+        return rejected
+
+    def list_discounts(self) -> List[Discount]:
+        """Retourne toutes les remises, dans leur ordre d'ajout."""
+        return self._discount_order[:]
+
+    def discounts_after(self, cursor: int = 0) -> Tuple[List[Discount], int]:
+        """Retourne les remises ajoutées après un curseur (une position)."""
+        added = self._discount_order[cursor:]
+        return added, cursor + len(added)
@@ -0,0 +1,287 @@
+"""Dépôt SQLite des produits et des remises."""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..models.discount import Discount, DiscountType
+from ..models.product import Product
+from .base import CatalogRepository
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    price TEXT NOT NULL,
+    category TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS products_category ON products (category, seq);
+CREATE TABLE IF NOT EXISTS discounts (
+    seq INTEGER PRIMARY KEY,
+    code TEXT NOT NULL UNIQUE,
+    type TEXT NOT NULL,
+    value TEXT NOT NULL,
+    min_amount TEXT,
+    category TEXT
+);
+"""
+
+# Requêtes de texte fixe : chaque connexion les compile une fois (cache de
+# requêtes préparées du module sqlite3). Les listes d'IDs sont passées en un
+# seul paramètre JSON, quel que soit leur nombre.
+_PRODUCT_COLUMNS = "id, name, price, category"
+_GET_PRODUCT = f"SELECT {_PRODUCT_COLUMNS} FROM products WHERE id = ?"
+_GET_PRODUCTS = (
+    f"SELECT {_PRODUCT_COLUMNS} FROM products WHERE id IN (SELECT value FROM json_each(?))"
+)
+_EXISTING_PRODUCTS = "SELECT id FROM products WHERE id IN (SELECT value FROM json_each(?))"
+_INSERT_PRODUCT = "INSERT INTO products (id, name, price, category) VALUES (?, ?, ?, ?)"
+_PAGE_PRODUCTS = f"SELECT seq, {_PRODUCT_COLUMNS} FROM products WHERE seq > ? ORDER BY seq LIMIT ?"
+_PAGE_CATEGORY_PRODUCTS = (
+    f"SELECT seq, {_PRODUCT_COLUMNS} FROM products"
+    " WHERE category = ? AND seq > ? ORDER BY seq LIMIT ?"
+)
+_COUNT_PRODUCTS = "SELECT COUNT(*) FROM products"
+_DISCOUNT_COLUMNS = "code, type, value, min_amount, category"
+_GET_DISCOUNT = f"SELECT {_DISCOUNT_COLUMNS} FROM discounts WHERE code = ?"
+_EXISTING_DISCOUNTS = "SELECT code FROM discounts WHERE code IN (SELECT value FROM json_each(?))"
+_INSERT_DISCOUNT = (
+    "INSERT INTO discounts (code, type, value, min_amount, category) VALUES (?, ?, ?, ?, ?)"
+)
+_LIST_DISCOUNTS = f"SELECT {_DISCOUNT_COLUMNS} FROM discounts ORDER BY seq"
+_DISCOUNTS_AFTER = f"SELECT seq, {_DISCOUNT_COLUMNS} FROM discounts WHERE seq > ? ORDER BY seq"
+
+ProductRow = Tuple[str, str, str, str]
+DiscountRow = Tuple[str, str, str, Optional[str], Optional[str]]
+
+
+def _product(row: ProductRow) -> Product:
+    """Reconstruit un produit à partir d'une ligne."""
+    return Product(id=row[0], name=row[1], price=Decimal(row[2]), category=row[3])
+
+
+def _discount(row: DiscountRow) -> Discount:
+    """Reconstruit une remise à partir d'une ligne."""
+    return Discount(
+        code=row[0],
+        discount_type=DiscountType(row[1]),
+        value=Decimal(row[2]),
+        min_amount=Decimal(row[3]) if row[3] is not None else None,
+        category=row[4],
+    )
+
+
+class SQLiteRepository(CatalogRepository):
+    """
+    Dépôt persistant dans une base SQLite en mode WAL.
+
+    Chaque opération emprunte une connexion à un pool borné et la rend
+    ensuite : les connexions sont réutilisées d'une requête à l'autre, sans
+    qu'un serveur qui crée un thread par requête en ouvre une par thread.
+    Au-delà de pool_size opérations simultanées, les connexions
+    supplémentaires sont fermées dès leur retour. Un processus issu d'un
+    fork ouvre ses propres connexions. En mode WAL, les lectures ne
+    bloquent pas les écritures et plusieurs processus peuvent partager la
+    base.
+
+    Les montants sont stockés sous forme de texte décimal, sans perte de
+    précision. Chaque lot d'écritures est une seule transaction (une seule
+    synchronisation du journal), avec des requêtes exécutées par executemany.
+    """
+
+    def __init__(self, path: str, timeout: float = 5.0, pool_size: int = 8) -> None:
+        """
+        Ouvre (ou crée) la base.
+
+        Args:
+            path: Chemin du fichier de la base
+            timeout: Attente maximale d'un verrou d'écriture, en secondes
+            pool_size: Nombre maximal de connexions inactives conservées
+        """
+        if pool_size <= 0:
+            raise ValueError("La taille du pool doit être strictement positive")
+        self.path = path
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._idle: List[sqlite3.Connection] = []
+        # Connexions héritées d'un fork : jamais fermées par l'enfant, dont la
+        # fermeture pourrait toucher aux verrous et au WAL du parent
+        self._inherited: List[sqlite3.Connection] = []
+        self._pid = os.getpid()
+        self._generation = 0
+        self._lock = threading.Lock()
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _open(self) -> sqlite3.Connection:
+        """Ouvre une connexion en mode WAL."""
+        # isolation_level=None : transactions explicites (BEGIN IMMEDIATE)
+        connection = sqlite3.connect(
+            self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Emprunte une connexion au pool (ouverte si besoin), rendue en sortie."""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._inherited.extend(self._idle)
+                self._idle = []
+                self._pid = os.getpid()
+            connection = self._idle.pop() if self._idle else None
+            generation = self._generation
+        if connection is None:
+            connection = self._open()
+        try:
+            yield connection
+        finally:
+            with self._lock:
+                keep = (
+                    generation == self._generation
+                    and self._pid == os.getpid()
+                    and len(self._idle) < self.pool_size
+                )
+                if keep:
+                    self._idle.append(connection)
+            if not keep:
+                connection.close()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Ouvre une transaction d'écriture, validée ou annulée en sortie."""
+        with self._connection() as connection:
+            # IMMEDIATE : le verrou d'écriture est pris avant les lectures du lot
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def get_product(self, product_id: str) -> Optional[Product]:
+        """Retourne un produit par son ID, ou None s'il est absent."""
+        with self._connection() as connection:
+            row = connection.execute(_GET_PRODUCT, (product_id,)).fetchone()
+        return _product(row) if row is not None else None
+
+    def get_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """Retourne en une seule requête les produits trouvés parmi des IDs."""
+        ids = list(dict.fromkeys(product_ids))
+        if not ids:
+            return {}
+        with self._connection() as connection:
+            rows = connection.execute(_GET_PRODUCTS, (json.dumps(ids),)).fetchall()
+        return {row[0]: _product(row) for row in rows}
+
+    def add_products(self, products: Sequence[Product]) -> List[int]:
+        """Ajoute en une transaction les produits dont l'ID est absent."""
+        if not products:
+            return []
+        ids = json.dumps([product.id for product in products])
+        with self._write() as connection:
+            seen = {row[0] for row in connection.execute(_EXISTING_PRODUCTS, (ids,))}
+            rejected: List[int] = []
+            rows: List[ProductRow] = []
+            for index, product in enumerate(products):
+                if product.id in seen:
+                    rejected.append(index)
+                else:
+                    seen.add(product.id)
+                    rows.append((product.id, product.name, str(product.price), product.category))
+            connection.executemany(_INSERT_PRODUCT, rows)
+        return rejected
+
+    def page_products(
+        self, cursor: int = 0, limit: int = 100, category: Optional[str] = None
+    ) -> Tuple[List[Product], Optional[int]]:
+        """Retourne une page de produits (le curseur est un numéro de ligne)."""
+        if cursor < 0:
+            raise ValueError("La position ne peut pas être négative")
+        if limit <= 0:
+            raise ValueError("La taille de page doit être strictement positive")
+        # Une ligne de plus que la page indique s'il reste des produits
+        with self._connection() as connection:
+            if category is None:
+                rows = connection.execute(_PAGE_PRODUCTS, (cursor, limit + 1)).fetchall()
+            else:
+                rows = connection.execute(
+                    _PAGE_CATEGORY_PRODUCTS, (category, cursor, limit + 1)
+                ).fetchall()
+        page = [_product(row[1:]) for row in rows[:limit]]
+        return page, rows[limit - 1][0] if len(rows) > limit else None
+
+    def count_products(self) -> int:
+        """Retourne le nombre de produits."""
+        with self._connection() as connection:
+            count: int = connection.execute(_COUNT_PRODUCTS).fetchone()[0]
+        return count
+
+    def get_discount(self, code: str) -> Optional[Discount]:
+        """Retourne une remise par son code, ou None si elle est absente."""
+        with self._connection() as connection:
+            row = connection.execute(_GET_DISCOUNT, (code,)).fetchone()
+        return _discount(row) if row is not None else None
+
+    def add_discounts(self, discounts: Sequence[Discount]) -> List[int]:
+        """Ajoute en une transaction les remises dont le code est absent."""
+        if not discounts:
+            return []
+        codes = json.dumps([discount.code for discount in discounts])
+        with self._write() as connection:
+            seen = {row[0] for row in connection.execute(_EXISTING_DISCOUNTS, (codes,))}
+            rejected: List[int] = []
+            rows: List[DiscountRow] = []
+            for index, discount in enumerate(discounts):
+                if discount.code in seen:
+                    rejected.append(index)
+                    continue
+                seen.add(discount.code)
+                rows.append(
+                    (
+                        discount.code,
+                        discount.discount_type.value,
+                        str(discount.value),
+                        str(discount.min_amount) if discount.min_amount is not None else None,
+                        discount.category,
+                    )
+                )
+            connection.executemany(_INSERT_DISCOUNT, rows)
+        return rejected
+
+    def list_discounts(self) -> List[Discount]:
+        """Retourne toutes les remises, dans leur ordre d'ajout."""
+        with self._connection() as connection:
+            rows = connection.execute(_LIST_DISCOUNTS).fetchall()
+        return [_discount(row) for row in rows]
+
+    def discounts_after(self, cursor: int = 0) -> Tuple[List[Discount], int]:
+        """
+        Retourne les remises ajoutées après un curseur (un numéro de ligne).
+
+        Une seule lecture de l'index de la clé primaire : sans nouvelle
+        remise, aucune ligne n'est lue.
+        """
+        with self._connection() as connection:
+            rows = connection.execute(_DISCOUNTS_AFTER, (cursor,)).fetchall()
+        return [_discount(row[1:]) for row in rows], rows[-1][0] if rows else cursor
+
+    def close(self) -> None:
+        """
+        Ferme les connexions inactives du pool (rouvertes à la demande ensuite).
+
+        Les connexions empruntées à ce moment sont fermées à leur retour.
+        """
+        with self._lock:
+            connections, self._idle = self._idle, []
+            self._generation += 1
+        for connection in connections:
+            connection.close()
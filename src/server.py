@@ -0,0 +1,337 @@
+"""
+Serveur WSGI multiprocessus (prefork), fondé sur la bibliothèque standard.
+
+Le processus maître crée l'application une fois (préchargement), ouvre la
+socket d'écoute, puis lance N workers par fork : chacun hérite de
+l'application déjà construite et accepte les connexions sur la socket
+partagée. Le maître ne sert aucune requête ; il relance les workers
+arrêtés et traite les signaux :
+
+- SIGTERM / SIGINT : arrêt gracieux (les requêtes en cours se terminent) ;
+- SIGHUP : rechargement gracieux. L'application est reconstruite, de
+  nouveaux workers sont lancés, puis les anciens terminent leur requête
+  en cours et s'arrêtent. Si la reconstruction échoue, les workers en
+  place continuent de servir.
+
+Un worker peut être recyclé après un nombre de requêtes (max_requests,
+avec une variation aléatoire pour que les workers ne s'arrêtent pas tous
+ensemble) ; un worker qui ne s'arrête pas dans le délai de grâce est tué.
+
+Nécessite os.fork (POSIX).
+"""
+
+import logging
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from types import FrameType
+from typing import Any, Callable, Dict, Optional, Tuple
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+logger = logging.getLogger(__name__)
+
+# Application WSGI : app(environ, start_response)
+WSGIApp = Callable[..., Any]
+
+# Le prefork nécessite fork (indisponible sous Windows)
+PREFORK_SUPPORTED = hasattr(os, "fork")
+
+# Intervalle de surveillance du maître, et d'attente d'une connexion d'un worker
+_POLL_INTERVAL = 0.1
+_ACCEPT_TIMEOUT = 0.5
+# Signaux traités par le maître (et, différemment, par les workers)
+_CONTROL_SIGNALS = {signal.SIGTERM, signal.SIGINT, signal.SIGHUP} if PREFORK_SUPPORTED else set()
+
+
+class _RequestHandler(WSGIRequestHandler):
+    """Gestionnaire de requêtes journalisant via logging plutôt que sur stderr."""
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Journalise une requête (niveau DEBUG)."""
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class _WorkerServer(WSGIServer):
+    """Serveur WSGI d'un worker, sur la socket d'écoute partagée."""
+
+    def __init__(self, listener: socket.socket, app: WSGIApp, request_timeout: float) -> None:
+        """
+        Initialise le serveur sans ouvrir de socket.
+
+        Args:
+            listener: Socket d'écoute partagée, non bloquante
+            app: Application WSGI
+            request_timeout: Délai d'inactivité d'une connexion, en secondes
+        """
+        super().__init__(listener.getsockname()[:2], _RequestHandler, bind_and_activate=False)
+        self.socket.close()
+        self.socket = listener
+        host, port = listener.getsockname()[:2]
+        self.server_name = host
+        self.server_port = port
+        self.setup_environ()
+        self.set_app(app)
+        self.request_timeout = request_timeout
+        self.timeout = _ACCEPT_TIMEOUT
+        self.handled = 0
+
+    def get_request(self) -> Tuple[socket.socket, Any]:
+        """Accepte une connexion (BlockingIOError si un autre worker l'a prise)."""
+        connection, address = self.socket.accept()
+        connection.settimeout(self.request_timeout)
+        return connection, address
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        """Traite une requête et la compte."""
+        self.handled += 1
+        super().process_request(request, client_address)
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        """Journalise l'erreur d'une connexion, sans arrêter le worker."""
+        error = sys.exc_info()[1]
+        if isinstance(error, (socket.timeout, ConnectionError)):
+            logger.info("Connexion interrompue : %s", error, extra={"client": client_address})
+        else:
+            logger.error("Erreur lors du traitement d'une requête", exc_info=True)
+
+
+class PreforkServer:
+    """Serveur WSGI à processus maître et workers préforkés."""
+
+    def __init__(
+        self,
+        app_factory: Callable[[], WSGIApp],
+        host: str = "127.0.0.1",
+        port: int = 5001,
+        workers: int = 2,
+        backlog: int = 1024,
+        timeout: float = 30.0,
+        graceful_timeout: float = 30.0,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+    ) -> None:
+        """
+        Initialise le serveur.
+
+        Args:
+            app_factory: Construit l'application (au démarrage et à chaque SIGHUP)
+            host: Adresse d'écoute
+            port: Port d'écoute (0 : choisi par le système, voir address)
+            workers: Nombre de workers
+            backlog: Taille de la file des connexions en attente d'acceptation
+            timeout: Délai d'inactivité d'une connexion client, en secondes
+            graceful_timeout: Délai laissé à un worker pour s'arrêter avant
+                d'être tué, en secondes
+            max_requests: Nombre de requêtes après lequel un worker est
+                remplacé (0 : jamais)
+            max_requests_jitter: Variation aléatoire maximale ajoutée à
+                max_requests pour chaque worker
+        """
+        if workers <= 0:
+            raise ValueError("Le nombre de workers doit être strictement positif")
+        if backlog <= 0:
+            raise ValueError("La taille de la file d'attente doit être strictement positive")
+        if timeout <= 0 or graceful_timeout <= 0:
+            raise ValueError("Les délais doivent être strictement positifs")
+        if max_requests < 0 or max_requests_jitter < 0:
+            raise ValueError("Le nombre maximal de requêtes ne peut pas être négatif")
+
+        self.app_factory = app_factory
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.backlog = backlog
+        self.timeout = timeout
+        self.graceful_timeout = graceful_timeout
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self._socket: Optional[socket.socket] = None
+        self._app: Optional[WSGIApp] = None
+        # Workers de la génération courante, et workers en cours d'arrêt (échéance)
+        self._workers: Dict[int, int] = {}
+        self._retiring: Dict[int, float] = {}
+        self._generation = 0
+        self._stopping = False
+        self._reloading = False
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Adresse d'écoute effective (la socket est ouverte si besoin)."""
+        host, port = self.bind().getsockname()[:2]
+        return host, port
+
+    def bind(self) -> socket.socket:
+        """Ouvre la socket d'écoute partagée par les workers."""
+        if self._socket is None:
+            listener = socket.create_server((self.host, self.port), backlog=self.backlog)
+            # Non bloquante : un worker devancé par un autre n'attend pas dans accept
+            listener.setblocking(False)
+            self._socket = listener
+        return self._socket
+
+    def serve_forever(self) -> None:
+        """
+        Lance les workers et les surveille jusqu'à SIGTERM ou SIGINT.
+
+        À appeler depuis le thread principal (gestion des signaux).
+
+        Raises:
+            RuntimeError: Si os.fork n'est pas disponible
+        """
+        if not PREFORK_SUPPORTED:
+            raise RuntimeError("Le serveur prefork nécessite os.fork (POSIX)")
+        listener = self.bind()
+        self._app = self.app_factory()
+        self._generation = 1
+        previous = {
+            signum: signal.signal(signum, self._handle_signal) for signum in _CONTROL_SIGNALS
+        }
+        host, port = self.address
+        logger.info(
+            "Serveur prefork démarré sur %s:%d",
+            host,
+            port,
+            extra={"master_pid": os.getpid(), "workers": self.workers},
+        )
+        try:
+            while not self._stopping:
+                if self._reloading:
+                    self._reloading = False
+                    self._reload()
+                self._reap()
+                self._spawn_missing(listener)
+                self._kill_overdue()
+                time.sleep(_POLL_INTERVAL)
+        finally:
+            self._shutdown()
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+    def _handle_signal(self, signum: int, frame: Optional[FrameType]) -> None:
+        """Note un signal reçu par le maître ; la boucle principale le traite."""
+        if signum == signal.SIGHUP:
+            self._reloading = True
+        else:
+            self._stopping = True
+
+    def _reload(self) -> None:
+        """Reconstruit l'application et remplace tous les workers."""
+        try:
+            app = self.app_factory()
+        except Exception:
+            logger.error(
+                "Rechargement impossible, les workers actuels sont conservés", exc_info=True
+            )
+            return
+        self._app = app
+        self._generation += 1
+        logger.info("Rechargement", extra={"generation": self._generation})
+        # Les nouveaux workers démarrent avant l'arrêt des anciens : aucune interruption
+        old_workers = list(self._workers)
+        self._workers.clear()
+        self._spawn_missing(self.bind())
+        for pid in old_workers:
+            self._retire(pid)
+
+    def _spawn_missing(self, listener: socket.socket) -> None:
+        """Lance les workers manquants de la génération courante."""
+        while len(self._workers) < self.workers:
+            max_requests = self.max_requests
+            if max_requests and self.max_requests_jitter:
+                # Tiré dans le maître : chaque worker a sa propre limite
+                max_requests += random.randint(0, self.max_requests_jitter)
+            # Signaux bloqués jusqu'à l'installation des gestionnaires du worker
+            signal.pthread_sigmask(signal.SIG_BLOCK, _CONTROL_SIGNALS)
+            try:
+                pid = os.fork()
+                if pid == 0:
+                    self._run_worker(listener, max_requests)
+            finally:
+                signal.pthread_sigmask(signal.SIG_UNBLOCK, _CONTROL_SIGNALS)
+            self._workers[pid] = self._generation
+
+    def _run_worker(self, listener: socket.socket, max_requests: int) -> None:
+        """Boucle d'un worker ; ne retourne jamais (os._exit)."""
+        code = 0
+        try:
+            stopping = False
+
+            def stop(signum: int, frame: Optional[FrameType]) -> None:
+                nonlocal stopping
+                stopping = True
+
+            signal.signal(signal.SIGTERM, stop)
+            # Ctrl-C et SIGHUP sont destinés au maître, qui arrête les workers
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, _CONTROL_SIGNALS)
+            assert self._app is not None
+            server = _WorkerServer(listener, self._app, self.timeout)
+            while not stopping and not (max_requests and server.handled >= max_requests):
+                server.handle_request()
+            if not stopping:
+                logger.info(
+                    "Worker recyclé", extra={"pid": os.getpid(), "requests": server.handled}
+                )
+        except BaseException:
+            logger.error("Arrêt anormal du worker", exc_info=True)
+            code = 1
+        finally:
+            # Pas de nettoyage de l'interpréteur : les ressources héritées sont au maître
+            os._exit(code)
+
+    def _retire(self, pid: int) -> None:
+        """Demande l'arrêt gracieux d'un worker."""
+        self._retiring[pid] = time.monotonic() + self.graceful_timeout
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _reap(self) -> None:
+        """Récupère les workers arrêtés."""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                # Plus aucun processus fils
+                self._workers.clear()
+                self._retiring.clear()
+                return
+            if pid == 0:
+                return
+            retired = self._retiring.pop(pid, None) is not None
+            self._workers.pop(pid, None)
+            code = os.waitstatus_to_exitcode(status)
+            if code != 0 and not retired:
+                logger.warning("Worker arrêté anormalement", extra={"pid": pid, "code": code})
+
+    def _kill_overdue(self) -> None:
+        """Tue les workers qui ne se sont pas arrêtés dans le délai de grâce."""
+        now = time.monotonic()
+        for pid, deadline in list(self._retiring.items()):
+            if now >= deadline:
+                logger.warning("Worker tué après le délai de grâce", extra={"pid": pid})
+                self._retiring[pid] = float("inf")
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+    def _shutdown(self) -> None:
+        """Arrête gracieusement tous les workers, puis ferme la socket."""
+        for pid in list(self._workers):
+            self._retire(pid)
+        self._workers.clear()
+        while self._retiring:
+            self._reap()
+            self._kill_overdue()
+            if self._retiring:
+                time.sleep(_POLL_INTERVAL)
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        logger.info("Serveur prefork arrêté")
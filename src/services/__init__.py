@@ -1,7 +1,18 @@
 """Services métier du projet."""
 
-from .checkout_service import CheckoutService
+from .async_checkout_service import AsyncCheckoutService
+from .checkout_cache import CheckoutCache
+from .checkout_service import CheckoutService, CheckoutState
 from .tax_calculator import TaxCalculator
+from .tax_rate_provider import FakeTaxRateProvider, StaticTaxRateProvider, TaxRateProvider
 
-__all__ = ["CheckoutService", "TaxCalculator"]
-
+__all__ = [
+    "AsyncCheckoutService",
+    "CheckoutCache",
+    "CheckoutService",
+    "CheckoutState",
+    "FakeTaxRateProvider",
+    "StaticTaxRateProvider",
+    "TaxCalculator",
+    "TaxRateProvider",
+]
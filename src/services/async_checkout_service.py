@@ -0,0 +1,196 @@
+"""Service de checkout asynchrone, avec taux de taxe fournis à la demande."""
+
+import asyncio
+import time
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from ..models.cart import Cart
+from ..models.category import category_registry
+from ..models.columnar_cart import ColumnarCart
+from ..models.discount import Discount
+from ..models.money import Money, Rounding
+from .checkout_service import _RESULT_KEYS, CheckoutService
+from .tax_calculator import TaxCalculator
+from .tax_rate_provider import TaxRateProvider
+
+
+class AsyncCheckoutService:
+    """
+    Service de checkout dont les taux de taxe viennent d'un TaxRateProvider.
+
+    Les taux des catégories distinctes d'un panier sont demandés
+    concurremment. Une demande pour une catégorie déjà en cours n'appelle
+    pas le fournisseur une seconde fois : elle attend le résultat de la
+    demande en cours. Les taux obtenus sont conservés dans un cache local
+    pendant une durée de vie (TTL) ; à l'expiration d'un taux, les demandes
+    simultanées sont elles aussi regroupées en un seul appel, ce qui évite
+    une avalanche d'appels vers le fournisseur.
+
+    Une erreur du fournisseur est propagée à toutes les demandes regroupées
+    et n'est pas mise en cache. Le calcul lui-même est celui de
+    CheckoutService. Le service s'utilise depuis une seule boucle asyncio à
+    la fois.
+    """
+
+    def __init__(
+        self,
+        provider: TaxRateProvider,
+        ttl: Optional[float] = 300.0,
+        money_rounding: Optional[Rounding] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialise le service.
+
+        Args:
+            provider: Fournisseur des taux de taxe
+            ttl: Durée de vie d'un taux en cache, en secondes (None : pas d'expiration)
+            money_rounding: Si fourni, les totaux sont calculés en centimes
+                entiers (voir CheckoutService)
+            clock: Horloge monotone, en secondes (injectable pour les tests)
+        """
+        if ttl is not None and ttl <= 0:
+            raise ValueError("La durée de vie doit être strictement positive")
+
+        self.provider = provider
+        self.ttl = ttl
+        self.money_rounding = money_rounding
+        self._clock = clock
+        self._rates: Dict[str, Tuple[float, Decimal]] = {}
+        self._in_flight: Dict[str, "asyncio.Future[Decimal]"] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get_rates(self, categories: Iterable[str]) -> Dict[str, Decimal]:
+        """
+        Retourne les taux de taxe de plusieurs catégories.
+
+        Args:
+            categories: Catégories de produits (les doublons sont ignorés)
+
+        Returns:
+            Le taux de chaque catégorie distincte
+        """
+        names = list(dict.fromkeys(categories))
+        rates = await asyncio.gather(*(self._get_rate(name) for name in names))
+        return dict(zip(names, rates))
+
+    async def _get_rate(self, category: str) -> Decimal:
+        """Retourne un taux depuis le cache, une demande en cours ou le fournisseur."""
+        entry = self._rates.get(category)
+        if entry is not None:
+            if entry[0] > self._clock():
+                self.hits += 1
+                return entry[1]
+            del self._rates[category]
+
+        future = self._in_flight.get(category)
+        if future is None:
+            self.misses += 1
+            future = asyncio.ensure_future(self._fetch(category))
+            # Lit l'erreur même si toutes les demandes ont été annulées
+            future.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._in_flight[category] = future
+        else:
+            self.coalesced += 1
+        # L'annulation d'une demande n'annule pas l'appel partagé
+        return await asyncio.shield(future)
+
+    async def _fetch(self, category: str) -> Decimal:
+        """Interroge le fournisseur et met le taux en cache."""
+        generation = self._generation
+        try:
+            rate = await self.provider.get_rate(category)
+            if rate < 0:
+                raise ValueError(f"Taux de taxe négatif pour la catégorie {category}")
+            # Un taux obtenu pendant une invalidation peut être périmé
+            if generation == self._generation:
+                expires_at = self._clock() + self.ttl if self.ttl is not None else float("inf")
+                self._rates[category] = (expires_at, rate)
+            return rate
+        finally:
+            del self._in_flight[category]
+
+    def invalidate(self, category: Optional[str] = None) -> None:
+        """
+        Oublie le taux en cache d'une catégorie, ou tous les taux.
+
+        Args:
+            category: Catégorie dont le taux a changé (None : toutes)
+        """
+        self._generation += 1
+        if category is None:
+            self._rates.clear()
+        else:
+            self._rates.pop(category, None)
+
+    def stats(self) -> Dict[str, float]:
+        """Retourne les compteurs du cache des taux et son taux de succès."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._rates),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    async def _checkout_service(
+        self, carts: Iterable[Union[Cart, ColumnarCart]]
+    ) -> Optional[CheckoutService]:
+        """Construit un service de checkout avec les taux des catégories des paniers."""
+        codes: Dict[int, None] = {}
+        for cart in carts:
+            codes.update(dict.fromkeys(cart.code_subtotals))
+        if not codes:
+            return None
+        rates = await self.get_rates(category_registry.name(code) for code in codes)
+        return CheckoutService(TaxCalculator(rates), money_rounding=self.money_rounding)
+
+    async def calculate_total(
+        self, cart: Union[Cart, ColumnarCart], discount: Optional[Discount] = None
+    ) -> dict:
+        """
+        Calcule le total final du panier avec taxes et remises.
+
+        Args:
+            cart: Le panier d'achat (Cart ou ColumnarCart)
+            discount: Remise optionnelle à appliquer
+
+        Returns:
+            Le même dictionnaire que CheckoutService.calculate_total
+        """
+        checkout_service = await self._checkout_service((cart,))
+        if checkout_service is None:
+            return self._empty_result()
+        return checkout_service.calculate_total(cart, discount)
+
+    async def calculate_total_many(
+        self, carts: Sequence[Union[Cart, ColumnarCart]], discount: Optional[Discount] = None
+    ) -> List[dict]:
+        """
+        Calcule le total de nombreux paniers.
+
+        Les taux de l'ensemble des catégories des paniers sont demandés une
+        seule fois, concurremment.
+
+        Args:
+            carts: Les paniers d'achat
+            discount: Remise optionnelle appliquée à chaque panier
+
+        Returns:
+            Le résultat de calculate_total pour chaque panier, dans l'ordre des paniers
+        """
+        checkout_service = await self._checkout_service(carts)
+        if checkout_service is None:
+            return [self._empty_result() for _ in carts]
+        return [checkout_service.calculate_total(cart, discount) for cart in carts]
+
+    def _empty_result(self) -> dict:
+        """Retourne le résultat d'un panier vide."""
+        if self.money_rounding is not None:
+            return {key: Money.zero() for key in _RESULT_KEYS}
+        return {key: Decimal("0") for key in _RESULT_KEYS}
@@ -0,0 +1,280 @@
+"""Cache des résultats de checkout."""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from .tax_calculator import TaxCalculator
+
+_Entry = Tuple[float, dict, Tuple[str, ...], Optional[str]]
+
+
+class CheckoutCache:
+    """
+    Mémorise les résultats de checkout par empreinte de la requête.
+
+    La clé est une empreinte canonique des lignes demandées (ID de produit
+    et quantité, doublons fusionnés, triées par produit), du code de remise
+    et de la version de la table des taxes. Elle se calcule sans résoudre
+    les produits : un succès évite la construction du panier, qui coûte
+    bien plus cher que le checkout lui-même.
+
+    Les entrées sont indexées par produit et par code de remise :
+    invalidate_product et invalidate_discount suppriment exactement les
+    entrées concernées par une modification du catalogue, et une
+    modification des taux change la version de la table des taxes, donc
+    l'empreinte. Un résultat calculé pendant une invalidation n'est pas
+    mémorisé.
+
+    La mémoire est bornée par un nombre maximal d'entrées (éviction LRU) et
+    chaque entrée expire après une durée de vie (TTL). Le cache peut être
+    partagé entre threads.
+    """
+
+    def __init__(
+        self,
+        tax_calculator: TaxCalculator,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialise le cache.
+
+        Args:
+            tax_calculator: Calculateur de taxes dont la version entre dans l'empreinte
+            max_entries: Nombre maximal d'entrées conservées
+            ttl: Durée de vie d'une entrée en secondes (None : pas d'expiration)
+            clock: Horloge monotone, en secondes (injectable pour les tests)
+        """
+        if max_entries <= 0:
+            raise ValueError("La taille du cache doit être strictement positive")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("La durée de vie doit être strictement positive")
+
+        self.tax_calculator = tax_calculator
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[bytes, _Entry]" = OrderedDict()
+        self._by_product: Dict[str, Set[bytes]] = {}
+        self._by_discount: Dict[str, Set[bytes]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def fingerprint(
+        self, lines: Iterable[Tuple[Any, Any]], discount_code: Optional[str] = None
+    ) -> Optional[Tuple[bytes, Tuple[str, ...]]]:
+        """
+        Calcule l'empreinte canonique d'une requête de checkout.
+
+        Args:
+            lines: Lignes (ID de produit, quantité) telles que demandées
+            discount_code: Code de remise optionnel
+
+        Returns:
+            (empreinte, IDs des produits), ou None si des lignes sont
+            invalides : la requête ne doit alors pas passer par le cache,
+            pour que l'erreur soit levée par le calcul
+        """
+        quantities: Dict[str, int] = {}
+        for product_id, quantity in lines:
+            if (
+                not isinstance(product_id, str)
+                or not isinstance(quantity, int)
+                or isinstance(quantity, bool)
+                or quantity <= 0
+            ):
+                return None
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+
+        product_ids = tuple(sorted(quantities))
+        # Encodage JSON, sans ambiguïté : aucun ID ni code ne peut imiter un séparateur
+        canonical = json.dumps(
+            [
+                self.tax_calculator.version,
+                discount_code or None,
+                [[product_id, quantities[product_id]] for product_id in product_ids],
+            ],
+            separators=(",", ":"),
+        )
+        digest = blake2b(canonical.encode("utf-8"), digest_size=16)
+        return digest.digest(), product_ids
+
+    def get_or_compute(
+        self,
+        lines: Iterable[Tuple[Any, Any]],
+        discount_code: Optional[str],
+        compute: Callable[[], dict],
+    ) -> dict:
+        """
+        Retourne le résultat mémorisé pour cette requête, ou le calcule.
+
+        Les exceptions levées par compute sont propagées et rien n'est
+        mémorisé.
+
+        Args:
+            lines: Lignes (ID de produit, quantité) telles que demandées
+            discount_code: Code de remise optionnel
+            compute: Calcule le résultat (construction du panier et checkout)
+
+        Returns:
+            Une copie du résultat mémorisé ou nouvellement calculé
+        """
+        key = self.fingerprint(lines, discount_code)
+        if key is None:
+            return compute()
+        fingerprint, product_ids = key
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(fingerprint)
+                    self.hits += 1
+                    return dict(entry[1])
+                self._remove(fingerprint)
+                self.expirations += 1
+            self.misses += 1
+            generation = self._generation
+
+        result = compute()
+        expires_at = now + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            # Une invalidation pendant le calcul peut rendre ce résultat périmé
+            if generation == self._generation:
+                self._remove(fingerprint)
+                self._entries[fingerprint] = (expires_at, result, product_ids, discount_code)
+                for product_id in product_ids:
+                    self._by_product.setdefault(product_id, set()).add(fingerprint)
+                if discount_code:
+                    self._by_discount.setdefault(discount_code, set()).add(fingerprint)
+                while len(self._entries) > self.max_entries:
+                    self._remove(next(iter(self._entries)))
+                    self.evictions += 1
+        return dict(result)
+
+    def _remove(self, fingerprint: bytes) -> None:
+        """Supprime une entrée et ses références dans les index (verrou détenu)."""
+        entry = self._entries.pop(fingerprint, None)
+        if entry is None:
+            return
+        _, _, product_ids, discount_code = entry
+        for product_id in product_ids:
+            keys = self._by_product[product_id]
+            keys.discard(fingerprint)
+            if not keys:
+                del self._by_product[product_id]
+        if discount_code:
+            keys = self._by_discount[discount_code]
+            keys.discard(fingerprint)
+            if not keys:
+                del self._by_discount[discount_code]
+
+    def invalidate_product(self, product_id: str) -> int:
+        """
+        Supprime les entrées dont le panier contient un produit.
+
+        Args:
+            product_id: ID du produit créé, modifié ou supprimé
+
+        Returns:
+            Le nombre d'entrées supprimées
+        """
+        with self._lock:
+            self._generation += 1
+            return self._invalidate(self._by_product.get(product_id, ()))
+
+    def invalidate_products(self, product_ids: Iterable[str]) -> int:
+        """
+        Supprime les entrées dont le panier contient l'un des produits.
+
+        Équivaut à invalidate_product pour chaque produit, en une seule
+        prise du verrou (import en masse).
+
+        Args:
+            product_ids: IDs des produits créés, modifiés ou supprimés
+
+        Returns:
+            Le nombre d'entrées supprimées
+        """
+        with self._lock:
+            self._generation += 1
+            by_product = self._by_product
+            fingerprints: Set[bytes] = set()
+            for product_id in product_ids:
+                keys = by_product.get(product_id)
+                if keys:
+                    fingerprints.update(keys)
+            return self._invalidate(fingerprints)
+
+    def invalidate_discount(self, code: str) -> int:
+        """
+        Supprime les entrées calculées avec un code de remise.
+
+        Args:
+            code: Code de la remise créée, modifiée ou supprimée
+
+        Returns:
+            Le nombre d'entrées supprimées
+        """
+        with self._lock:
+            self._generation += 1
+            return self._invalidate(self._by_discount.get(code, ()))
+
+    def _invalidate(self, fingerprints: Iterable[bytes]) -> int:
+        """Supprime des entrées (verrou détenu)."""
+        fingerprints = list(fingerprints)
+        for fingerprint in fingerprints:
+            self._remove(fingerprint)
+        self.invalidations += len(fingerprints)
+        return len(fingerprints)
+
+    def purge_expired(self) -> int:
+        """
+        Supprime les entrées expirées.
+
+        Returns:
+            Le nombre d'entrées supprimées
+        """
+        now = self._clock()
+        with self._lock:
+            expired = [key for key, entry in self._entries.items() if entry[0] <= now]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self) -> None:
+        """Vide le cache (les compteurs sont conservés)."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_product.clear()
+            self._by_discount.clear()
+
+    def __len__(self) -> int:
+        """Retourne le nombre d'entrées en cache."""
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        """Retourne les compteurs du cache et son taux de succès."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
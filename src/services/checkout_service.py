@@ -1,27 +1,71 @@
 """Service de checkout."""
 
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
+from ..models import codec
 from ..models.cart import Cart
+from ..models.columnar_cart import ColumnarCart
 from ..models.discount import Discount
+from ..models.money import Money, Rounding, round_ratio
 from .tax_calculator import TaxCalculator
 
+_ZERO = Decimal("0")
+
+_RESULT_KEYS = (
+    "subtotal",
+    "discount_amount",
+    "subtotal_after_discount",
+    "tax_amount",
+    "total",
+)
+
+# Service de checkout de chaque processus du pool de calculate_total_many
+_worker_service: Optional["CheckoutService"] = None
+
+
+@dataclass
+class CheckoutState:
+    """
+    Résultat de checkout réutilisable pour une mise à jour incrémentale.
+
+    Conserve, en plus du résultat, les montants intermédiaires nécessaires
+    pour appliquer les variations du journal du panier.
+    """
+
+    cart_version: int
+    tax_version: int
+    discount: Optional[Discount]
+    subtotal: Decimal
+    discount_base: Decimal
+    tax_base: Decimal
+    result: dict
+    incremental: bool = False
+
 
 class CheckoutService:
     """Service principal pour le processus de checkout."""
 
-    def __init__(self, tax_calculator: TaxCalculator) -> None:
+    def __init__(
+        self, tax_calculator: TaxCalculator, money_rounding: Optional[Rounding] = None
+    ) -> None:
         """
         Initialise le service de checkout.
 
         Args:
             tax_calculator: Calculateur de taxes
+            money_rounding: Si fourni, calculate_total utilise le chemin Money
+                (centimes entiers) avec ce mode d'arrondi
         """
         self.tax_calculator = tax_calculator
+        self.money_rounding = money_rounding
 
     def calculate_total(
-        self, cart: Cart, discount: Optional[Discount] = None
+        self, cart: Union[Cart, ColumnarCart], discount: Optional[Discount] = None
     ) -> dict:
         """
         Calcule le total final du panier avec taxes et remises.
@@ -33,7 +77,7 @@ class CheckoutService:
         4. Calcul du total final
 
         Args:
-            cart: Le panier d'achat
+            cart: Le panier d'achat (Cart ou ColumnarCart)
             discount: Remise optionnelle à appliquer
 
         Returns:
@@ -43,7 +87,11 @@ class CheckoutService:
                 - subtotal_after_discount: Sous-total après remise
                 - tax_amount: Montant des taxes (calculées après remise)
                 - total: Total final à payer
+            Les valeurs sont des Decimal, ou des Money si money_rounding est défini.
         """
+        if self.money_rounding is not None:
+            return self.calculate_total_money(cart, discount, self.money_rounding)
+
         if cart.is_empty():
             return {
                 "subtotal": Decimal("0"),
@@ -53,90 +101,344 @@ class CheckoutService:
                 "total": Decimal("0"),
             }
 
-        # Étape 1 : Calcul du sous-total
-        subtotal = cart.subtotal
+        # Sous-total, assiette de la remise et des taxes : un seul parcours
+        subtotal, discount_base, tax_base = self._fused_totals(cart, discount)
 
-        # Étape 2 : Calcul de la remise
-        discount_amount = self._calculate_discount_amount(cart, discount, subtotal)
+        # Remise, taxes après remise et total final
+        return self._build_result(cart, discount, subtotal, discount_base, tax_base)
 
-        # Étape 3 : Sous-total après remise
-        subtotal_after_discount = subtotal - discount_amount
+    def calculate_total_many(
+        self,
+        carts: Union[Sequence[Cart], codec.Buffer],
+        discount: Optional[Discount] = None,
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Calcule le total de nombreux paniers, sur un pool de processus.
+
+        Un flux de paniers enregistrés (contenu produit par write_carts) est
+        découpé en lots d'après les seuls préfixes de longueur : chaque lot
+        est envoyé tel quel, sous sa forme binaire compacte, et chaque
+        processus décode ses propres paniers. Ce décodage, bien plus coûteux
+        que le checkout lui-même, est ainsi réparti entre les cœurs. Chaque
+        processus recrée une fois pour toutes son calculateur de taxes à
+        partir des taux.
+
+        Des paniers déjà en mémoire sont d'abord encodés avec le même codec,
+        puis répartis de la même façon : les processus reçoivent leurs octets
+        compacts plutôt que des graphes d'objets picklés. Cet encodage a un
+        coût dans le processus courant ; pour de petits lots, workers=1
+        reste le plus rapide.
+
+        Les résultats sont identiques à ceux de calculate_total.
+
+        Args:
+            carts: Le contenu d'un flux write_carts, ou des paniers en mémoire
+            discount: Remise optionnelle appliquée à chaque panier
+            workers: Nombre de processus (par défaut, le nombre de cœurs) ;
+                à 1 ou moins, le calcul est fait dans le processus courant
+            chunk_size: Nombre de paniers par lot (par défaut, environ
+                quatre lots par processus)
+
+        Returns:
+            Le résultat de calculate_total pour chaque panier, dans l'ordre des paniers
+        """
+        if chunk_size is not None and chunk_size <= 0:
+            raise ValueError("La taille des lots doit être strictement positive")
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if not isinstance(carts, (bytes, bytearray, memoryview)):
+            if workers <= 1:
+                return [self.calculate_total(cart, discount) for cart in carts]
+            stream = io.BytesIO()
+            codec.write_carts(stream, carts)
+            carts = stream.getvalue()
+        if workers <= 1:
+            return [self.calculate_total(cart, discount) for cart in codec.iter_carts(carts)]
+
+        offsets = codec.frame_offsets(carts)
+        count = len(offsets) - 1
+        if not count:
+            return []
+        size = chunk_size or -(-count // (workers * 4))
+        view = memoryview(carts)
+        payloads = [
+            bytes(view[offsets[start] : offsets[min(start + size, count)]])
+            for start in range(0, count, size)
+        ]
+        discount_payload = codec.encode_discount(discount) if discount else None
+
+        results: List[dict] = []
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(payloads)),
+            initializer=_init_worker,
+            initargs=(dict(self.tax_calculator.tax_rates), self.money_rounding),
+        ) as executor:
+            for chunk in executor.map(
+                _checkout_chunk, payloads, [discount_payload] * len(payloads)
+            ):
+                results.extend(dict(zip(_RESULT_KEYS, values)) for values in chunk)
+        return results
+
+    def _fused_totals(
+        self, cart: Union[Cart, ColumnarCart], discount: Optional[Discount]
+    ) -> Tuple[Decimal, Decimal, Decimal]:
+        """
+        Calcule en un seul parcours les montants intermédiaires du checkout.
+
+        Le panier maintient ses sous-totaux par catégorie : un seul parcours
+        de ces sous-totaux donne le sous-total, l'assiette de la remise et
+        l'assiette des taxes, sans recalculer le sous-total des articles.
+
+        Si la remise a une catégorie spécifiée, son assiette est le
+        sous-total de cette catégorie ; sinon, c'est le sous-total du panier.
+        Les catégories sont comparées par leur code entier et les taux de
+        taxe lus par index dans le tableau du calculateur. Le taux est
+        appliqué même s'il est nul, comme le faisait le calcul par article :
+        l'exposant des taxes, donc leur représentation, ne change pas.
+
+        Args:
+            cart: Le panier d'achat (Cart ou ColumnarCart)
+            discount: Remise optionnelle
+
+        Returns:
+            (sous-total, assiette de la remise, taxes avant remise)
+        """
+        discount_code = discount.category_code if discount else None
+        rate_array = self.tax_calculator.rate_array
+        rate_count = len(rate_array)
+        subtotal = discount_base = tax_base = _ZERO
+
+        for code, category_subtotal in cart.code_subtotals.items():
+            subtotal += category_subtotal
+            if code == discount_code:
+                discount_base = category_subtotal
+            tax_rate = rate_array[code] if code < rate_count else _ZERO
+            tax_base += category_subtotal * tax_rate
+
+        if discount_code is None:
+            discount_base = subtotal
+        return subtotal, discount_base, tax_base
 
-        # Étape 4 : Calcul des taxes sur le montant après remise
-        # Les taxes sont calculées proportionnellement au montant après remise
-        tax_amount = self._calculate_tax_after_discount(
-            cart, subtotal, subtotal_after_discount
+    def start_checkout(self, cart: Cart, discount: Optional[Discount] = None) -> CheckoutState:
+        """
+        Calcule un checkout complet et retourne un état réutilisable.
+
+        Args:
+            cart: Le panier d'achat
+            discount: Remise optionnelle à appliquer
+
+        Returns:
+            L'état du checkout ; le résultat est dans state.result
+        """
+        subtotal, discount_base, tax_base = self._fused_totals(cart, discount)
+        return CheckoutState(
+            cart_version=cart.version,
+            tax_version=self.tax_calculator.version,
+            discount=discount,
+            subtotal=subtotal,
+            discount_base=discount_base,
+            tax_base=tax_base,
+            result=self._build_result(cart, discount, subtotal, discount_base, tax_base),
         )
 
-        # Étape 5 : Total final
-        total = subtotal_after_discount + tax_amount
+    def update_checkout(
+        self, state: CheckoutState, cart: Cart, discount: Optional[Discount] = None
+    ) -> CheckoutState:
+        """
+        Met à jour un checkout précédent à partir du journal du panier.
+
+        Chaque mutation survenue depuis state.cart_version est appliquée en
+        temps constant. Si le journal a été tronqué, si la remise a changé ou
+        si les taux de taxe ont été modifiés, le checkout est entièrement
+        recalculé.
+
+        Args:
+            state: État retourné par start_checkout ou update_checkout pour ce panier
+            cart: Le panier d'achat, éventuellement modifié depuis
+            discount: Remise optionnelle à appliquer
+
+        Returns:
+            Le nouvel état du checkout
+        """
+        changes = cart.changes_since(state.cart_version)
+        if (
+            changes is None
+            or discount != state.discount
+            or self.tax_calculator.version != state.tax_version
+        ):
+            return self.start_checkout(cart, discount)
+
+        subtotal = state.subtotal
+        discount_base = state.discount_base
+        tax_base = state.tax_base
+        discount_code = discount.category_code if discount else None
+        rate_for_code = self.tax_calculator.rate_for_code
+        for change in changes:
+            subtotal += change.amount_delta
+            if discount_code is None or change.category_code == discount_code:
+                discount_base += change.amount_delta
+            tax_base += change.amount_delta * rate_for_code(change.category_code)
+
+        return CheckoutState(
+            cart_version=cart.version,
+            tax_version=self.tax_calculator.version,
+            discount=discount,
+            subtotal=subtotal,
+            discount_base=discount_base,
+            tax_base=tax_base,
+            result=self._build_result(cart, discount, subtotal, discount_base, tax_base),
+            incremental=True,
+        )
+
+    def _build_result(
+        self,
+        cart: Union[Cart, ColumnarCart],
+        discount: Optional[Discount],
+        subtotal: Decimal,
+        discount_base: Decimal,
+        tax_base: Decimal,
+    ) -> dict:
+        """
+        Assemble le résultat de calculate_total à partir des montants intermédiaires.
+
+        Les taxes sont calculées proportionnellement au montant après remise :
+        si une remise de 10% est appliquée, les taxes sont également réduites
+        de 10%.
+        """
+        if cart.is_empty():
+            return {key: Decimal("0") for key in _RESULT_KEYS}
+
+        # Remise (globale ou par catégorie) puis sous-total après remise
+        discount_amount = discount.calculate_discount(discount_base) if discount else Decimal("0")
+        subtotal_after_discount = subtotal - discount_amount
+
+        # Application proportionnelle de la remise aux taxes
+        tax_amount = tax_base
+        if subtotal > 0:
+            tax_ratio = subtotal_after_discount / subtotal
+            tax_amount = tax_amount * tax_ratio
 
         return {
             "subtotal": subtotal,
             "discount_amount": discount_amount,
             "subtotal_after_discount": subtotal_after_discount,
             "tax_amount": tax_amount,
-            "total": total,
+            "total": subtotal_after_discount + tax_amount,
         }
 
-    def _calculate_discount_amount(
-        self, cart: Cart, discount: Optional[Discount], subtotal: Decimal
-    ) -> Decimal:
+    def calculate_total_money(
+        self,
+        cart: Union[Cart, ColumnarCart],
+        discount: Optional[Discount] = None,
+        rounding: Rounding = Rounding.HALF_UP,
+    ) -> Dict[str, Money]:
         """
-        Calcule le montant de la remise à appliquer.
+        Calcule le total du panier en centimes entiers (type Money).
+
+        La logique est celle de calculate_total. Les sous-totaux sont lus en
+        unités mineures entières, maintenues par le panier ; les taux de taxe
+        sont des entiers mis à l'échelle (points de base) et la remise un
+        rapport d'entiers. Les calculs intermédiaires sont donc exacts, en
+        entiers seulement, et chaque montant retourné est arrondi une seule
+        fois au centime depuis sa valeur exacte. Chaque champ est égal au
+        champ Decimal correspondant arrondi avec le même mode ; en cas
+        d'égalité à un demi-centime, le total peut différer d'un centime de la
+        somme subtotal_after_discount + tax_amount.
 
-        Si la remise a une catégorie spécifiée, elle s'applique uniquement
-        aux produits de cette catégorie. Sinon, elle s'applique au total.
+        Les prix qui ne sont pas exacts au centime sont acceptés : les
+        sous-totaux sont alors exprimés dans une unité plus fine.
 
         Args:
-            cart: Le panier d'achat
-            discount: Remise optionnelle
-            subtotal: Sous-total du panier
+            cart: Le panier d'achat (Cart ou ColumnarCart)
+            discount: Remise optionnelle à appliquer
+            rounding: Mode d'arrondi au centime
 
         Returns:
-            Montant de la remise
-        """
-        if not discount:
-            return Decimal("0")
-
-        # Si la remise est spécifique à une catégorie
-        if discount.category:
-            # Calculer le sous-total uniquement pour cette catégorie
-            category_subtotal = sum(
-                item.subtotal
-                for item in cart.items
-                if item.product.category == discount.category
-            )
-            return discount.calculate_discount(category_subtotal)
+            Dictionnaire avec les mêmes clés que calculate_total
+        """
+        if cart.is_empty():
+            return {key: Money.zero() for key in _RESULT_KEYS}
+
+        code_subtotals, scale = cart.scaled_subtotals()
+        subtotal = sum(code_subtotals.values())
+
+        # Remise exacte : discount_n / discount_d unités mineures
+        discount_n, discount_d = 0, 1
+        if discount:
+            if discount.category_code is not None:
+                base = code_subtotals.get(discount.category_code, 0)
+            else:
+                base = subtotal
+            discount_n, discount_d = discount.scaled_discount(base, scale)
+        after_n = subtotal * discount_d - discount_n
+
+        # Taxes avant remise : tax_n / rate_scale unités mineures, puis
+        # réduites proportionnellement au montant après remise
+        tax_n = self.tax_calculator.scaled_tax(code_subtotals)
+        rate_scale = self.tax_calculator.rate_scale
+        if subtotal > 0:
+            tax_n *= after_n
+            tax_d = rate_scale * discount_d * subtotal
         else:
-            # Remise globale sur tout le panier
-            return discount.calculate_discount(subtotal)
+            tax_d = rate_scale
 
-    def _calculate_tax_after_discount(
-        self, cart: Cart, subtotal: Decimal, subtotal_after_discount: Decimal
-    ) -> Decimal:
-        """
-        Calcule les taxes sur le montant après remise.
+        # Conversion des unités mineures en centimes au moment de l'arrondi
+        unit = 10**scale
+        cents_d = discount_d * unit
+        return {
+            "subtotal": Money(round_ratio(subtotal * 100, unit, rounding)),
+            "discount_amount": Money(round_ratio(discount_n * 100, cents_d, rounding)),
+            "subtotal_after_discount": Money(round_ratio(after_n * 100, cents_d, rounding)),
+            "tax_amount": Money(round_ratio(tax_n * 100, tax_d * unit, rounding)),
+            "total": Money(
+                round_ratio((after_n * tax_d + tax_n * discount_d) * 100, cents_d * tax_d, rounding)
+            ),
+        }
 
-        Les taxes sont calculées proportionnellement au montant après remise.
-        Cela signifie que si une remise de 10% est appliquée, les taxes
-        sont également réduites de 10%.
+    def verify_money_path(
+        self,
+        cart: Union[Cart, ColumnarCart],
+        discount: Optional[Discount] = None,
+        rounding: Rounding = Rounding.HALF_UP,
+    ) -> Dict[str, Tuple[Decimal, Money]]:
+        """
+        Compare le chemin Decimal et le chemin Money sur un même panier.
 
         Args:
             cart: Le panier d'achat
-            subtotal: Sous-total avant remise
-            subtotal_after_discount: Sous-total après remise
+            discount: Remise optionnelle à appliquer
+            rounding: Mode d'arrondi au centime
 
         Returns:
-            Montant des taxes après remise
+            Les champs divergents (valeur Decimal, valeur Money) ; vide si les
+            deux chemins donnent les mêmes montants au centime
         """
-        # Calcul des taxes sur le montant original
-        tax_amount = self.tax_calculator.calculate_tax(cart)
+        decimal_result = CheckoutService(self.tax_calculator).calculate_total(cart, discount)
+        money_result = self.calculate_total_money(cart, discount, rounding)
+        return {
+            key: (decimal_result[key], money_result[key])
+            for key in _RESULT_KEYS
+            if Money.from_decimal(decimal_result[key], rounding) != money_result[key]
+        }
 
-        # Application proportionnelle de la remise aux taxes
-        if subtotal > 0:
-            tax_ratio = subtotal_after_discount / subtotal
-            tax_amount = tax_amount * tax_ratio
 
-        return tax_amount
+def _init_worker(tax_rates: Dict[str, Decimal], money_rounding: Optional[Rounding]) -> None:
+    """Crée le service de checkout d'un processus du pool."""
+    global _worker_service
+    _worker_service = CheckoutService(TaxCalculator(tax_rates), money_rounding=money_rounding)
+
 
+def _checkout_chunk(payload: bytes, discount_payload: Optional[bytes]) -> List[tuple]:
+    """Décode puis calcule un lot de paniers encodés (dans un processus du pool)."""
+    if _worker_service is None:
+        raise RuntimeError("Le processus n'a pas été initialisé par _init_worker")
+    discount = codec.decode_discount(discount_payload) if discount_payload else None
+    calculate_total = _worker_service.calculate_total
+    # Valeurs seules, dans l'ordre de _RESULT_KEYS : les clés sont reconstruites à la réception
+    chunk = []
+    for cart in codec.iter_carts(payload):
+        result = calculate_total(cart, discount)
+        chunk.append(tuple(result[key] for key in _RESULT_KEYS))
+    return chunk
@@ -0,0 +1,190 @@
+"""Index des remises pour la recherche de la meilleure remise."""
+
+import threading
+from bisect import bisect_right
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..models.cart import Cart
+from ..models.columnar_cart import ColumnarCart
+from ..models.discount import Discount, DiscountType
+
+_ZERO = Decimal("0")
+
+
+def _better(candidate: Discount, best: Optional[Discount]) -> bool:
+    """Compare deux remises de même type : valeur la plus forte, puis plus petit code."""
+    if best is None:
+        return True
+    if candidate.value != best.value:
+        return candidate.value > best.value
+    return candidate.code < best.code
+
+
+def _threshold(discount: Discount) -> Decimal:
+    """Retourne le montant minimum d'application d'une remise (0 s'il n'y en a pas)."""
+    return discount.min_amount if discount.min_amount is not None else _ZERO
+
+
+class _Bucket:
+    """Remises d'une même portée (une catégorie, ou tout le panier)."""
+
+    __slots__ = ("discounts", "thresholds", "best_percentage", "best_fixed", "dirty")
+
+    def __init__(self) -> None:
+        self.discounts: Dict[str, Discount] = {}
+        self.thresholds: List[Decimal] = []
+        self.best_percentage: List[Optional[Discount]] = []
+        self.best_fixed: List[Optional[Discount]] = []
+        self.dirty = False
+
+    def build(self) -> None:
+        """Trie les remises par montant minimum et calcule les maxima des préfixes."""
+        ordered = sorted(self.discounts.values(), key=_threshold)
+        self.thresholds = []
+        self.best_percentage = []
+        self.best_fixed = []
+        best_percentage: Optional[Discount] = None
+        best_fixed: Optional[Discount] = None
+        for discount in ordered:
+            if discount.discount_type == DiscountType.PERCENTAGE:
+                if _better(discount, best_percentage):
+                    best_percentage = discount
+            elif _better(discount, best_fixed):
+                best_fixed = discount
+            self.thresholds.append(_threshold(discount))
+            self.best_percentage.append(best_percentage)
+            self.best_fixed.append(best_fixed)
+        self.dirty = False
+
+    def candidates(self, base: Decimal) -> Tuple[Optional[Discount], Optional[Discount]]:
+        """Retourne les meilleures remises applicables (pourcentage, fixe) pour une assiette."""
+        if self.dirty:
+            self.build()
+        # Remises applicables : celles dont le montant minimum est atteint
+        count = bisect_right(self.thresholds, base)
+        if not count:
+            return None, None
+        return self.best_percentage[count - 1], self.best_fixed[count - 1]
+
+
+class DiscountIndex:
+    """
+    Index des remises par portée et par montant minimum.
+
+    Les remises sont regroupées par catégorie (code de catégorie), les
+    remises globales formant leur propre groupe. Dans chaque groupe, elles
+    sont triées par montant minimum, avec pour chaque préfixe la remise en
+    pourcentage la plus forte et la remise fixe la plus forte : les remises
+    applicables à une assiette sont un préfixe, trouvé par dichotomie.
+
+    Pour un panier, seuls les groupes de ses catégories et le groupe global
+    sont consultés, soit deux candidates par groupe au plus, quel que soit
+    le nombre de remises. Un groupe modifié est reconstruit à sa prochaine
+    consultation.
+    """
+
+    def __init__(self, discounts: Iterable[Discount] = ()) -> None:
+        """
+        Initialise l'index.
+
+        Args:
+            discounts: Remises initiales
+        """
+        self._buckets: Dict[Optional[int], _Bucket] = {}
+        self._scopes: Dict[str, Optional[int]] = {}
+        self._lock = threading.Lock()
+        # Curseur de refresh, protégé par son propre verrou pour ne pas
+        # bloquer les recherches pendant la lecture des nouvelles remises
+        self._cursor = 0
+        self._refresh_lock = threading.Lock()
+        for discount in discounts:
+            self.add(discount)
+
+    def __len__(self) -> int:
+        """Retourne le nombre de remises indexées."""
+        return len(self._scopes)
+
+    def add(self, discount: Discount) -> None:
+        """Ajoute une remise, ou remplace la remise de même code."""
+        with self._lock:
+            self._discard(discount.code)
+            scope = discount.category_code
+            bucket = self._buckets.get(scope)
+            if bucket is None:
+                bucket = self._buckets[scope] = _Bucket()
+            bucket.discounts[discount.code] = discount
+            bucket.dirty = True
+            self._scopes[discount.code] = scope
+
+    def refresh(self, fetch: Callable[[int], Tuple[List[Discount], int]]) -> int:
+        """
+        Ajoute les remises apparues depuis le refresh précédent.
+
+        Args:
+            fetch: Retourne les remises ajoutées après un curseur et le
+                curseur suivant (CatalogRepository.discounts_after)
+
+        Returns:
+            Le nombre de remises lues
+        """
+        with self._refresh_lock:
+            discounts, self._cursor = fetch(self._cursor)
+            for discount in discounts:
+                self.add(discount)
+        return len(discounts)
+
+    def remove(self, code: str) -> None:
+        """Retire une remise de l'index (sans effet si le code est inconnu)."""
+        with self._lock:
+            self._discard(code)
+
+    def _discard(self, code: str) -> None:
+        """Retire une remise (verrou détenu)."""
+        if code not in self._scopes:
+            return
+        bucket = self._buckets[self._scopes.pop(code)]
+        del bucket.discounts[code]
+        bucket.dirty = True
+
+    def best_discount(self, cart: Union[Cart, ColumnarCart]) -> Optional[Tuple[Discount, Decimal]]:
+        """
+        Trouve la remise qui minimise le total du panier.
+
+        Le total après remise et taxes proportionnelles vaut
+        (sous-total - remise) × (1 + taxes / sous-total) : il décroît avec
+        le montant de la remise, la meilleure remise est donc celle de plus
+        fort montant. Dans chaque groupe, la candidate d'un type est la
+        remise de plus forte valeur (puis de plus petit code) ; entre
+        candidates de même montant, le plus petit code l'emporte.
+
+        Args:
+            cart: Le panier d'achat
+
+        Returns:
+            (remise, montant de la remise), ou None si aucune remise
+            applicable ne réduit le total
+        """
+        subtotals = cart.code_subtotals
+        # Remises globales (assiette : le sous-total), puis par catégorie du panier
+        scopes: List[Tuple[Optional[int], Decimal]] = [(None, cart.subtotal)]
+        scopes.extend(subtotals.items())
+
+        best: Optional[Discount] = None
+        best_amount = _ZERO
+        with self._lock:
+            for scope, base in scopes:
+                bucket = self._buckets.get(scope)
+                if bucket is None:
+                    continue
+                for candidate in bucket.candidates(base):
+                    if candidate is None:
+                        continue
+                    amount = candidate.calculate_discount(base)
+                    if amount > best_amount or (
+                        amount == best_amount and best is not None and candidate.code < best.code
+                    ):
+                        best, best_amount = candidate, amount
+        if best is None:
+            return None
+        return best, best_amount
@@ -1,9 +1,28 @@
 """Service de calcul des taxes."""
 
 from decimal import Decimal
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Tuple, Union
 
 from ..models.cart import Cart
+from ..models.category import category_registry
+from ..models.columnar_cart import ColumnarCart
+from ..models.money import Money, Rounding
+
+_ZERO = Decimal("0")
+
+# Échelle minimale des taux entiers : les taux sont exprimés en points de base
+_MIN_RATE_SCALE = 10_000
+
+# Taux de taxe par défaut de l'application
+DEFAULT_TAX_RATES: Mapping[str, Decimal] = MappingProxyType(
+    {
+        "food": Decimal("0.10"),
+        "electronics": Decimal("0.20"),
+        "clothing": Decimal("0.15"),
+        "other": Decimal("0.18"),
+    }
+)
 
 
 class TaxCalculator:
@@ -21,25 +40,166 @@ class TaxCalculator:
         if any(rate < 0 for rate in tax_rates.values()):
             raise ValueError("Les taux de taxe ne peuvent pas être négatifs")
 
-        self.tax_rates = tax_rates
+        self._tax_rates: Dict[str, Decimal] = dict(tax_rates)
+        self.version = 0
+        self._compile()
+
+    def _compile(self) -> None:
+        """
+        Précalcule les tables de taux partagées par tous les calculs.
+
+        rate_array est indexé par code de catégorie (voir CategoryRegistry)
+        et contient tous les taux configurés, y compris nuls : un taux
+        ``Decimal("0.00")`` donne des taxes au même exposant qu'avant. Les
+        codes absents ou hors du tableau correspondent au taux
+        ``Decimal("0")``. scaled_rate_array contient les mêmes taux en
+        entiers, multipliés par rate_scale : des points de base, ou une
+        échelle plus fine si un taux a plus de quatre décimales.
+        """
+        codes = {
+            category_registry.code(category): rate for category, rate in self._tax_rates.items()
+        }
+        rates = [_ZERO] * (max(codes, default=-1) + 1)
+        for code, rate in codes.items():
+            rates[code] = rate
+        self.rate_array: Tuple[Decimal, ...] = tuple(rates)
+
+        rate_scale = _MIN_RATE_SCALE
+        for rate in rates:
+            exponent = rate.as_tuple().exponent
+            if rate and isinstance(exponent, int) and exponent < 0:
+                rate_scale = max(rate_scale, 10**-exponent)
+        self.rate_scale = rate_scale
+        self.scaled_rate_array: Tuple[int, ...] = tuple(int(rate * rate_scale) for rate in rates)
+
+    def rate_for_code(self, code: int) -> Decimal:
+        """Retourne le taux d'un code de catégorie (0 si la catégorie n'est pas taxée)."""
+        rates = self.rate_array
+        return rates[code] if code < len(rates) else _ZERO
 
-    def calculate_tax(self, cart: Cart) -> Decimal:
+    @property
+    def tax_rates(self) -> Mapping[str, Decimal]:
+        """Taux de taxe par catégorie (lecture seule, voir set_tax_rate)."""
+        return MappingProxyType(self._tax_rates)
+
+    def set_tax_rate(self, category: str, rate: Decimal) -> None:
+        """
+        Définit le taux de taxe d'une catégorie.
+
+        La table des taux est recompilée et la version incrémentée, ce qui
+        permet aux calculs mis en cache de détecter le changement.
+
+        Args:
+            category: Catégorie de produits
+            rate: Nouveau taux de taxe
+        """
+        if rate < 0:
+            raise ValueError("Les taux de taxe ne peuvent pas être négatifs")
+        self._tax_rates[category] = rate
+        self.version += 1
+        self._compile()
+
+    def calculate_tax(self, cart: Union[Cart, ColumnarCart]) -> Decimal:
         """
         Calcule le montant total des taxes pour le panier.
 
         Args:
-            cart: Le panier d'achat
+            cart: Le panier d'achat (Cart ou ColumnarCart)
 
         Returns:
             Le montant total des taxes
         """
-        total_tax = Decimal("0")
+        return self._tax_for_codes(cart.code_subtotals, self.rate_array)
 
-        for item in cart.items:
-            category = item.product.category
-            tax_rate = self.tax_rates.get(category, Decimal("0"))
-            item_tax = item.subtotal * tax_rate
-            total_tax += item_tax
+    @staticmethod
+    def _tax_for_codes(
+        code_subtotals: Mapping[int, Decimal], rate_array: Tuple[Decimal, ...]
+    ) -> Decimal:
+        """
+        Applique une fois le taux de chaque code de catégorie à son sous-total.
 
+        Le taux est appliqué même s'il est nul (Decimal("0") hors du tableau),
+        comme dans le calcul par article : l'exposant du résultat est inchangé.
+        """
+        total_tax = _ZERO
+        size = len(rate_array)
+        for code, category_subtotal in code_subtotals.items():
+            total_tax += category_subtotal * (rate_array[code] if code < size else _ZERO)
         return total_tax
 
+    def calculate_tax_for_lines(self, lines: Iterable[Tuple[str, Decimal]]) -> Decimal:
+        """
+        Calcule les taxes d'une suite de lignes (catégorie, montant).
+
+        Les montants sont d'abord regroupés par catégorie ; le taux de
+        chaque catégorie n'est appliqué qu'une fois, à la somme de ses lignes.
+
+        Args:
+            lines: Lignes (catégorie, montant de la ligne), par exemple issues
+                de l'historique des commandes
+
+        Returns:
+            Le montant total des taxes
+        """
+        category_subtotals: Dict[str, Decimal] = {}
+        for category, amount in lines:
+            category_subtotals[category] = category_subtotals.get(category, _ZERO) + amount
+
+        tax_rates = self._tax_rates
+        total_tax = _ZERO
+        for category, category_subtotal in category_subtotals.items():
+            total_tax += category_subtotal * tax_rates.get(category, _ZERO)
+        return total_tax
+
+    def calculate_tax_batch(self, carts: Iterable[Union[Cart, ColumnarCart]]) -> List[Decimal]:
+        """
+        Calcule les taxes de nombreux paniers en un seul appel.
+
+        Tous les paniers partagent le même tableau de taux précalculé, indexé
+        par code de catégorie.
+
+        Args:
+            carts: Les paniers d'achat (Cart ou ColumnarCart)
+
+        Returns:
+            Le montant des taxes de chaque panier, dans l'ordre des paniers
+        """
+        rate_array = self.rate_array
+        tax_for_codes = self._tax_for_codes
+        return [tax_for_codes(cart.code_subtotals, rate_array) for cart in carts]
+
+    def scaled_tax(self, code_subtotals: Mapping[int, int]) -> int:
+        """
+        Calcule le montant exact des taxes à partir de sous-totaux entiers.
+
+        Args:
+            code_subtotals: Sous-totaux par code de catégorie, en unités mineures
+
+        Returns:
+            Les taxes en unités mineures, multipliées par rate_scale
+        """
+        rates = self.scaled_rate_array
+        size = len(rates)
+        total_tax = 0
+        for code, minor in code_subtotals.items():
+            if code < size:
+                total_tax += minor * rates[code]
+        return total_tax
+
+    def calculate_tax_money(
+        self, cart: Union[Cart, ColumnarCart], rounding: Rounding = Rounding.HALF_UP
+    ) -> Money:
+        """
+        Calcule le montant total des taxes en centimes, arrondi une seule fois.
+
+        Args:
+            cart: Le panier d'achat (Cart ou ColumnarCart)
+            rounding: Mode d'arrondi au centime
+
+        Returns:
+            Le montant total des taxes
+        """
+        code_subtotals, scale = cart.scaled_subtotals()
+        return Money.from_ratio(
+            self.scaled_tax(code_subtotals) * 100, self.rate_scale * 10**scale, rounding
+        )
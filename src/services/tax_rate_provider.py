@@ -0,0 +1,92 @@
+"""Fournisseurs asynchrones de taux de taxe."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from decimal import Decimal
+from typing import Dict, Mapping
+
+_ZERO = Decimal("0")
+
+
+class TaxRateProvider(ABC):
+    """
+    Source des taux de taxe, interrogée catégorie par catégorie.
+
+    Une implémentation interroge par exemple un service de juridictions
+    fiscales ; AsyncCheckoutService se charge des appels concurrents, du
+    regroupement des requêtes identiques et du cache.
+    """
+
+    @abstractmethod
+    async def get_rate(self, category: str) -> Decimal:
+        """
+        Retourne le taux de taxe d'une catégorie.
+
+        Args:
+            category: Catégorie de produits
+
+        Returns:
+            Le taux de taxe (0 si la catégorie n'est pas taxée)
+        """
+
+
+class StaticTaxRateProvider(TaxRateProvider):
+    """Fournit les taux d'une table fixe, comme TaxCalculator."""
+
+    def __init__(self, tax_rates: Mapping[str, Decimal]) -> None:
+        """
+        Initialise le fournisseur.
+
+        Args:
+            tax_rates: Taux de taxe par catégorie
+        """
+        if any(rate < 0 for rate in tax_rates.values()):
+            raise ValueError("Les taux de taxe ne peuvent pas être négatifs")
+        self._tax_rates: Dict[str, Decimal] = dict(tax_rates)
+
+    async def get_rate(self, category: str) -> Decimal:
+        """Retourne le taux de la table (0 si la catégorie est absente)."""
+        return self._tax_rates.get(category, _ZERO)
+
+
+class FakeTaxRateProvider(TaxRateProvider):
+    """
+    Fournisseur en mémoire simulant un service distant, pour les tests.
+
+    Chaque appel attend la latence configurée puis retourne le taux de la
+    table. Les appels sont comptés, au total et par catégorie, et une
+    catégorie peut être configurée pour échouer.
+    """
+
+    def __init__(self, tax_rates: Mapping[str, Decimal], latency: float = 0.0) -> None:
+        """
+        Initialise le fournisseur.
+
+        Args:
+            tax_rates: Taux de taxe par catégorie
+            latency: Durée simulée de chaque appel, en secondes
+        """
+        if latency < 0:
+            raise ValueError("La latence ne peut pas être négative")
+        self.tax_rates: Dict[str, Decimal] = dict(tax_rates)
+        self.latency = latency
+        self.calls = 0
+        self.calls_by_category: Dict[str, int] = {}
+        self.failures: Dict[str, Exception] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_rate(self, category: str) -> Decimal:
+        """Retourne le taux de la table après la latence simulée."""
+        self.calls += 1
+        self.calls_by_category[category] = self.calls_by_category.get(category, 0) + 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        failure = self.failures.get(category)
+        if failure is not None:
+            raise failure
+        return self.tax_rates.get(category, _ZERO)
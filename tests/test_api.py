@@ -1,11 +1,21 @@
 """Tests de l'API REST."""
 
+import io
 import json
+import threading
 from decimal import Decimal
 
 import pytest
 
+from src.api import json_provider
 from src.api.app import create_app
+from src.api.json_cache import ProductJsonCache
+from src.api.payloads import iter_ndjson_lines
+from src.models.cart import CartItem
+from src.models.discount import Discount, DiscountType
+from src.models.money import Money, Rounding
+from src.models.product import Product
+from src.repositories import CachedRepository, SQLiteRepository
 
 
 @pytest.fixture
@@ -54,6 +64,22 @@ class TestProductEndpoints:
         )
         assert response.status_code == 400
 
+    @pytest.mark.parametrize("category", [None, 42])
+    def test_create_product_invalid_category(self, client, category):
+        """Test qu'une catégorie nulle ou non textuelle est refusée (400), sans effet."""
+        response = client.post(
+            "/products",
+            json={"id": "prod1", "name": "Laptop", "price": "10", "category": category},
+        )
+        assert response.status_code == 400
+        assert client.get("/products").get_json()["products"] == []
+
+        discount = client.post(
+            "/discounts",
+            json={"code": "SAVE10", "type": "percentage", "value": "10", "category": category},
+        )
+        assert discount.status_code == (201 if category is None else 400)
+
     def test_get_product(self, client):
         """Test la récupération d'un produit."""
         # Créer d'abord un produit
@@ -74,12 +100,390 @@ class TestProductEndpoints:
         assert data["id"] == "prod1"
         assert data["name"] == "Laptop"
 
+    def test_list_products_pages(self, client):
+        """Test le parcours complet du catalogue par pages, avec filtre de catégorie."""
+        for i in range(12):
+            client.post(
+                "/products",
+                json={
+                    "id": f"prod{i:02d}",
+                    "name": "Test",
+                    "price": "1",
+                    "category": "food" if i % 3 == 0 else "other",
+                },
+            )
+
+        def collect(**params):
+            ids, cursor, pages = [], None, 0
+            while True:
+                query = dict(params, **({"cursor": cursor} if cursor else {}))
+                data = json.loads(client.get("/products", query_string=query).data)
+                ids.extend(product["id"] for product in data["products"])
+                pages += 1
+                cursor = data["next_cursor"]
+                if cursor is None:
+                    return ids, pages
+
+        assert collect(limit=5) == ([f"prod{i:02d}" for i in range(12)], 3)
+        assert collect(limit=2, category="food") == (["prod00", "prod03", "prod06", "prod09"], 2)
+        assert collect(category="books") == ([], 1)
+
+        # Un curseur reste valable après l'ajout de produits
+        first = json.loads(client.get("/products", query_string={"limit": 4}).data)
+        client.post("/products", json={"id": "new", "name": "Test", "price": "1"})
+        second = json.loads(
+            client.get("/products", query_string={"limit": 20, "cursor": first["next_cursor"]}).data
+        )
+        assert second["products"][0]["id"] == "prod04"
+        assert second["products"][-1]["id"] == "new"
+
+    def test_list_products_invalid_parameters(self, client):
+        """Test le refus d'une taille de page ou d'un curseur invalides."""
+        client.post("/products", json={"id": "prod1", "name": "Test", "price": "1"})
+        for query in (
+            {"limit": 0},
+            {"limit": "abc"},
+            {"limit": 5000},
+            {"cursor": "not-a-cursor"},
+        ):
+            assert client.get("/products", query_string=query).status_code == 400
+
+        page = json.loads(client.get("/products", query_string={"limit": 1}).data)
+        assert page["next_cursor"] is None
+        client.post("/products", json={"id": "prod2", "name": "Test", "price": "1"})
+        page = json.loads(client.get("/products", query_string={"limit": 1}).data)
+        # Un curseur obtenu avec un filtre n'est pas valable pour un autre
+        response = client.get(
+            "/products", query_string={"cursor": page["next_cursor"], "category": "food"}
+        )
+        assert response.status_code == 400
+
     def test_get_nonexistent_product(self, client):
         """Test la récupération d'un produit inexistant."""
         response = client.get("/products/nonexistent")
         assert response.status_code == 404
 
 
+class TestConcurrentWrites:
+    """Tests de charge des créations concurrentes (serveur multithread)."""
+
+    def test_each_product_and_discount_is_created_once(self):
+        """Test que des créations concurrentes d'un même ID donnent un seul 201."""
+        app = create_app()
+        app.config["TESTING"] = True
+        statuses = {}
+        lock = threading.Lock()
+        barrier = threading.Barrier(4)
+
+        def create(worker):
+            client = app.test_client()
+            barrier.wait()
+            for i in range(40):
+                index = i if worker % 2 else 39 - i
+                product = client.post(
+                    "/products",
+                    json={"id": f"p{index}", "name": "Pen", "price": "1", "category": "other"},
+                )
+                discount = client.post(
+                    "/discounts", json={"code": f"D{index}", "type": "fixed", "value": "1"}
+                )
+                with lock:
+                    statuses.setdefault(f"p{index}", []).append(product.status_code)
+                    statuses.setdefault(f"D{index}", []).append(discount.status_code)
+
+        threads = [threading.Thread(target=create, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(statuses) == 80
+        for codes in statuses.values():
+            assert sorted(codes) == [201, 409, 409, 409]
+        repository = app.extensions["repository"]
+        assert repository.count_products() == 40
+        assert len(repository.list_discounts()) == 40
+
+
+class TestProductJsonCache:
+    """Tests pour le cache JSON des produits."""
+
+    @staticmethod
+    def _product(product_id, price="1.50"):
+        """Crée un produit de test."""
+        return Product(id=product_id, name="Thé", price=Decimal(price), category="food")
+
+    def test_fragments_are_built_at_write_time(self):
+        """Test que les lectures réutilisent le fragment sérialisé à l'écriture."""
+        cache = ProductJsonCache()
+        product = self._product("p1")
+
+        fragment = cache.put(product)
+
+        assert json.loads(fragment) == {
+            "id": "p1", "name": "Thé", "price": "1.50", "category": "food"
+        }
+        assert cache.get(product) is fragment
+        assert json.loads(cache.dumps_list([product, product])) == [json.loads(fragment)] * 2
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (3, 0, 1.0)
+        assert stats["size_bytes"] == len(fragment)
+
+    def test_replaced_product_is_never_served_stale(self):
+        """Test qu'un produit remplacé ou invalidé est resérialisé."""
+        cache = ProductJsonCache()
+        cache.put(self._product("p1"))
+        replacement = self._product("p1", "2.00")
+
+        assert json.loads(cache.get(replacement))["price"] == "2.00"
+        assert cache.stats()["misses"] == 1
+
+        cache.invalidate("p1")
+        assert (len(cache), cache.stats()["size_bytes"]) == (0, 0)
+        assert json.loads(cache.get(replacement))["price"] == "2.00"
+        assert cache.stats()["misses"] == 2
+
+    def test_least_recently_used_fragments_are_evicted(self):
+        """Test que le cache est borné et évince, avec leur produit, les fragments les moins lus."""
+        cache = ProductJsonCache(max_entries=2)
+        first, second, third = (self._product(f"p{i}") for i in range(3))
+        cache.put_many([first, second])
+
+        cache.get(first)
+        cache.put(third)
+
+        assert (len(cache), cache.stats()["max_entries"]) == (2, 2)
+        assert set(cache._sources) == {"p0", "p2"}
+        assert cache.stats()["size_bytes"] == len(cache.get(first)) + len(cache.get(third))
+        cache.get(second)
+        assert cache.stats()["misses"] == 1
+
+    def test_invalid_max_entries(self):
+        """Test qu'une taille de cache nulle est refusée."""
+        with pytest.raises(ValueError, match="taille du cache"):
+            ProductJsonCache(max_entries=0)
+
+    def test_endpoints_serve_cached_fragments(self, client):
+        """Test que les lectures de produits passent par le cache, visible dans /stats."""
+        client.post(
+            "/products", json={"id": "p1", "name": "Pen", "price": "2", "category": "other"}
+        )
+        client.post("/products/bulk", data=b'{"id": "p2", "name": "Ink", "price": "3.10"}')
+
+        product = client.get("/products/p1")
+        listing = client.get("/products", query_string={"limit": 1})
+
+        assert product.content_type == "application/json"
+        assert json.loads(product.data) == {
+            "id": "p1", "name": "Pen", "price": "2", "category": "other"
+        }
+        data = json.loads(listing.data)
+        assert [item["id"] for item in data["products"]] == ["p1"]
+        assert data["next_cursor"]
+        stats = json.loads(client.get("/stats").data)["product_json_cache"]
+        assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 2, 0)
+        assert stats["size_bytes"] > 0
+
+        # Un produit importé en masse est sérialisé à sa première lecture
+        assert json.loads(client.get("/products/p2").data)["price"] == "3.10"
+        client.get("/products/p2")
+        stats = json.loads(client.get("/stats").data)["product_json_cache"]
+        assert (stats["entries"], stats["hits"], stats["misses"]) == (2, 3, 1)
+
+
+class TestJsonProvider:
+    """Tests pour le fournisseur JSON de l'application."""
+
+    BACKENDS = [
+        "json",
+        pytest.param(
+            "orjson",
+            marks=pytest.mark.skipif(
+                json_provider.orjson is None, reason="orjson n'est pas installé"
+            ),
+        ),
+    ]
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_models_and_amounts(self, backend):
+        """Test l'encodage des montants et des modèles, sans perte de précision."""
+        app = create_app()
+        app.json.backend = backend
+        product = Product(id="p1", name="Pen", price=Decimal("2.50"), category="other")
+        discount = Discount(
+            code="FOOD", discount_type=DiscountType.FIXED, value=Decimal("5"), category="food"
+        )
+
+        data = json.loads(
+            app.json.dumps_bytes(
+                {
+                    "amount": Decimal("0.10000000000000000001"),
+                    "money": Money(1205),
+                    "product": product,
+                    "discount": discount,
+                    "item": CartItem(product, 3),
+                    "type": DiscountType.PERCENTAGE,
+                }
+            )
+        )
+
+        assert data == {
+            "amount": "0.10000000000000000001",
+            "money": "12.05",
+            "product": {"id": "p1", "name": "Pen", "price": "2.50", "category": "other"},
+            "discount": {
+                "code": "FOOD",
+                "type": "fixed",
+                "value": "5",
+                "min_amount": None,
+                "category": "food",
+            },
+            "item": {
+                "product": {"id": "p1", "name": "Pen", "price": "2.50", "category": "other"},
+                "quantity": 3,
+            },
+            "type": "percentage",
+        }
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_checkout_responses_match_across_backends(self, backend):
+        """Test que les réponses de checkout ne dépendent pas du backend."""
+        responses = {}
+        for current in ("json", backend):
+            app = create_app()
+            app.json.backend = current
+            client = app.test_client()
+            client.post(
+                "/products",
+                json={"id": "p1", "name": "Tea", "price": "3.33", "category": "food"},
+            )
+            response = client.post(
+                "/checkout", json={"items": [{"product_id": "p1", "quantity": 3}]}
+            )
+            assert response.content_type == "application/json"
+            responses[current] = json.loads(response.data)
+
+        assert responses[backend] == responses["json"]
+        assert responses["json"]["tax_amount"] == "0.9990"
+
+    def test_pretty_output_and_unknown_backend(self):
+        """Test la sortie indentée et le refus d'un backend inconnu."""
+        app = create_app()
+        app.json.compact = False
+
+        with app.app_context():
+            body = app.json.response({"b": Decimal("1"), "a": None}).get_data()
+
+        assert body.startswith(b'{\n  "a": null')
+        with pytest.raises(ValueError, match="inconnu"):
+            app.json.backend = "simplejson"
+
+
+class TestBulkImportEndpoints:
+    """Tests pour les imports en masse NDJSON."""
+
+    @staticmethod
+    def _ndjson(*records):
+        """Encode des enregistrements (dict ou ligne brute) en NDJSON."""
+        return "\n".join(
+            record if isinstance(record, str) else json.dumps(record) for record in records
+        ).encode("utf-8")
+
+    def test_bulk_products(self, client):
+        """Test l'import de produits avec erreurs par ligne."""
+        body = self._ndjson(
+            {"id": "p1", "name": "Pen", "price": "2", "category": "other"},
+            "",
+            {"id": "p2", "name": "Apple", "price": 1.5, "category": "food"},
+            {"id": "p1", "name": "Pen again", "price": "3"},
+            {"id": "p3", "price": "3"},
+            "{not json",
+            {"id": "p4", "name": "Bad", "price": "abc"},
+            {"id": "p5", "name": "Negative", "price": "-1"},
+            "[1, 2]",
+            {"id": "p6", "name": "Default category", "price": "10"},
+        )
+
+        response = client.post("/products/bulk", data=body, content_type="application/x-ndjson")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["created"] == 3
+        assert data["error_count"] == 6
+        assert [error["line"] for error in data["errors"]] == [4, 5, 6, 7, 8, 9]
+        assert data["errors"][0]["error"] == "Produit déjà existant"
+        assert data["errors"][1]["error"] == "Champ requis manquant: 'name'"
+        assert data["errors"][3]["error"] == "Valeur invalide pour price: 'abc'"
+        product = json.loads(client.get("/products/p6").data)
+        assert product == {
+            "id": "p6", "name": "Default category", "price": "10", "category": "other"
+        }
+        assert json.loads(client.get("/products/p2").data)["price"] == "1.5"
+
+    def test_bulk_products_in_several_batches(self, client):
+        """Test un import plus grand qu'un lot et le plafond des erreurs détaillées."""
+        client.application.config["BULK_IMPORT_BATCH_SIZE"] = 7
+        client.application.config["BULK_IMPORT_MAX_ERRORS"] = 5
+        records = [
+            {"id": f"p{i % 40}", "name": "Produit", "price": str(i)} for i in range(50)
+        ]
+
+        response = client.post("/products/bulk", data=self._ndjson(*records))
+
+        data = json.loads(response.data)
+        assert (data["created"], data["error_count"]) == (40, 10)
+        assert [error["line"] for error in data["errors"]] == [41, 42, 43, 44, 45]
+        assert len(json.loads(client.get("/products").data)["products"]) == 40
+
+    def test_bulk_products_invalidate_checkout_cache(self, client):
+        """Test que seuls les produits ajoutés par un import invalident le cache."""
+        client.post("/products", json={"id": "p1", "name": "Pen", "price": "2"})
+        client.post("/checkout", json={"items": [{"product_id": "p1", "quantity": 1}]})
+        cache = client.application.extensions["checkout_cache"]
+        assert len(cache) == 1
+
+        client.post("/products/bulk", data=self._ndjson({"id": "p2", "name": "A", "price": "1"}))
+        assert len(cache) == 1
+        client.post("/products/bulk", data=self._ndjson({"id": "p1", "name": "B", "price": "1"}))
+        assert cache.stats()["invalidations"] == 0
+
+    def test_bulk_discounts(self, client):
+        """Test l'import de remises, utilisables ensuite au checkout."""
+        client.post("/products", json={"id": "p1", "name": "Pen", "price": "100"})
+        body = self._ndjson(
+            {"code": "PCT10", "type": "percentage", "value": "10"},
+            {"code": "FIX5", "type": "fixed", "value": 5, "min_amount": "50"},
+            {"code": "BAD", "type": "unknown", "value": "5"},
+            {"code": "PCT10", "type": "percentage", "value": "20"},
+        )
+
+        response = client.post("/discounts/bulk", data=body)
+
+        data = json.loads(response.data)
+        assert (data["created"], data["error_count"]) == (2, 2)
+        assert data["errors"][1] == {"line": 4, "error": "Code de remise déjà existant"}
+        checkout = client.post(
+            "/checkout",
+            json={"items": [{"product_id": "p1", "quantity": 1}], "discount_code": "FIX5"},
+        )
+        assert json.loads(checkout.data)["discount_amount"] == "5"
+
+    def test_empty_body(self, client):
+        """Test le refus d'un corps sans enregistrement."""
+        assert client.post("/products/bulk", data=b"\n\n").status_code == 400
+        assert client.post("/discounts/bulk", data=b"").status_code == 400
+
+    def test_ndjson_lines_split_across_chunks(self):
+        """Test le découpage en lignes quand les lignes chevauchent les blocs lus."""
+        body = b'{"a": 1}\n\n{"b": 22}\r\n{"c": 333}'
+
+        lines = [
+            line for block in iter_ndjson_lines(io.BytesIO(body), chunk_size=4) for line in block
+        ]
+
+        assert lines == [b'{"a": 1}', b"", b'{"b": 22}\r', b'{"c": 333}']
+
+
 class TestDiscountEndpoints:
     """Tests pour les endpoints de remises."""
 
@@ -168,3 +572,319 @@ class TestCheckoutEndpoint:
         )
         assert response.status_code == 404
 
+    def test_checkout_reports_all_missing_products(self, client):
+        """Test que tous les produits inexistants sont signalés ensemble."""
+        client.post(
+            "/products",
+            json={"id": "prod1", "name": "Laptop", "price": "1000", "category": "electronics"},
+        )
+        response = client.post(
+            "/checkout",
+            json={
+                "items": [
+                    {"product_id": "ghost1", "quantity": 1},
+                    {"product_id": "prod1", "quantity": 1},
+                    {"product_id": "ghost2", "quantity": 1},
+                ]
+            },
+        )
+        assert response.status_code == 404
+        data = json.loads(response.data)
+        assert data["missing_products"] == ["ghost1", "ghost2"]
+
+    def test_checkout_invalid_quantity(self, client):
+        """Test le checkout avec une quantité invalide."""
+        client.post(
+            "/products",
+            json={"id": "prod1", "name": "Laptop", "price": "1000", "category": "electronics"},
+        )
+        response = client.post(
+            "/checkout", json={"items": [{"product_id": "prod1", "quantity": 0}]}
+        )
+        assert response.status_code == 400
+
+    def test_untaxed_category_json_unchanged(self, client):
+        """Test que la réponse d'une catégorie non taxée est identique à celle d'origine."""
+        for product in (
+            {"id": "book1", "name": "Livre", "price": "1.5", "category": "books"},
+            {"id": "food1", "name": "Pain", "price": "2.25", "category": "food"},
+        ):
+            client.post("/products", json=product)
+
+        untaxed = client.post(
+            "/checkout", json={"items": [{"product_id": "book1", "quantity": 2}]}
+        )
+        mixed = client.post(
+            "/checkout",
+            json={
+                "items": [
+                    {"product_id": "book1", "quantity": 2},
+                    {"product_id": "food1", "quantity": 1},
+                ]
+            },
+        )
+
+        # Réponses de l'implémentation d'origine (calcul des taxes article par article)
+        assert untaxed.get_json() == {
+            "discount_amount": "0",
+            "subtotal": "3.0",
+            "subtotal_after_discount": "3.0",
+            "tax_amount": "0.0",
+            "total": "3.0",
+        }
+        assert mixed.get_json() == {
+            "discount_amount": "0",
+            "subtotal": "5.25",
+            "subtotal_after_discount": "5.25",
+            "tax_amount": "0.2250",
+            "total": "5.4750",
+        }
+
+    def test_repeated_checkout_served_from_cache(self, client):
+        """Test qu'un panier identique renvoyé au checkout est servi depuis le cache."""
+        client.post(
+            "/products",
+            json={"id": "prod1", "name": "Pen", "price": "2", "category": "other"},
+        )
+        payload = {"items": [{"product_id": "prod1", "quantity": 3}]}
+
+        first = client.post("/checkout", json=payload)
+        second = client.post("/checkout", json=payload)
+
+        assert first.status_code == second.status_code == 200
+        assert json.loads(first.data) == json.loads(second.data)
+        stats = client.application.extensions["checkout_cache"].stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+class TestBatchCheckoutEndpoint:
+    """Tests pour l'endpoint de checkout par lot."""
+
+    @pytest.fixture(autouse=True)
+    def catalog(self, client):
+        """Crée deux produits et une remise."""
+        client.post(
+            "/products",
+            json={"id": "prod1", "name": "Laptop", "price": "1000", "category": "electronics"},
+        )
+        client.post(
+            "/products", json={"id": "prod2", "name": "Apple", "price": "1.5", "category": "food"}
+        )
+        client.post("/discounts", json={"code": "PCT10", "type": "percentage", "value": "10"})
+
+    def test_results_match_single_checkout(self, client):
+        """Test que chaque résultat est celui de /checkout, dans l'ordre des paniers."""
+        carts = [
+            {"id": "A", "items": [{"product_id": "prod1", "quantity": 1}]},
+            {
+                "items": [
+                    {"product_id": "prod1", "quantity": 2},
+                    {"product_id": "prod2", "quantity": 3},
+                ],
+                "discount_code": "PCT10",
+            },
+        ]
+
+        response = client.post("/checkout/batch", json={"carts": carts})
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["errors"] == 0
+        assert [result["index"] for result in data["results"]] == [0, 1]
+        assert data["results"][0]["id"] == "A"
+        for cart, result in zip(carts, data["results"]):
+            expected = json.loads(client.post("/checkout", json=cart).data)
+            assert {key: result[key] for key in expected} == expected
+
+    def test_per_cart_errors(self, client):
+        """Test qu'un panier en erreur ne fait pas échouer le reste du lot."""
+        carts = [
+            {"items": [{"product_id": "unknown", "quantity": 1}]},
+            {"items": [{"product_id": "prod1", "quantity": 1}], "discount_code": "NOPE"},
+            {"items": [{"product_id": "prod1", "quantity": 0}]},
+            {"items": []},
+            {"items": [{"quantity": 1}]},
+            "not a cart",
+            {"items": [{"product_id": "prod2", "quantity": 2}]},
+        ]
+
+        response = client.post("/checkout/batch", json={"carts": carts})
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        results = data["results"]
+        assert data["errors"] == 6
+        assert results[0]["status"] == 404
+        assert results[0]["missing_products"] == ["unknown"]
+        assert results[1] == {"index": 1, "error": "Code de remise NOPE invalide", "status": 404}
+        assert [result["status"] for result in results[2:6]] == [400, 400, 400, 400]
+        assert Decimal(results[6]["total"]) == Decimal("3.30")
+
+    def test_batch_size_limit(self, client):
+        """Test le refus d'un lot plus grand que la taille maximale configurée."""
+        client.application.config["CHECKOUT_BATCH_MAX_SIZE"] = 2
+        cart = {"items": [{"product_id": "prod1", "quantity": 1}]}
+
+        assert client.post("/checkout/batch", json={"carts": [cart] * 2}).status_code == 200
+        assert client.post("/checkout/batch", json={"carts": [cart] * 3}).status_code == 413
+
+    def test_empty_batch(self, client):
+        """Test le refus d'un lot vide ou mal formé."""
+        assert client.post("/checkout/batch", json={"carts": []}).status_code == 400
+        assert client.post("/checkout/batch", json={"carts": {}}).status_code == 400
+
+
+class TestBestDiscountEndpoint:
+    """Tests pour l'endpoint de recherche de la meilleure remise."""
+
+    def test_best_discount_breakdown(self, client):
+        """Test que la meilleure remise est retournée avec le détail du checkout."""
+        client.post(
+            "/products",
+            json={"id": "prod1", "name": "Laptop", "price": "1000", "category": "electronics"},
+        )
+        client.post("/discounts", json={"code": "FIX50", "type": "fixed", "value": "50"})
+        client.post("/discounts", json={"code": "PCT10", "type": "percentage", "value": "10"})
+        client.post(
+            "/discounts",
+            json={"code": "FOOD20", "type": "percentage", "value": "20", "category": "food"},
+        )
+
+        response = client.post(
+            "/checkout/best-discount", json={"items": [{"product_id": "prod1", "quantity": 1}]}
+        )
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["discount_code"] == "PCT10"
+        expected = client.post(
+            "/checkout",
+            json={"items": [{"product_id": "prod1", "quantity": 1}], "discount_code": "PCT10"},
+        )
+        assert {key: value for key, value in data.items() if key != "discount_code"} == (
+            json.loads(expected.data)
+        )
+
+    def test_best_discount_without_applicable_discount(self, client):
+        """Test la réponse quand aucune remise n'est applicable."""
+        client.post(
+            "/products",
+            json={"id": "prod1", "name": "Pen", "price": "2", "category": "other"},
+        )
+
+        response = client.post(
+            "/checkout/best-discount", json={"items": [{"product_id": "prod1", "quantity": 1}]}
+        )
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["discount_code"] is None
+        assert Decimal(data["discount_amount"]) == Decimal("0")
+
+    def test_best_discount_missing_product(self, client):
+        """Test l'erreur 404 pour un produit inexistant."""
+        response = client.post(
+            "/checkout/best-discount", json={"items": [{"product_id": "nope", "quantity": 1}]}
+        )
+
+        assert response.status_code == 404
+        assert json.loads(response.data)["missing_products"] == ["nope"]
+
+
+class TestMoneyCheckoutEndpoint:
+    """Tests pour le checkout en centimes entiers via l'API."""
+
+    def test_checkout_returns_cent_strings(self):
+        """Test que les montants Money sont sérialisés avec deux décimales."""
+        app = create_app(money_rounding=Rounding.HALF_UP)
+        app.config["TESTING"] = True
+        with app.test_client() as client:
+            client.post(
+                "/products",
+                json={"id": "prod1", "name": "Pen", "price": "1.99", "category": "other"},
+            )
+            response = client.post(
+                "/checkout", json={"items": [{"product_id": "prod1", "quantity": 3}]}
+            )
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["subtotal"] == "5.97"
+        assert data["tax_amount"] == "1.07"
+        assert data["total"] == "7.04"
+
+
+class TestSQLiteRepositoryApp:
+    """Tests de l'API avec un dépôt SQLite derrière un cache."""
+
+    @staticmethod
+    def _app(path):
+        app = create_app(repository=CachedRepository(SQLiteRepository(str(path))))
+        app.config["TESTING"] = True
+        return app
+
+    def test_data_survives_restart(self, tmp_path):
+        """Test que produits et remises sont servis par une nouvelle application."""
+        path = tmp_path / "checkout.db"
+        app = self._app(path)
+        with app.test_client() as client:
+            client.post(
+                "/products",
+                json={"id": "prod1", "name": "Pen", "price": "2.50", "category": "other"},
+            )
+            body = b'{"id": "prod2", "name": "Apple", "price": "1", "category": "food"}\n'
+            body += b'{"id": "prod1", "name": "Again", "price": "3"}'
+            summary = json.loads(client.post("/products/bulk", data=body).data)
+            assert summary["created"] == 1
+            assert summary["errors"] == [{"line": 2, "error": "Produit déjà existant"}]
+            client.post("/discounts", json={"code": "PROMO", "type": "fixed", "value": "1"})
+            assert client.post(
+                "/discounts", json={"code": "PROMO", "type": "fixed", "value": "2"}
+            ).status_code == 409
+        app.extensions["repository"].close()
+
+        app = self._app(path)
+        assert app.extensions["product_json_cache"].max_entries == 100_000
+        with app.test_client() as client:
+            product = json.loads(client.get("/products/prod1").data)
+            assert product == {
+                "id": "prod1", "name": "Pen", "price": "2.50", "category": "other"
+            }
+            page = json.loads(client.get("/products?limit=1").data)
+            assert [p["id"] for p in page["products"]] == ["prod1"]
+            page = json.loads(client.get(f"/products?cursor={page['next_cursor']}").data)
+            assert [p["id"] for p in page["products"]] == ["prod2"]
+            assert page["next_cursor"] is None
+
+            items = [{"product_id": "prod1", "quantity": 2}]
+            response = client.post(
+                "/checkout", json={"items": items, "discount_code": "PROMO"}
+            )
+            assert json.loads(response.data)["discount_amount"] == "1"
+            response = client.post("/checkout/best-discount", json={"items": items})
+            assert json.loads(response.data)["discount_code"] == "PROMO"
+
+            stats = json.loads(client.get("/stats").data)
+            assert stats["repository_cache"]["products"] == 2
+        app.extensions["repository"].close()
+
+    def test_best_discount_sees_discounts_of_other_workers(self, tmp_path):
+        """Test que /checkout/best-discount voit les remises créées par un autre processus."""
+        path = tmp_path / "checkout.db"
+        worker, other_worker = self._app(path), self._app(path)
+        items = [{"product_id": "prod1", "quantity": 1}]
+        client, other_client = worker.test_client(), other_worker.test_client()
+
+        client.post(
+            "/products", json={"id": "prod1", "name": "Pen", "price": "20", "category": "other"}
+        )
+        response = other_client.post("/checkout/best-discount", json={"items": items})
+        assert json.loads(response.data)["discount_code"] is None
+
+        client.post("/discounts", json={"code": "PROMO", "type": "fixed", "value": "5"})
+        client.post("/discounts/bulk", data=b'{"code": "MORE", "type": "fixed", "value": "7"}')
+
+        response = other_client.post("/checkout/best-discount", json={"items": items})
+        assert json.loads(response.data)["discount_code"] == "MORE"
+        assert len(other_worker.extensions["discount_index"]) == 2
+        worker.extensions["repository"].close()
+        other_worker.extensions["repository"].close()
@@ -0,0 +1,197 @@
+"""Tests du checkout en lot (python -m src.batch)."""
+
+import io
+import json
+from decimal import Decimal
+
+import pytest
+
+from src.batch import load_discounts, main, process_orders, read_orders
+from src.models.cart import Cart
+from src.models.discount import Discount, DiscountType
+from src.models.product import Product
+from src.services.checkout_service import CheckoutService
+from src.services.tax_calculator import DEFAULT_TAX_RATES, TaxCalculator
+
+LINES = [
+    {"order_id": "A", "product_id": "p1", "name": "Laptop", "price": "1000",
+     "category": "electronics", "quantity": 1, "discount_code": "WELCOME10"},
+    {"order_id": "A", "product_id": "p2", "name": "Pomme", "price": "1.50",
+     "category": "food", "quantity": 4},
+    {"order_id": "B", "product_id": "p3", "name": "T-shirt", "price": "20",
+     "category": "clothing", "quantity": 2},
+    {"order_id": "C", "product_id": "p1", "name": "Laptop", "price": "1000",
+     "category": "electronics", "quantity": "x"},
+    {"order_id": "D", "product_id": "p2", "name": "Pomme", "price": "1.50",
+     "category": "food", "quantity": 3, "discount_code": "UNKNOWN"},
+]
+DISCOUNTS = {
+    "WELCOME10": Discount(
+        code="WELCOME10", discount_type=DiscountType.PERCENTAGE, value=Decimal("10")
+    )
+}
+
+
+def _jsonl(lines):
+    """Encode des lignes de commande en JSONL."""
+    return "".join(json.dumps(line) + "\n" for line in lines).encode("utf-8")
+
+
+def _csv(lines):
+    """Encode des lignes de commande en CSV avec entête."""
+    header = ["order_id", "product_id", "name", "price", "category", "quantity", "discount_code"]
+    rows = [",".join(header)]
+    rows.extend(",".join(str(line.get(name, "")) for name in header) for line in lines)
+    return ("\n".join(rows) + "\n").encode("utf-8")
+
+
+def _expected_a():
+    """Calcule directement le checkout attendu pour la commande A."""
+    cart = Cart()
+    cart.add_item(Product(id="p1", name="Laptop", price=Decimal("1000"), category="electronics"))
+    cart.add_item(Product(id="p2", name="Pomme", price=Decimal("1.50"), category="food"), 4)
+    checkout_service = CheckoutService(TaxCalculator(dict(DEFAULT_TAX_RATES)))
+    return checkout_service.calculate_total(cart, DISCOUNTS["WELCOME10"])
+
+
+class TestReadOrders:
+    """Tests pour la lecture en flux des commandes."""
+
+    @pytest.mark.parametrize("fmt, encode", [("jsonl", _jsonl), ("csv", _csv)])
+    def test_groups_consecutive_lines(self, fmt, encode):
+        """Test que les lignes consécutives d'une commande forment un panier."""
+        data = encode(LINES)
+
+        orders = list(read_orders(io.BytesIO(data), fmt))
+
+        assert [order.order_id for order in orders] == ["A", "B", "C", "D"]
+        assert len(orders[0].lines) == 2
+        assert orders[0].discount_code == "WELCOME10"
+        assert orders[-1].next_offset == len(data)
+
+    @pytest.mark.parametrize("fmt, encode", [("jsonl", _jsonl), ("csv", _csv)])
+    def test_resume_from_next_offset(self, fmt, encode):
+        """Test que la reprise à un next_offset commence à la commande suivante."""
+        data = encode(LINES)
+        first = next(read_orders(io.BytesIO(data), fmt))
+
+        resumed = list(read_orders(io.BytesIO(data), fmt, first.next_offset))
+
+        assert [order.order_id for order in resumed] == ["B", "C", "D"]
+
+    def test_scattered_lines_form_separate_orders(self):
+        """Test qu'un order_id non contigu donne une seconde commande (fichier non trié)."""
+        data = _jsonl([LINES[0], LINES[2], LINES[1]])
+
+        orders = list(read_orders(io.BytesIO(data)))
+
+        assert [order.order_id for order in orders] == ["A", "B", "A"]
+
+    def test_line_without_order_id(self):
+        """Test qu'une ligne sans order_id est signalée."""
+        with pytest.raises(ValueError, match="order_id"):
+            list(read_orders(io.BytesIO(b'{"product_id": "p1"}\n')))
+
+
+class TestProcessOrders:
+    """Tests pour le calcul des commandes."""
+
+    def test_results_and_errors(self):
+        """Test les résultats calculés et les commandes en erreur."""
+        orders = read_orders(io.BytesIO(_jsonl(LINES)))
+
+        records = list(process_orders(orders, DEFAULT_TAX_RATES, DISCOUNTS))
+
+        expected = _expected_a()
+        assert {key: Decimal(records[0][key]) for key in expected} == expected
+        assert records[1]["subtotal"] == "40"
+        assert records[2]["error"] == "Quantité invalide pour le produit p1 : x"
+        assert records[3]["error"] == "Code de remise UNKNOWN invalide"
+
+    def test_invalid_price_is_reported(self):
+        """Test qu'un prix invalide est validé comme par POST /products."""
+        orders = read_orders(io.BytesIO(_jsonl([dict(LINES[1], price="abc")])))
+
+        records = list(process_orders(orders, DEFAULT_TAX_RATES, DISCOUNTS))
+
+        assert records[0]["error"] == "Valeur invalide pour price: 'abc'"
+
+    def test_parallel_matches_sequential(self):
+        """Test que le calcul par lots en parallèle donne les mêmes résultats, dans l'ordre."""
+        lines = [
+            dict(line, order_id=f"{line['order_id']}{n}") for n in range(30) for line in LINES
+        ]
+        data = _jsonl(lines)
+
+        sequential = list(
+            process_orders(read_orders(io.BytesIO(data)), DEFAULT_TAX_RATES, DISCOUNTS)
+        )
+        parallel = list(
+            process_orders(
+                read_orders(io.BytesIO(data)), DEFAULT_TAX_RATES, DISCOUNTS, workers=2, chunk_size=7
+            )
+        )
+
+        assert parallel == sequential
+        assert len(parallel) == 120
+
+
+class TestBatchCli:
+    """Tests pour la ligne de commande."""
+
+    @pytest.mark.parametrize(
+        "item, message",
+        [
+            ({"code": "X", "type": "percentage"}, "Champ requis manquant"),
+            ({"code": "X", "type": "percentage", "value": "abc"}, "Valeur invalide"),
+            ({"code": "X", "type": "percentage", "value": "10", "category": 3}, "catégorie"),
+        ],
+    )
+    def test_load_discounts_validates_like_the_api(self, tmp_path, item, message):
+        """Test que les remises du fichier sont validées comme par POST /discounts."""
+        discounts_path = tmp_path / "discounts.json"
+        discounts_path.write_text(json.dumps([item]))
+
+        with pytest.raises(ValueError, match=message):
+            load_discounts(str(discounts_path))
+
+    def test_main_writes_jsonl_and_resumes(self, tmp_path):
+        """Test l'écriture des résultats puis la reprise après la première commande."""
+        orders_path = tmp_path / "orders.csv"
+        orders_path.write_bytes(_csv(LINES[:3]))
+        discounts_path = tmp_path / "discounts.json"
+        discounts_path.write_text(
+            json.dumps([{"code": "WELCOME10", "type": "percentage", "value": "10"}])
+        )
+        output_path = tmp_path / "results.jsonl"
+
+        assert main([str(orders_path), "--output", str(output_path),
+                     "--discounts", str(discounts_path)]) == 0
+        records = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert [record["order_id"] for record in records] == ["A", "B"]
+        assert Decimal(records[0]["total"]) == _expected_a()["total"]
+
+        resumed_path = tmp_path / "resumed.jsonl"
+        assert main([str(orders_path), "--output", str(resumed_path),
+                     "--start-offset", str(records[0]["next_offset"])]) == 0
+        assert [json.loads(line)["order_id"] for line in resumed_path.read_text().splitlines()] == [
+            "B"
+        ]
+
+    def test_main_reports_errors(self, tmp_path, capsys):
+        """Test le code de sortie quand des commandes sont en erreur."""
+        orders_path = tmp_path / "orders.jsonl"
+        orders_path.write_bytes(_jsonl(LINES[3:]))
+
+        assert main([str(orders_path)]) == 1
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert all("error" in record for record in records)
+
+    def test_main_stops_on_unreadable_line(self, tmp_path):
+        """Test l'arrêt sur une ligne illisible, après les commandes précédentes."""
+        orders_path = tmp_path / "orders.jsonl"
+        orders_path.write_bytes(_jsonl(LINES[2:3]) + b"{not json\n")
+        output_path = tmp_path / "results.jsonl"
+
+        assert main([str(orders_path), "--output", str(output_path)]) == 2
+        assert output_path.read_text() == ""
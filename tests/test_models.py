@@ -1,11 +1,24 @@
 """Tests des modèles de données."""
 
+import io
+import pickle
+import sys
+import threading
+from dataclasses import FrozenInstanceError
+from fractions import Fraction
+from types import SimpleNamespace
+
 import pytest
 from decimal import Decimal
 
-from src.models.cart import Cart, CartItem
+from src.models.cart import Cart, CartItem, MissingProductsError
+from src.models.catalog import ProductCatalog
+from src.models.category import CategoryRegistry, category_registry
 from src.models.product import Product
-from src.models.discount import Discount, DiscountType
+from src.models.sharded_store import ShardedStore
+from src.models import codec
+from src.models.discount import Discount, DiscountType, calculate_discounts
+from src.models.money import Money, Rounding, round_ratio
 
 
 class TestProduct:
@@ -30,6 +43,235 @@ class TestProduct:
         with pytest.raises(ValueError, match="Le prix ne peut pas être négatif"):
             Product(id="prod1", name="Test", price=Decimal("-10"), category="other")
 
+    @pytest.mark.parametrize("category", [None, 5, ""])
+    def test_product_invalid_category_raises_error(self, category):
+        """Test qu'une catégorie absente ou qui n'est pas une chaîne est refusée."""
+        with pytest.raises(ValueError, match="catégorie du produit"):
+            Product(id="prod1", name="Test", price=Decimal("10"), category=category)
+
+    def test_product_is_slotted_and_frozen(self):
+        """Test qu'un produit n'a pas de __dict__ et ne peut pas être modifié."""
+        product = Product(id="prod1", name="Test", price=Decimal("10"), category="other")
+        assert not hasattr(product, "__dict__")
+        with pytest.raises(FrozenInstanceError):
+            product.price = Decimal("5")
+
+    def test_product_category_is_interned(self):
+        """Test que les produits d'une même catégorie partagent la même chaîne."""
+        first = Product(id="prod1", name="A", price=Decimal("1"), category="".join(["foo", "d"]))
+        second = Product(id="prod2", name="B", price=Decimal("1"), category="".join(["fo", "od"]))
+        assert first.category is second.category
+
+    def test_product_pickle_roundtrip(self):
+        """Test qu'un produit gelé reste sérialisable avec pickle."""
+        product = Product(id="prod1", name="Test", price=Decimal("10"), category="other")
+        assert pickle.loads(pickle.dumps(product)) == product
+
+    def test_product_category_code(self):
+        """Test que les produits d'une même catégorie partagent un code entier."""
+        first = Product(id="prod1", name="A", price=Decimal("1"), category="food")
+        second = Product(id="prod2", name="B", price=Decimal("1"), category="food")
+        other = Product(id="prod3", name="C", price=Decimal("1"), category="other")
+
+        assert first.category_code == second.category_code == category_registry.get("food")
+        assert first.category_code != other.category_code
+        assert category_registry.name(first.category_code) == "food"
+        assert pickle.loads(pickle.dumps(first)).category_code == first.category_code
+
+
+class TestCategoryRegistry:
+    """Tests pour le registre des catégories."""
+
+    def test_codes_are_stable_and_sequential(self):
+        """Test que les codes sont attribués dans l'ordre et ne changent plus."""
+        registry = CategoryRegistry()
+
+        assert registry.code("food") == 0
+        assert registry.code("electronics") == 1
+        assert registry.code("food") == 0
+        assert len(registry) == 2
+        assert registry.name(1) == "electronics"
+
+    def test_unknown_category(self):
+        """Test qu'une catégorie inconnue n'est pas enregistrée par get."""
+        registry = CategoryRegistry()
+
+        assert registry.get("unknown") is None
+        assert "unknown" not in registry
+        assert len(registry) == 0
+
+
+class TestProductCatalog:
+    """Tests pour le catalogue des produits."""
+
+    @staticmethod
+    def _product(product_id, category="food"):
+        """Crée un produit de test."""
+        return Product(id=product_id, name="Test", price=Decimal("1"), category=category)
+
+    def test_mapping_access(self):
+        """Test l'accès aux produits par ID."""
+        catalog = ProductCatalog([self._product("a"), self._product("b")])
+
+        assert len(catalog) == 2
+        assert "a" in catalog
+        assert catalog["b"].id == "b"
+        assert catalog.get("missing") is None
+        assert list(catalog) == ["a", "b"]
+
+    def test_duplicates_are_rejected_atomically(self):
+        """Test qu'un ajout contenant un doublon n'ajoute aucun produit."""
+        catalog = ProductCatalog([self._product("a")])
+
+        with pytest.raises(ValueError, match="déjà existant"):
+            catalog.add_many([self._product("b"), self._product("a")])
+        with pytest.raises(ValueError, match="déjà existant"):
+            catalog.add_many([self._product("c"), self._product("c")])
+        assert list(catalog) == ["a"]
+        assert catalog.page()[0] == [catalog["a"]]
+
+    def test_failed_add_leaves_no_product_behind(self):
+        """Test qu'un produit invalide dans un lot n'en laisse aucun à moitié ajouté."""
+        catalog = ProductCatalog([self._product("a")])
+        invalid = SimpleNamespace(id="x")
+
+        with pytest.raises(AttributeError):
+            catalog.add_absent([self._product("b"), invalid])
+
+        assert "b" not in catalog and "x" not in catalog
+        assert list(catalog) == ["a"]
+        assert catalog.page(0, 10, category="food")[0] == [catalog["a"]]
+
+    def test_pages_follow_insertion_order(self):
+        """Test le parcours par pages, global et par catégorie."""
+        catalog = ProductCatalog(
+            self._product(f"p{i}", "food" if i % 2 else "other") for i in range(5)
+        )
+
+        page, position = catalog.page(0, 2)
+        assert [product.id for product in page] == ["p0", "p1"]
+        page, position = catalog.page(position, 2)
+        assert [product.id for product in page] == ["p2", "p3"]
+        page, position = catalog.page(position, 2)
+        assert ([product.id for product in page], position) == (["p4"], None)
+
+        page, position = catalog.page(0, 2, category="food")
+        assert ([product.id for product in page], position) == (["p1", "p3"], None)
+        assert catalog.page(0, 2, category="unknown-category") == ([], None)
+
+    def test_add_absent(self):
+        """Test l'ajout des seuls produits absents."""
+        catalog = ProductCatalog([self._product("a")])
+
+        assert catalog.add_absent([self._product("b"), self._product("a")]) == [1]
+        assert list(catalog) == ["a", "b"]
+
+    def test_concurrent_adds_keep_every_product_once(self):
+        """Test de charge : index, ordre et catégories contiennent chaque produit une fois."""
+        catalog = ProductCatalog(shard_count=4)
+        products = [self._product(f"p{i}", "food" if i % 2 else "other") for i in range(1000)]
+
+        def add(start):
+            for offset in range(start, len(products), 10):
+                catalog.add_absent(products[offset:offset + 40])
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=add, args=(start,)) for start in (0, 0, 5, 10)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert len(catalog) == len(products)
+        assert sorted(catalog) == sorted(product.id for product in products)
+        page, _ = catalog.page(0, 2000, category="food")
+        assert len(page) == len({product.id for product in page}) == 500
+
+    def test_invalid_page_arguments(self):
+        """Test le refus d'une position ou d'une taille de page invalides."""
+        catalog = ProductCatalog()
+
+        with pytest.raises(ValueError):
+            catalog.page(-1)
+        with pytest.raises(ValueError):
+            catalog.page(0, 0)
+
+
+class TestShardedStore:
+    """Tests pour le dictionnaire partitionné."""
+
+    def test_insert_and_read(self):
+        """Test l'ajout si absent et la lecture."""
+        store = ShardedStore(4)
+
+        assert store.insert_if_absent("a", 1) is True
+        assert store.insert_if_absent("a", 2) is False
+        assert store["a"] == 1
+        assert store.get("b") is None
+        assert "a" in store and "b" not in store
+        assert len(store) == 1
+        with pytest.raises(KeyError):
+            store["b"]
+
+    def test_insert_many(self):
+        """Test les refus d'un lot (existants ou répétés) et le mode tout ou rien."""
+        store = ShardedStore(4)
+        store.insert_if_absent("a", 0)
+
+        assert store.insert_many([("b", 1), ("a", 2), ("c", 3), ("b", 4)]) == [1, 3]
+        assert store.snapshot() == {"a": 0, "b": 1, "c": 3}
+        assert store.insert_many([("d", 5), ("a", 6)], all_or_nothing=True) == [1]
+        assert "d" not in store
+
+    def test_invalid_shard_count(self):
+        """Test le refus d'un nombre de partitions qui n'est pas une puissance de 2."""
+        with pytest.raises(ValueError):
+            ShardedStore(3)
+        with pytest.raises(ValueError):
+            ShardedStore(0)
+
+    @pytest.mark.parametrize("round_number", range(10))
+    def test_concurrent_inserts_are_not_lost_or_duplicated(self, round_number):
+        """Test de charge : chaque clé est ajoutée exactement une fois."""
+        store = ShardedStore(8)
+        keys = [f"k{i}" for i in range(2000)]
+        winners = []
+        barrier = threading.Barrier(8)
+
+        def insert(worker):
+            # Une moitié des threads parcourt les clés à rebours : plus de collisions
+            ordered = keys if worker % 2 else keys[::-1]
+            barrier.wait()
+            for offset in range(0, len(ordered), 20):
+                batch = [(key, worker) for key in ordered[offset:offset + 20]]
+                rejected = set(store.insert_many(batch))
+                winners.extend(key for index, (key, _) in enumerate(batch) if index not in rejected)
+            singles = keys[::7]
+            for key in singles if worker % 2 else singles[::-1]:
+                if store.insert_if_absent(key + "-single", worker):
+                    winners.append(key + "-single")
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=insert, args=(worker,)) for worker in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        expected = len(keys) + len(keys[::7])
+        assert len(winners) == len(set(winners)) == expected
+        snapshot = store.snapshot()
+        assert len(snapshot) == len(store) == expected
+        assert set(snapshot) == set(winners)
+
 
 class TestCart:
     """Tests pour le modèle Cart."""
@@ -50,6 +292,16 @@ class TestCart:
         assert cart.items[0].quantity == 2
         assert cart.subtotal == Decimal("20")
 
+    def test_items_is_read_only(self):
+        """Test que la liste des articles ne peut pas être modifiée en silence."""
+        cart = Cart()
+        product = Product(id="prod1", name="Test", price=Decimal("10"), category="other")
+        cart.add_item(product)
+        with pytest.raises(AttributeError):
+            cart.items.append(cart.items[0])
+        assert isinstance(cart.items, tuple)
+        assert len(cart) == 1
+
     def test_add_same_product_twice(self):
         """Test l'ajout du même produit deux fois."""
         cart = Cart()
@@ -83,10 +335,212 @@ class TestCart:
         cart.update_quantity("prod1", 0)
         assert cart.is_empty()
 
+    def test_items_keep_insertion_order(self):
+        """Test que les articles restent dans l'ordre d'ajout."""
+        cart = Cart()
+        products = [
+            Product(id=f"prod{i}", name="Test", price=Decimal("1"), category="other")
+            for i in range(5)
+        ]
+        for product in products:
+            cart.add_item(product)
+        cart.add_item(products[0], quantity=2)
+        cart.remove_item("prod2")
+        assert [item.product.id for item in cart.items] == ["prod0", "prod1", "prod3", "prod4"]
+        assert cart.items[0].quantity == 3
+
+    def test_get_item(self):
+        """Test la recherche d'un article par ID de produit."""
+        cart = Cart()
+        product = Product(id="prod1", name="Test", price=Decimal("10"), category="other")
+        cart.add_item(product, quantity=2)
+        assert cart.get_item("prod1").quantity == 2
+        assert cart.get_item("unknown") is None
+
+    def test_update_quantity_unknown_product_raises_error(self):
+        """Test que la mise à jour d'un produit absent lève une erreur."""
+        cart = Cart()
+        with pytest.raises(ValueError, match="non trouvé dans le panier"):
+            cart.update_quantity("unknown", 1)
+
+    def test_create_cart_with_items_merges_duplicates(self):
+        """Test que les articles initiaux du même produit sont fusionnés."""
+        product = Product(id="prod1", name="Test", price=Decimal("10"), category="other")
+        cart = Cart(items=[CartItem(product, 1), CartItem(product, 2)])
+        assert len(cart) == 1
+        assert cart.items[0].quantity == 3
+
+    def test_cart_item_is_frozen(self):
+        """Test qu'un article lu ne peut pas désynchroniser les sous-totaux du panier."""
+        cart = Cart()
+        product = Product(id="prod1", name="Test", price=Decimal("10"), category="other")
+        cart.add_item(product, quantity=1)
+        item = cart.items[0]
+        with pytest.raises(FrozenInstanceError):
+            item.quantity = 10
+
+        cart.add_item(product, quantity=2)
+        cart.update_quantity("prod1", 4)
+        assert (item.quantity, cart.items[0].quantity) == (1, 4)
+        assert cart.subtotal == sum(line.subtotal for line in cart.items) == Decimal("40")
+
+    def test_subtotals_follow_mutations(self):
+        """Test que les sous-totaux maintenus suivent chaque mutation."""
+        cart = Cart()
+        laptop = Product(id="prod1", name="Laptop", price=Decimal("1000"), category="electronics")
+        apple = Product(id="prod2", name="Apple", price=Decimal("0.50"), category="food")
+        cart.add_item(laptop, quantity=1)
+        cart.add_item(apple, quantity=4)
+        cart.add_item(apple, quantity=2)
+        assert cart.subtotal == Decimal("1003")
+        assert cart.category_subtotal("food") == Decimal("3")
+
+        cart.update_quantity("prod1", 2)
+        assert cart.subtotal == Decimal("2003")
+        assert dict(cart.category_subtotals) == {
+            "electronics": Decimal("2000"),
+            "food": Decimal("3"),
+        }
+
+        cart.remove_item("prod2")
+        assert cart.subtotal == Decimal("2000")
+        assert "food" not in cart.category_subtotals
+        assert cart.category_subtotal("food") == Decimal("0")
+
+    def test_subtotals_match_recomputed_values(self):
+        """Test que les sous-totaux maintenus égalent un recalcul complet."""
+        cart = Cart()
+        products = [
+            Product(
+                id=f"prod{i}",
+                name="Test",
+                price=Decimal(f"{i}.{i:02d}"),
+                category=("food", "other", "clothing")[i % 3],
+            )
+            for i in range(30)
+        ]
+        for i, product in enumerate(products):
+            cart.add_item(product, quantity=i % 4 + 1)
+        for product in products[::3]:
+            cart.update_quantity(product.id, 7)
+        for product in products[::5]:
+            cart.remove_item(product.id)
+
+        assert cart.subtotal == sum(item.subtotal for item in cart.items)
+        for category, category_subtotal in cart.category_subtotals.items():
+            assert category_subtotal == sum(
+                item.subtotal for item in cart.items if item.product.category == category
+            )
+
+
+class TestCartJournal:
+    """Tests pour la version et le journal du panier."""
+
+    def test_version_and_changes(self):
+        """Test que chaque mutation incrémente la version et est journalisée."""
+        cart = Cart()
+        product = Product(id="prod1", name="Test", price=Decimal("2.50"), category="food")
+        cart.add_item(product, 2)
+        cart.update_quantity("prod1", 5)
+        cart.remove_item("prod1")
+        assert cart.version == 3
+        changes = cart.changes_since(1)
+        assert [(c.version, c.quantity_delta, c.amount_delta) for c in changes] == [
+            (2, 3, Decimal("7.50")),
+            (3, -5, Decimal("-12.50")),
+        ]
+        assert cart.changes_since(3) == []
+
+    def test_truncated_journal(self):
+        """Test qu'un journal tronqué impose un recalcul complet."""
+        cart = Cart(journal_size=2)
+        product = Product(id="prod1", name="Test", price=Decimal("1"), category="food")
+        for _ in range(4):
+            cart.add_item(product)
+        assert cart.changes_since(1) is None
+        assert len(cart.changes_since(2)) == 2
+        assert cart.changes_since(10) is None
+
+
+class TestCartBulk:
+    """Tests pour la construction en masse du panier."""
+
+    @staticmethod
+    def _catalog():
+        """Crée un petit catalogue indexé par ID."""
+        return {
+            f"prod{i}": Product(
+                id=f"prod{i}", name="Test", price=Decimal(i + 1), category=("food", "other")[i % 2]
+            )
+            for i in range(4)
+        }
+
+    def test_from_lines_merges_duplicates(self):
+        """Test que les lignes du même produit sont fusionnées, ordre conservé."""
+        cart = Cart.from_lines(
+            [("prod2", 1), ("prod0", 2), ("prod2", 3)], self._catalog()
+        )
+        assert [(item.product.id, item.quantity) for item in cart.items] == [
+            ("prod2", 4),
+            ("prod0", 2),
+        ]
+        assert cart.subtotal == Decimal("14")
+        assert cart.category_subtotal("food") == Decimal("14")
+
+    def test_from_lines_reports_all_missing_products(self):
+        """Test que tous les produits absents sont signalés ensemble."""
+        with pytest.raises(MissingProductsError) as excinfo:
+            Cart.from_lines(
+                [("x", 1), ("prod1", 1), ("y", 1), ("x", 2)], self._catalog()
+            )
+        assert excinfo.value.product_ids == ["x", "y"]
+
+    def test_add_items_validates_all_quantities(self):
+        """Test que les quantités invalides sont signalées ensemble, sans effet."""
+        catalog = self._catalog()
+        cart = Cart()
+        cart.add_item(catalog["prod0"], 1)
+        with pytest.raises(ValueError, match="prod1, prod3"):
+            cart.add_items(
+                [(catalog["prod1"], 0), (catalog["prod2"], 1), (catalog["prod3"], "2")]
+            )
+        assert len(cart) == 1
+        assert cart.subtotal == Decimal("1")
+
+    def test_add_items_merges_with_existing_items(self):
+        """Test l'ajout en masse sur un panier déjà rempli."""
+        catalog = self._catalog()
+        cart = Cart()
+        cart.add_item(catalog["prod0"], 1)
+        cart.add_items([(catalog["prod0"], 2), (catalog["prod1"], 1)])
+        assert cart.get_item("prod0").quantity == 3
+        assert cart.subtotal == Decimal("5")
+
 
 class TestDiscount:
     """Tests pour le modèle Discount."""
 
+    def test_discount_non_string_category_raises_error(self):
+        """Test qu'une catégorie de remise qui n'est pas une chaîne est refusée."""
+        with pytest.raises(ValueError, match="catégorie de la remise"):
+            Discount(
+                code="SAVE10",
+                discount_type=DiscountType.PERCENTAGE,
+                value=Decimal("10"),
+                category=5,
+            )
+
+    def test_empty_category_means_whole_cart(self):
+        """Test qu'une catégorie vide est normalisée en remise sur tout le panier."""
+        discount = Discount(
+            code="SAVE10", discount_type=DiscountType.PERCENTAGE, value=Decimal("10"), category=""
+        )
+        assert discount.category is None
+        assert discount.category_code is None
+        assert discount == Discount(
+            code="SAVE10", discount_type=DiscountType.PERCENTAGE, value=Decimal("10")
+        )
+
     def test_create_percentage_discount(self):
         """Test la création d'une remise en pourcentage."""
         discount = Discount(
@@ -121,3 +575,220 @@ class TestDiscount:
                 value=Decimal("150"),
             )
 
+    def test_discount_is_slotted_and_frozen(self):
+        """Test qu'une remise n'a pas de __dict__ et ne peut pas être modifiée."""
+        discount = Discount(
+            code="SAVE10", discount_type=DiscountType.PERCENTAGE, value=Decimal("10")
+        )
+        assert not hasattr(discount, "__dict__")
+        assert discount.min_amount is None
+        with pytest.raises(FrozenInstanceError):
+            discount.value = Decimal("20")
+        assert pickle.loads(pickle.dumps(discount)) == discount
+
+    def test_batch_matches_scalar(self):
+        """Test que les calculs en lot sont identiques au calcul unitaire."""
+        discounts = [
+            Discount(code="P10", discount_type=DiscountType.PERCENTAGE, value=Decimal("10")),
+            Discount(
+                code="P12",
+                discount_type=DiscountType.PERCENTAGE,
+                value=Decimal("12.5"),
+                min_amount=Decimal("50"),
+            ),
+            Discount(code="F5", discount_type=DiscountType.FIXED, value=Decimal("5")),
+            Discount(
+                code="F20",
+                discount_type=DiscountType.FIXED,
+                value=Decimal("20"),
+                min_amount=Decimal("100"),
+            ),
+        ]
+        amounts = [Decimal("0"), Decimal("3.99"), Decimal("50"), Decimal("99.99"), Decimal("250")]
+        for discount in discounts:
+            assert discount.calculate_discounts(amounts) == [
+                discount.calculate_discount(amount) for amount in amounts
+            ]
+        for amount in amounts:
+            assert calculate_discounts(discounts, amount) == [
+                discount.calculate_discount(amount) for discount in discounts
+            ]
+        assert calculate_discounts(discounts, Decimal("80")) == [
+            Decimal("8"),
+            Decimal("10"),
+            Decimal("5"),
+            Decimal("0"),
+        ]
+
+    def test_evaluator_survives_pickle(self):
+        """Test que l'évaluateur compilé est reconstruit après pickle."""
+        discount = Discount(
+            code="SAVE10",
+            discount_type=DiscountType.PERCENTAGE,
+            value=Decimal("10"),
+            min_amount=Decimal("20"),
+        )
+        restored = pickle.loads(pickle.dumps(discount))
+        assert restored.calculate_discount(Decimal("100")) == Decimal("10")
+        assert restored.calculate_discount(Decimal("10")) == Decimal("0")
+
+
+class TestMoney:
+    """Tests pour le type Money."""
+
+    @pytest.mark.parametrize("rounding", list(Rounding))
+    def test_round_ratio_matches_decimal(self, rounding):
+        """Test que l'arrondi entier suit les sémantiques du module decimal."""
+        for numerator in range(-25, 26):
+            for denominator in (1, 2, 4, 10):
+                expected = (Decimal(numerator) / Decimal(denominator)).quantize(
+                    Decimal("1"), rounding=rounding.value
+                )
+                assert round_ratio(numerator, denominator, rounding) == int(expected)
+
+    def test_from_decimal_exact(self):
+        """Test la conversion exacte d'un Decimal en centimes."""
+        assert Money.from_decimal(Decimal("12.34")).minor == 1234
+        with pytest.raises(ValueError, match="n'est pas exprimable en centimes"):
+            Money.from_decimal(Decimal("0.005"))
+        assert Money.from_decimal(Decimal("0.005"), Rounding.HALF_UP).minor == 1
+        assert Money.from_decimal(Decimal("0.005"), Rounding.HALF_EVEN).minor == 0
+
+    def test_arithmetic_and_str(self):
+        """Test l'arithmétique exacte et le formatage."""
+        price = Money.from_decimal(Decimal("19.99"))
+        assert str(price * 3) == "59.97"
+        assert str(price - Money(2000)) == "-0.01"
+        assert Money(5) < price
+        assert price.multiply(Decimal("0.055")) == Money(110)
+        assert price.to_decimal() == Decimal("19.99")
+
+    def test_money_rejects_non_integer(self):
+        """Test qu'un montant non entier est refusé."""
+        with pytest.raises(ValueError, match="nombre entier de centimes"):
+            Money(Decimal("1.5"))
+
+    def test_cart_subtotal_money(self):
+        """Test le sous-total d'un panier en centimes."""
+        cart = Cart()
+        cart.add_item(
+            Product(id="prod1", name="Test", price=Decimal("9.99"), category="food"), 3
+        )
+        assert cart.subtotal_money == Money(2997)
+        assert cart.category_subtotal_money("food") == Money(2997)
+        assert cart.items[0].subtotal_money == Money(2997)
+
+    def test_discount_money(self):
+        """Test le calcul d'une remise en centimes."""
+        discount = Discount(
+            code="SAVE15", discount_type=DiscountType.PERCENTAGE, value=Decimal("15")
+        )
+        assert discount.calculate_discount_money(Money(3333)) == Money(500)
+        assert discount.calculate_discount_money(Money(3333), Rounding.DOWN) == Money(499)
+
+    def test_scaled_discount(self):
+        """Test la remise exacte en unités mineures (rapport d'entiers)."""
+        fixed = Discount(
+            code="F5",
+            discount_type=DiscountType.FIXED,
+            value=Decimal("5.005"),
+            min_amount=Decimal("10"),
+        )
+        assert Fraction(*fixed.scaled_discount(2000)) == Fraction("500.5")
+        assert fixed.scaled_discount(999) == (0, 1)
+        assert Fraction(*fixed.scaled_discount(10_000, scale=3)) == 5005
+        assert Fraction(*fixed.scaled_discount(1000)) == Fraction("500.5")
+        assert fixed.calculate_discount_money(Money(1000), Rounding.HALF_EVEN) == Money(500)
+
+
+class TestCodec:
+    """Tests pour la sérialisation binaire."""
+
+    @staticmethod
+    def _cart():
+        """Crée un panier de test."""
+        cart = Cart()
+        cart.add_item(
+            Product(id="prod1", name="Ordinateur", price=Decimal("999.99"), category="electronics"),
+            2,
+        )
+        cart.add_item(Product(id="prod2", name="Pâtes", price=Decimal("1.5"), category="food"), 3)
+        return cart
+
+    def test_product_roundtrip(self):
+        """Test l'aller-retour d'un produit."""
+        product = Product(id="p€", name="Crème brûlée", price=Decimal("4.90"), category="food")
+        decoded = codec.decode_product(codec.encode_product(product))
+        assert decoded == product
+        assert str(decoded.price) == "4.90"
+
+    @pytest.mark.parametrize(
+        "discount",
+        [
+            Discount(code="SAVE10", discount_type=DiscountType.PERCENTAGE, value=Decimal("10")),
+            Discount(
+                code="FOOD5",
+                discount_type=DiscountType.FIXED,
+                value=Decimal("5.00"),
+                min_amount=Decimal("20"),
+                category="food",
+            ),
+        ],
+    )
+    def test_discount_roundtrip(self, discount):
+        """Test l'aller-retour d'une remise."""
+        assert codec.decode_discount(codec.encode_discount(discount)) == discount
+
+    def test_cart_roundtrip_from_memoryview(self):
+        """Test l'aller-retour d'un panier décodé depuis un memoryview."""
+        cart = self._cart()
+        decoded = codec.decode_cart(memoryview(codec.encode_cart(cart)))
+        assert decoded == cart
+        assert decoded.subtotal == cart.subtotal
+        item = cart.items[0]
+        assert codec.decode_cart_item(codec.encode_cart_item(item)) == item
+
+    def test_stream_many_carts(self):
+        """Test l'écriture et la relecture en flux de plusieurs paniers."""
+        carts = [self._cart(), Cart(), self._cart()]
+        stream = io.BytesIO()
+        assert codec.write_carts(stream, carts) == 3
+        assert list(codec.iter_carts(stream.getvalue())) == carts
+        stream.seek(0)
+        assert list(codec.read_carts(stream)) == carts
+
+    def test_invalid_data_raises_error(self):
+        """Test que des données invalides ou tronquées lèvent une erreur."""
+        data = codec.encode_cart(self._cart())
+        with pytest.raises(ValueError, match="tronquées"):
+            codec.decode_cart(data[:-3])
+        with pytest.raises(ValueError, match="Format binaire invalide"):
+            codec.decode_cart(b"XX" + data[2:])
+        with pytest.raises(ValueError, match="Version"):
+            codec.decode_cart(data[:2] + bytes([99]) + data[3:])
+        with pytest.raises(ValueError, match="Type d'objet inattendu"):
+            codec.decode_product(data)
+
+    def test_duplicate_product_in_payload_raises_error(self):
+        """Test qu'un panier encodé avec un produit en double est refusé."""
+        product = Product(id="prod1", name="Test", price=Decimal("1"), category="food")
+        single = codec.encode_cart(Cart(items=[CartItem(product, 1)]))
+        body = single[8:]  # entête (4 octets) puis nombre d'articles (4 octets)
+        data = single[:4] + (2).to_bytes(4, "little") + body + body
+        with pytest.raises(ValueError, match="présent deux fois"):
+            codec.decode_cart(data)
+
+    def test_frame_offsets(self):
+        """Test que les positions des paniers d'un flux sont lues sans décodage."""
+        stream = io.BytesIO()
+        carts = [Cart(), self._cart(), self._cart()]
+        codec.write_carts(stream, carts)
+        data = stream.getvalue()
+
+        offsets = codec.frame_offsets(data)
+
+        assert offsets[0] == 0 and offsets[-1] == len(data)
+        assert len(offsets) == len(carts) + 1
+        assert list(codec.iter_carts(data[offsets[1] : offsets[3]])) == carts[1:]
+        with pytest.raises(ValueError, match="tronquées"):
+            codec.frame_offsets(data[:-1])
@@ -0,0 +1,307 @@
+"""Tests des dépôts de produits et de remises."""
+
+import sqlite3
+import threading
+from decimal import Decimal
+
+import pytest
+
+from src.models.discount import Discount, DiscountType
+from src.models.product import Product
+from src.repositories import (
+    CachedRepository,
+    DuplicateError,
+    InMemoryRepository,
+    SQLiteRepository,
+)
+
+
+def _product(index: int, category: str = "food") -> Product:
+    return Product(
+        id=f"prod{index}", name=f"Produit {index}", price=Decimal("9.99"), category=category
+    )
+
+
+def _is_open(connection: sqlite3.Connection) -> bool:
+    try:
+        connection.execute("SELECT 1")
+    except sqlite3.ProgrammingError:
+        return False
+    return True
+
+
+@pytest.fixture(params=["memory", "sqlite", "cached"])
+def repository(request, tmp_path):
+    """Dépôt vide de chaque implémentation."""
+    if request.param == "memory":
+        repo = InMemoryRepository()
+    elif request.param == "sqlite":
+        repo = SQLiteRepository(str(tmp_path / "catalog.db"))
+    else:
+        repo = CachedRepository(SQLiteRepository(str(tmp_path / "catalog.db")))
+    yield repo
+    repo.close()
+
+
+class TestRepository:
+    """Tests communs à toutes les implémentations."""
+
+    def test_add_and_get_product(self, repository):
+        """Test qu'un produit ajouté est relu à l'identique."""
+        product = Product(id="p1", name="Pain", price=Decimal("1.234567"), category="food")
+        repository.add_product(product)
+
+        assert repository.get_product("p1") == product
+        assert repository.get_product("absent") is None
+        assert repository.count_products() == 1
+
+    def test_add_product_duplicate(self, repository):
+        """Test qu'un ID existant lève DuplicateError."""
+        repository.add_product(_product(1))
+
+        with pytest.raises(DuplicateError) as excinfo:
+            repository.add_product(_product(1))
+        assert excinfo.value.keys == ["prod1"]
+
+    def test_add_products_returns_rejected_positions(self, repository):
+        """Test que les doublons (existants ou du lot) sont signalés par position."""
+        repository.add_product(_product(1))
+
+        rejected = repository.add_products([_product(0), _product(1), _product(2), _product(0)])
+
+        assert rejected == [1, 3]
+        assert repository.count_products() == 3
+
+    def test_get_products(self, repository):
+        """Test la lecture groupée, doublons et absents ignorés."""
+        repository.add_products([_product(i) for i in range(5)])
+
+        found = repository.get_products(["prod3", "absent", "prod1", "prod3"])
+
+        assert set(found) == {"prod1", "prod3"}
+        assert found["prod3"] == _product(3)
+        assert repository.get_products([]) == {}
+
+    def test_page_products(self, repository):
+        """Test le parcours complet par pages, dans l'ordre d'ajout."""
+        products = [_product(i, "food" if i % 2 else "clothing") for i in range(7)]
+        repository.add_products(products)
+
+        seen = []
+        cursor = 0
+        while True:
+            page, cursor = repository.page_products(cursor, 3)
+            seen.extend(page)
+            if cursor is None:
+                break
+        assert seen == products
+
+        food, next_cursor = repository.page_products(0, 10, "food")
+        assert food == [product for product in products if product.category == "food"]
+        assert next_cursor is None
+        assert repository.page_products(0, 10, "inconnue") == ([], None)
+
+    def test_page_products_invalid(self, repository):
+        """Test qu'une taille de page nulle est refusée."""
+        with pytest.raises(ValueError):
+            repository.page_products(0, 0)
+
+    def test_discounts(self, repository):
+        """Test l'ajout, la lecture et la liste des remises."""
+        first = Discount(code="PROMO10", discount_type=DiscountType.PERCENTAGE, value=Decimal("10"))
+        second = Discount(
+            code="FIXE5",
+            discount_type=DiscountType.FIXED,
+            value=Decimal("5"),
+            min_amount=Decimal("50.00"),
+            category="food",
+        )
+        repository.add_discount(first)
+        assert repository.add_discounts([second, first]) == [1]
+
+        assert repository.get_discount("FIXE5") == second
+        assert repository.get_discount("ABSENT") is None
+        assert repository.list_discounts() == [first, second]
+        with pytest.raises(DuplicateError):
+            repository.add_discount(first)
+
+    def test_discounts_after(self, repository):
+        """Test la lecture des seules remises ajoutées après un curseur."""
+        first, second, third = (
+            Discount(code=f"PROMO{i}", discount_type=DiscountType.FIXED, value=Decimal(i))
+            for i in range(1, 4)
+        )
+        repository.add_discount(first)
+
+        discounts, cursor = repository.discounts_after()
+        assert discounts == [first]
+        assert repository.discounts_after(cursor) == ([], cursor)
+
+        repository.add_discounts([second, third])
+        discounts, next_cursor = repository.discounts_after(cursor)
+        assert discounts == [second, third]
+        assert repository.discounts_after(next_cursor) == ([], next_cursor)
+
+    def test_concurrent_adds(self, repository):
+        """Test que des ajouts concurrents du même produit n'en créent qu'un."""
+        rejected = []
+
+        def add(offset):
+            rejected.extend(repository.add_products([_product(i) for i in range(offset, 50)]))
+
+        threads = [threading.Thread(target=add, args=(offset,)) for offset in range(0, 40, 10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert repository.count_products() == 50
+        assert len(rejected) == 50 + 40 + 30 + 20 - 50
+
+
+class TestSQLiteRepository:
+    """Tests propres au dépôt SQLite."""
+
+    def test_data_persists_after_reopen(self, tmp_path):
+        """Test que produits et remises sont relus après réouverture."""
+        path = str(tmp_path / "catalog.db")
+        repository = SQLiteRepository(path)
+        repository.add_products([_product(1), _product(2)])
+        repository.add_discount(
+            Discount(code="PROMO", discount_type=DiscountType.FIXED, value=Decimal("3"))
+        )
+        repository.close()
+
+        reopened = SQLiteRepository(path)
+        assert reopened.count_products() == 2
+        assert reopened.get_product("prod2") == _product(2)
+        assert [discount.code for discount in reopened.list_discounts()] == ["PROMO"]
+        reopened.close()
+
+    def test_wal_mode_and_pooled_connections(self, tmp_path):
+        """Test le mode WAL et la réutilisation des connexions du pool."""
+        repository = SQLiteRepository(str(tmp_path / "catalog.db"))
+        with repository._connection() as connection:
+            assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        with repository._connection() as again:
+            assert again is connection
+
+        connections = []
+
+        def borrow():
+            with repository._connection() as borrowed:
+                connections.append(borrowed)
+
+        thread = threading.Thread(target=borrow)
+        thread.start()
+        thread.join()
+        assert connections == [connection]
+        repository.close()
+
+    def test_short_lived_threads_do_not_leak_connections(self, tmp_path):
+        """Test qu'un thread par requête n'accumule pas de connexions ouvertes."""
+        repository = SQLiteRepository(str(tmp_path / "catalog.db"), pool_size=4)
+        repository.add_product(_product(1))
+        opened = []
+        original_open = repository._open
+
+        def counting_open():
+            connection = original_open()
+            opened.append(connection)
+            return connection
+
+        repository._open = counting_open
+        barrier = threading.Barrier(8)
+        served = []
+
+        def request():
+            barrier.wait()
+            served.append(repository.get_product("prod1"))
+
+        for _ in range(25):
+            threads = [threading.Thread(target=request) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert served == [_product(1)] * 200
+        assert len(repository._idle) <= 4
+        # Les connexions ouvertes au-delà du pool ont toutes été refermées
+        assert len([connection for connection in opened if _is_open(connection)]) <= 4
+        assert len(opened) < 200
+        repository.close()
+
+    def test_pool_size_must_be_positive(self, tmp_path):
+        """Test le refus d'un pool vide."""
+        with pytest.raises(ValueError):
+            SQLiteRepository(str(tmp_path / "catalog.db"), pool_size=0)
+
+    def test_failed_batch_is_rolled_back(self, tmp_path):
+        """Test qu'un lot en erreur n'ajoute aucun produit."""
+        repository = SQLiteRepository(str(tmp_path / "catalog.db"))
+        invalid = Product(id="p2", name="X", price=Decimal("1"), category="food")
+        object.__setattr__(invalid, "name", None)
+
+        with pytest.raises(Exception):
+            repository.add_products([_product(1), invalid])
+        assert repository.count_products() == 0
+        repository.add_product(_product(1))
+        assert repository.count_products() == 1
+        repository.close()
+
+
+class TestCachedRepository:
+    """Tests du cache en lecture."""
+
+    def test_reads_are_served_from_cache(self, tmp_path):
+        """Test qu'une lecture répétée n'interroge plus le dépôt sous-jacent."""
+        backend = SQLiteRepository(str(tmp_path / "catalog.db"))
+        backend.add_products([_product(1), _product(2)])
+        repository = CachedRepository(backend)
+
+        first = repository.get_products(["prod1", "prod2"])
+        second = repository.get_products(["prod1", "prod2"])
+
+        assert first["prod1"] is second["prod1"]
+        assert repository.get_product("prod1") is first["prod1"]
+        stats = repository.stats()
+        assert stats["misses"] == 2
+        assert stats["hits"] == 3
+        repository.close()
+
+    def test_page_reuses_cached_instances(self):
+        """Test qu'une page retourne les instances déjà en cache."""
+        backend = InMemoryRepository()
+        repository = CachedRepository(backend)
+        product = _product(1)
+        repository.add_product(product)
+
+        page, _ = repository.page_products(0, 10)
+
+        assert page[0] is product
+
+    def test_misses_are_not_cached(self):
+        """Test qu'un produit ajouté directement au dépôt est trouvé ensuite."""
+        backend = InMemoryRepository()
+        repository = CachedRepository(backend)
+        assert repository.get_product("prod1") is None
+
+        backend.add_product(_product(1))
+
+        assert repository.get_product("prod1") == _product(1)
+
+    def test_eviction(self):
+        """Test l'éviction des produits les moins récemment lus."""
+        repository = CachedRepository(InMemoryRepository(), max_entries=2)
+        repository.add_products([_product(1), _product(2)])
+        repository.get_product("prod1")
+        repository.add_product(_product(3))
+
+        assert repository.stats()["products"] == 2
+        assert set(repository._products) == {"prod1", "prod3"}
+
+    def test_invalid_size(self):
+        """Test qu'une taille de cache nulle est refusée."""
+        with pytest.raises(ValueError):
+            CachedRepository(InMemoryRepository(), max_entries=0)
@@ -0,0 +1,163 @@
+"""Tests du serveur prefork."""
+
+import itertools
+import json
+import os
+import signal
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+
+import pytest
+from flask import jsonify
+
+from src.api.app import create_app
+from src.server import PREFORK_SUPPORTED, PreforkServer
+
+pytestmark = pytest.mark.skipif(not PREFORK_SUPPORTED, reason="os.fork requis")
+
+
+def _app_factory():
+    """Fabrique d'applications numérotées par génération (appelée dans le maître)."""
+    generations = []
+
+    def factory():
+        generations.append(None)
+        generation = len(generations)
+        app = create_app()
+
+        @app.route("/worker")
+        def worker():
+            return jsonify({"pid": os.getpid(), "generation": generation})
+
+        @app.route("/slow")
+        def slow():
+            time.sleep(0.5)
+            return jsonify({"pid": os.getpid()})
+
+        return app
+
+    return factory
+
+
+def _get(url, timeout=5.0):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return response.status, json.loads(response.read())
+
+
+@contextmanager
+def _serve(**options):
+    """Lance un serveur prefork dans un processus fils ; retourne (pid du maître, URL)."""
+    server = PreforkServer(
+        _app_factory(), host="127.0.0.1", port=0, graceful_timeout=2.0, **options
+    )
+    host, port = server.address
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            server.serve_forever()
+        except BaseException:
+            code = 1
+        finally:
+            os._exit(code)
+    server.bind().close()
+    url = f"http://{host}:{port}"
+    try:
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                _get(url + "/health", timeout=1.0)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+        yield pid, url
+    finally:
+        try:
+            os.kill(pid, signal.SIGTERM)
+            os.waitpid(pid, 0)
+        except (ProcessLookupError, ChildProcessError):
+            pass  # maître déjà arrêté et récupéré par le test
+
+
+def _wait_for(predicate, timeout=10.0):
+    """Attend qu'une condition soit vraie."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "délai dépassé"
+        time.sleep(0.05)
+
+
+class TestPreforkServer:
+    """Tests du serveur prefork (processus réels)."""
+
+    def test_workers_serve_the_preloaded_app(self):
+        """Test que les requêtes sont servies par des workers, et non par le maître."""
+        with _serve(workers=2) as (master, url):
+            pids = {_get(url + "/worker")[1]["pid"] for _ in range(10)}
+            status, product = _get(url + "/products?limit=1")
+
+        assert status == 200
+        assert product == {"products": [], "next_cursor": None}
+        assert master not in pids and os.getpid() not in pids
+        assert 1 <= len(pids) <= 2
+
+    def test_max_requests_recycles_worker(self):
+        """Test qu'un worker est remplacé après max_requests requêtes."""
+        with _serve(workers=1, max_requests=3) as (_, url):
+            pids = [_get(url + "/worker")[1]["pid"] for _ in range(8)]
+
+        # Requêtes consécutives d'un même worker (/health a pu compter pour le premier)
+        runs = [len(list(group)) for _, group in itertools.groupby(pids)]
+        assert max(runs) <= 3
+        assert len(runs) >= 3
+        assert len(set(pids)) == len(runs)
+
+    def test_sighup_reloads_app_and_replaces_workers(self):
+        """Test que SIGHUP reconstruit l'application et remplace les workers."""
+        with _serve(workers=2) as (master, url):
+            before = _get(url + "/worker")[1]
+            assert before["generation"] == 1
+
+            os.kill(master, signal.SIGHUP)
+            _wait_for(lambda: _get(url + "/worker")[1]["generation"] == 2)
+            # Les anciens workers s'arrêtent : seule la nouvelle génération répond
+            time.sleep(0.5)
+            after = [_get(url + "/worker")[1] for _ in range(10)]
+
+        assert all(worker["generation"] == 2 for worker in after)
+        assert before["pid"] not in {worker["pid"] for worker in after}
+
+    def test_sigterm_lets_requests_finish(self):
+        """Test qu'un arrêt gracieux laisse se terminer la requête en cours."""
+        results = []
+        with _serve(workers=1) as (master, url):
+            thread = threading.Thread(target=lambda: results.append(_get(url + "/slow")))
+            thread.start()
+            time.sleep(0.2)
+            os.kill(master, signal.SIGTERM)
+            thread.join()
+            _, status = os.waitpid(master, 0)
+
+        assert results and results[0][0] == 200
+        assert os.waitstatus_to_exitcode(status) == 0
+
+    def test_invalid_settings(self):
+        """Test le refus de paramètres invalides."""
+        with pytest.raises(ValueError):
+            PreforkServer(create_app, workers=0)
+        with pytest.raises(ValueError):
+            PreforkServer(create_app, timeout=0)
+        with pytest.raises(ValueError):
+            PreforkServer(create_app, max_requests=-1)
+
+    def test_main_rejects_invalid_settings(self):
+        """Test que la ligne de commande refuse un nombre de workers invalide."""
+        from src.main import main
+
+        with pytest.raises(SystemExit) as excinfo:
+            main(["--workers", "0"])
+        assert excinfo.value.code == 2
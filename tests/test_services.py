@@ -1,14 +1,24 @@
 """Tests des services métier."""
 
+import asyncio
+import io
 from decimal import Decimal
 
 import pytest
 
-from src.models.cart import Cart
+from src.models import codec
+from src.models.cart import Cart, MissingProductsError
+from src.models.columnar_cart import ColumnarCart
 from src.models.discount import Discount, DiscountType
+from src.models.money import Money, Rounding
 from src.models.product import Product
+from src.repositories import InMemoryRepository
+from src.services.async_checkout_service import AsyncCheckoutService
+from src.services.checkout_cache import CheckoutCache
 from src.services.checkout_service import CheckoutService
+from src.services.discount_index import DiscountIndex
 from src.services.tax_calculator import TaxCalculator
+from src.services.tax_rate_provider import FakeTaxRateProvider, StaticTaxRateProvider
 
 
 class TestTaxCalculator:
@@ -62,6 +72,99 @@ class TestTaxCalculator:
         tax = calculator.calculate_tax(cart)
         assert tax == Decimal("0")
 
+    def test_calculate_tax_for_lines_groups_by_category(self):
+        """Test que les lignes sont regroupées par catégorie avant la taxe."""
+        calculator = TaxCalculator(
+            {"electronics": Decimal("0.20"), "food": Decimal("0.10")}
+        )
+        lines = [
+            ("electronics", Decimal("1000")),
+            ("food", Decimal("2.50")),
+            ("unknown", Decimal("40")),
+            ("food", Decimal("7.50")),
+        ]
+
+        assert calculator.calculate_tax_for_lines(lines) == Decimal("201")
+        assert calculator.calculate_tax_for_lines([]) == Decimal("0")
+
+    def test_untaxed_category_keeps_baseline_exponent(self):
+        """Test que les taxes d'une catégorie non taxée gardent l'exposant du calcul par article."""
+        calculator = TaxCalculator({"food": Decimal("0.10"), "books": Decimal("0.00")})
+        cart = Cart()
+        cart.add_item(Product(id="p1", name="Livre", price=Decimal("1.5"), category="books"), 2)
+        cart.add_item(Product(id="p2", name="Vis", price=Decimal("0.25"), category="other"), 4)
+        # Calcul d'origine : somme des sous-totaux des articles multipliés par leur taux
+        expected = sum(
+            (
+                item.subtotal * calculator.tax_rates.get(item.product.category, Decimal("0"))
+                for item in cart
+            ),
+            Decimal("0"),
+        )
+
+        assert str(calculator.calculate_tax(cart)) == str(expected) == "0.000"
+        assert str(calculator.calculate_tax_batch([cart])[0]) == "0.000"
+        lines = [("books", Decimal("3.0")), ("other", Decimal("1.00"))]
+        assert str(calculator.calculate_tax_for_lines(lines)) == "0.000"
+
+    def test_calculate_tax_batch(self):
+        """Test que le calcul par lot donne les taxes de chaque panier."""
+        calculator = TaxCalculator(
+            {"electronics": Decimal("0.20"), "food": Decimal("0.10")}
+        )
+        laptop = Product(id="p1", name="Laptop", price=Decimal("1000"), category="electronics")
+        apple = Product(id="p2", name="Apple", price=Decimal("2"), category="food")
+        carts = [
+            Cart.from_lines([("p1", 1), ("p2", 5)], {"p1": laptop, "p2": apple}),
+            Cart(),
+            ColumnarCart.from_cart(Cart.from_lines([("p2", 3)], {"p2": apple})),
+        ]
+
+        taxes = calculator.calculate_tax_batch(carts)
+
+        assert taxes == [Decimal("201"), Decimal("0"), Decimal("0.6")]
+        assert taxes == [calculator.calculate_tax(cart) for cart in carts]
+
+    def test_set_tax_rate_bumps_version(self):
+        """Test que la modification d'un taux incrémente la version."""
+        tax_rates = {"electronics": Decimal("0.20")}
+        calculator = TaxCalculator(tax_rates)
+        cart = Cart()
+        cart.add_item(Product(id="p1", name="Apple", price=Decimal("10"), category="food"))
+
+        assert calculator.calculate_tax(cart) == Decimal("0")
+        calculator.set_tax_rate("food", Decimal("0.10"))
+
+        assert calculator.version == 1
+        assert calculator.calculate_tax(cart) == Decimal("1")
+        assert calculator.tax_rates["food"] == Decimal("0.10")
+        assert "food" not in tax_rates
+        with pytest.raises(ValueError):
+            calculator.set_tax_rate("food", Decimal("-0.1"))
+
+    def test_rate_array_indexed_by_category_code(self):
+        """Test que les taux sont indexés par code et nuls hors du tableau."""
+        calculator = TaxCalculator({"electronics": Decimal("0.20"), "food": Decimal("0")})
+        electronics = Product(id="p1", name="Laptop", price=Decimal("10"), category="electronics")
+        late = Product(id="p2", name="New", price=Decimal("10"), category="registered-later")
+
+        assert calculator.rate_for_code(electronics.category_code) == Decimal("0.20")
+        assert calculator.rate_for_code(late.category_code) == Decimal("0")
+        assert late.category_code >= len(calculator.rate_array)
+
+    def test_scaled_rates(self):
+        """Test que les taux entiers sont en points de base, ou plus fins si nécessaire."""
+        calculator = TaxCalculator({"electronics": Decimal("0.20"), "food": Decimal("0.055")})
+        electronics = Product(id="p1", name="Laptop", price=Decimal("10"), category="electronics")
+
+        assert calculator.rate_scale == 10_000
+        assert calculator.scaled_rate_array[electronics.category_code] == 2_000
+        assert calculator.scaled_tax({electronics.category_code: 1_000}) == 2_000_000
+
+        calculator.set_tax_rate("other", Decimal("0.12345"))
+        assert calculator.rate_scale == 100_000
+        assert calculator.scaled_rate_array[electronics.category_code] == 20_000
+
 
 class TestCheckoutService:
     """Tests pour le service de checkout."""
@@ -85,6 +188,19 @@ class TestCheckoutService:
         assert result["tax_amount"] == Decimal("200")
         assert result["total"] == Decimal("1200")
 
+    def test_zero_rate_keeps_tax_exponent(self):
+        """Test qu'un taux nul donne des taxes au même exposant que le calcul d'origine."""
+        checkout_service = CheckoutService(TaxCalculator({"books": Decimal("0.00")}))
+        cart = Cart()
+        cart.add_item(Product(id="prod1", name="Livre", price=Decimal("1.5"), category="books"), 2)
+        cart.add_item(Product(id="prod2", name="Vis", price=Decimal("0.25"), category="other"), 4)
+
+        result = checkout_service.calculate_total(cart)
+
+        # 3.0 × 0.00 + 1.00 × 0 (catégorie absente des taux)
+        assert str(result["tax_amount"]) == "0.000"
+        assert str(result["total"]) == "4.000"
+
     def test_calculate_total_with_percentage_discount(self):
         """Test le calcul du total avec remise en pourcentage."""
         tax_rates = {"electronics": Decimal("0.20")}
@@ -214,3 +330,841 @@ class TestCheckoutService:
         assert result["subtotal"] == Decimal("80")
         assert result["subtotal_after_discount"] == Decimal("80")
 
+
+class TestColumnarCart:
+    """Tests pour le panier colonnaire."""
+
+    @staticmethod
+    def _build_cart() -> Cart:
+        """Crée un panier multi-catégories avec des prix au centime."""
+        cart = Cart()
+        categories = ["food", "electronics", "clothing", "other", "unknown"]
+        for i in range(50):
+            product = Product(
+                id=f"prod{i}",
+                name=f"Produit {i}",
+                price=Decimal(i * 137 % 10000) / 100,
+                category=categories[i % len(categories)],
+            )
+            cart.add_item(product, quantity=i % 7 + 1)
+        return cart
+
+    def test_subtotals_match_cart(self):
+        """Test que les sous-totaux colonnaires égalent ceux du Cart."""
+        cart = self._build_cart()
+        columnar = ColumnarCart.from_cart(cart)
+        assert len(columnar) == len(cart)
+        assert columnar.subtotal == cart.subtotal
+        assert dict(columnar.category_subtotals) == dict(cart.category_subtotals)
+        assert columnar.category_subtotal("absent") == Decimal("0")
+
+    @pytest.mark.parametrize(
+        "discount",
+        [
+            None,
+            Discount(code="P15", discount_type=DiscountType.PERCENTAGE, value=Decimal("15")),
+            Discount(code="F30", discount_type=DiscountType.FIXED, value=Decimal("30")),
+            Discount(
+                code="FOOD7",
+                discount_type=DiscountType.PERCENTAGE,
+                value=Decimal("7"),
+                category="food",
+            ),
+        ],
+    )
+    def test_checkout_matches_cart(self, discount):
+        """Test que le checkout d'un ColumnarCart égale celui du Cart."""
+        tax_calculator = TaxCalculator(
+            {"food": Decimal("0.055"), "electronics": Decimal("0.20"), "other": Decimal("0.18")}
+        )
+        checkout_service = CheckoutService(tax_calculator)
+        cart = self._build_cart()
+
+        expected = checkout_service.calculate_total(cart, discount)
+        result = checkout_service.calculate_total(ColumnarCart.from_cart(cart), discount)
+
+        assert result == expected
+
+    def test_empty_columnar_cart(self):
+        """Test le checkout d'un panier colonnaire vide."""
+        checkout_service = CheckoutService(TaxCalculator({"food": Decimal("0.10")}))
+        result = checkout_service.calculate_total(ColumnarCart())
+        assert result["total"] == Decimal("0")
+
+    def test_sub_cent_price_raises_error(self):
+        """Test qu'un prix non exprimable en centimes est refusé."""
+        columnar = ColumnarCart()
+        product = Product(id="prod1", name="Test", price=Decimal("0.005"), category="other")
+        with pytest.raises(ValueError, match="n'est pas exprimable"):
+            columnar.add_line(product, 1)
+
+    def test_totals_do_not_overflow(self):
+        """Test que les totaux au-delà de 64 bits restent exacts."""
+        columnar = ColumnarCart()
+        product = Product(id="prod1", name="Test", price=Decimal("90000000000"), category="food")
+        columnar.add_line(product, 2**40)
+        assert columnar.subtotal_minor == 9 * 10**12 * 2**40
+        assert dict(columnar.code_subtotals_minor()) == {
+            product.category_code: 9 * 10**12 * 2**40
+        }
+
+        huge = Product(id="prod2", name="Test", price=Decimal(2**63), category="food")
+        with pytest.raises(OverflowError):
+            columnar.add_line(huge, 1)
+
+    @pytest.mark.parametrize("quantity,error", [(2**63, OverflowError), (1.5, TypeError)])
+    def test_rejected_quantity_leaves_columns_aligned(self, quantity, error):
+        """Test qu'une quantité refusée n'ajoute rien à aucune colonne."""
+        columnar = ColumnarCart()
+        first = Product(id="prod1", name="Test", price=Decimal("5.00"), category="food")
+        second = Product(id="prod2", name="Test", price=Decimal("2.00"), category="food")
+        with pytest.raises(error):
+            columnar.add_line(first, quantity)
+        columnar.add_line(second, 1)
+        assert len(columnar) == 1
+        assert columnar.subtotal == Decimal("2.00")
+        assert dict(columnar.code_subtotals) == {second.category_code: Decimal("2.00")}
+
+
+class TestMoneyCheckout:
+    """Tests pour le chemin de checkout en centimes entiers."""
+
+    TAX_RATES = {
+        "food": Decimal("0.055"),
+        "electronics": Decimal("0.20"),
+        "clothing": Decimal("0.15"),
+    }
+
+    def test_money_path_result(self):
+        """Test le checkout en Money sur un cas simple."""
+        checkout_service = CheckoutService(
+            TaxCalculator(self.TAX_RATES), money_rounding=Rounding.HALF_UP
+        )
+        cart = Cart()
+        cart.add_item(
+            Product(id="prod1", name="Laptop", price=Decimal("1000"), category="electronics"), 1
+        )
+        discount = Discount(
+            code="SAVE10", discount_type=DiscountType.PERCENTAGE, value=Decimal("10")
+        )
+
+        result = checkout_service.calculate_total(cart, discount)
+
+        assert result == {
+            "subtotal": Money(100000),
+            "discount_amount": Money(10000),
+            "subtotal_after_discount": Money(90000),
+            "tax_amount": Money(18000),
+            "total": Money(108000),
+        }
+
+    @pytest.mark.parametrize("rounding", [Rounding.HALF_UP, Rounding.HALF_EVEN, Rounding.DOWN])
+    def test_money_path_matches_decimal_path(self, rounding):
+        """Test que les chemins Money et Decimal donnent les mêmes montants."""
+        checkout_service = CheckoutService(TaxCalculator(self.TAX_RATES))
+        categories = list(self.TAX_RATES) + ["other"]
+        discounts = [
+            None,
+            Discount(code="P7", discount_type=DiscountType.PERCENTAGE, value=Decimal("7.5")),
+            Discount(code="F3", discount_type=DiscountType.FIXED, value=Decimal("3.33")),
+            Discount(
+                code="C12",
+                discount_type=DiscountType.PERCENTAGE,
+                value=Decimal("12"),
+                category="food",
+                min_amount=Decimal("20"),
+            ),
+            Discount(code="E2", discount_type=DiscountType.FIXED, value=Decimal("2"), category=""),
+        ]
+        for seed in range(20):
+            cart = Cart()
+            for i in range(seed + 1):
+                product = Product(
+                    id=f"prod{i}",
+                    name="Test",
+                    price=Decimal((seed * 7919 + i * 104729) % 10000) / 100,
+                    category=categories[(seed + i) % len(categories)],
+                )
+                cart.add_item(product, quantity=(seed + i) % 3 + 1)
+            for discount in discounts:
+                assert checkout_service.verify_money_path(cart, discount, rounding) == {}
+
+    @pytest.mark.parametrize("rounding", list(Rounding))
+    def test_money_path_accepts_sub_cent_prices(self, rounding):
+        """Test que le chemin Money accepte, comme le chemin Decimal, les prix sous le centime."""
+        checkout_service = CheckoutService(
+            TaxCalculator({**self.TAX_RATES, "other": Decimal("0.12345")})
+        )
+        cart = Cart()
+        cart.add_item(Product(id="p1", name="Vis", price=Decimal("0.005"), category="food"), 3)
+        cart.add_item(Product(id="p2", name="Câble", price=Decimal("1.999"), category="other"))
+        cart.add_item(Product(id="p3", name="Pull", price=Decimal("20"), category="clothing"))
+        discounts = [
+            None,
+            Discount(code="P7", discount_type=DiscountType.PERCENTAGE, value=Decimal("7.5")),
+            Discount(code="F1", discount_type=DiscountType.FIXED, value=Decimal("1.0005")),
+        ]
+
+        for discount in discounts:
+            assert checkout_service.verify_money_path(cart, discount, rounding) == {}
+        result = checkout_service.calculate_total_money(cart, rounding=rounding)
+        assert result["subtotal"] == Money.from_decimal(Decimal("22.014"), rounding)
+
+        # Sans les prix sous le centime, le panier revient aux centimes maintenus
+        cart.remove_item("p1")
+        cart.remove_item("p2")
+        assert cart.scaled_subtotals() == ({cart.get_item("p3").product.category_code: 2000}, 2)
+
+
+class TestIncrementalCheckout:
+    """Tests pour la mise à jour incrémentale du checkout."""
+
+    TAX_RATES = {"food": Decimal("0.055"), "electronics": Decimal("0.20")}
+
+    @pytest.mark.parametrize(
+        "discount",
+        [
+            None,
+            Discount(code="P10", discount_type=DiscountType.PERCENTAGE, value=Decimal("10")),
+            Discount(
+                code="FOOD5",
+                discount_type=DiscountType.FIXED,
+                value=Decimal("5"),
+                category="food",
+            ),
+        ],
+    )
+    def test_incremental_matches_full_recalculation(self, discount):
+        """Test que la mise à jour incrémentale égale un recalcul complet."""
+        checkout_service = CheckoutService(TaxCalculator(self.TAX_RATES))
+        products = [
+            Product(
+                id=f"prod{i}",
+                name="Test",
+                price=Decimal(i * 311 % 5000) / 100,
+                category=("food", "electronics", "other")[i % 3],
+            )
+            for i in range(12)
+        ]
+        cart = Cart()
+        state = checkout_service.start_checkout(cart, discount)
+        for step in range(40):
+            product = products[step * 7 % len(products)]
+            if step % 5 == 4:
+                cart.remove_item(product.id)
+            elif step % 3 == 2 and cart.get_item(product.id):
+                cart.update_quantity(product.id, step % 4)
+            else:
+                cart.add_item(product, step % 3 + 1)
+            state = checkout_service.update_checkout(state, cart, discount)
+            assert state.incremental
+            assert state.result == checkout_service.calculate_total(cart, discount)
+
+    def test_truncated_journal_falls_back_to_full_recalculation(self):
+        """Test le recalcul complet quand le journal a été tronqué."""
+        checkout_service = CheckoutService(TaxCalculator(self.TAX_RATES))
+        cart = Cart(journal_size=1)
+        state = checkout_service.start_checkout(cart)
+        for i in range(3):
+            cart.add_item(
+                Product(id=f"prod{i}", name="Test", price=Decimal("10"), category="food")
+            )
+        state = checkout_service.update_checkout(state, cart)
+        assert not state.incremental
+        assert state.result == checkout_service.calculate_total(cart)
+
+    def test_tax_rate_change_falls_back_to_full_recalculation(self):
+        """Test le recalcul complet quand un taux de taxe a changé."""
+        tax_calculator = TaxCalculator(self.TAX_RATES)
+        checkout_service = CheckoutService(tax_calculator)
+        cart = Cart()
+        cart.add_item(Product(id="prod1", name="Test", price=Decimal("10"), category="other"))
+        state = checkout_service.start_checkout(cart)
+
+        tax_calculator.set_tax_rate("other", Decimal("0.18"))
+        state = checkout_service.update_checkout(state, cart)
+
+        assert not state.incremental
+        assert state.result["tax_amount"] == Decimal("1.80")
+
+
+class TestParallelCheckout:
+    """Tests pour le checkout parallèle d'un lot de paniers."""
+
+    TAX_RATES = {"food": Decimal("0.055"), "electronics": Decimal("0.20")}
+
+    @staticmethod
+    def _carts(count):
+        """Construit des paniers variés, dont un panier vide."""
+        catalog = {
+            f"prod{i}": Product(
+                id=f"prod{i}",
+                name=f"Produit {i}",
+                price=Decimal(i * 389 % 10_000) / 100,
+                category=("food", "electronics", "other")[i % 3],
+            )
+            for i in range(20)
+        }
+        carts = [Cart()]
+        for n in range(1, count):
+            carts.append(
+                Cart.from_lines([(f"prod{(n + i) % 20}", i + 1) for i in range(n % 6 + 1)], catalog)
+            )
+        return carts
+
+    @staticmethod
+    def _encode(carts):
+        """Encode les paniers comme un flux de paniers enregistrés."""
+        stream = io.BytesIO()
+        codec.write_carts(stream, carts)
+        return stream.getvalue()
+
+    @pytest.mark.parametrize(
+        "discount",
+        [
+            None,
+            Discount(
+                code="FOOD10",
+                discount_type=DiscountType.PERCENTAGE,
+                value=Decimal("10"),
+                category="food",
+            ),
+        ],
+    )
+    def test_parallel_matches_sequential_in_order(self, discount):
+        """Test que le calcul parallèle donne les mêmes résultats, dans l'ordre."""
+        checkout_service = CheckoutService(TaxCalculator(self.TAX_RATES))
+        carts = self._carts(25)
+
+        results = checkout_service.calculate_total_many(
+            self._encode(carts), discount, workers=2, chunk_size=4
+        )
+
+        assert results == [checkout_service.calculate_total(cart, discount) for cart in carts]
+
+    def test_parallel_money_path(self):
+        """Test que le mode d'arrondi Money est transmis aux processus."""
+        checkout_service = CheckoutService(
+            TaxCalculator(self.TAX_RATES), money_rounding=Rounding.HALF_EVEN
+        )
+        carts = self._carts(6)
+
+        results = checkout_service.calculate_total_many(self._encode(carts), workers=2)
+
+        assert results == [checkout_service.calculate_total(cart) for cart in carts]
+        assert isinstance(results[1]["total"], Money)
+
+    def test_parallel_in_memory_carts(self):
+        """Test que des paniers en mémoire sont encodés et répartis entre les processus."""
+        checkout_service = CheckoutService(TaxCalculator(self.TAX_RATES))
+        carts = self._carts(10)
+        discount = Discount(code="SAVE5", discount_type=DiscountType.FIXED, value=Decimal("5"))
+
+        results = checkout_service.calculate_total_many(carts, discount, workers=2, chunk_size=3)
+
+        assert results == [checkout_service.calculate_total(cart, discount) for cart in carts]
+
+    def test_in_process_computation(self):
+        """Test le calcul dans le processus courant (un seul processus)."""
+        checkout_service = CheckoutService(TaxCalculator(self.TAX_RATES))
+        carts = self._carts(3)
+        expected = [checkout_service.calculate_total(cart) for cart in carts]
+
+        assert checkout_service.calculate_total_many(self._encode(carts), workers=1) == expected
+        assert checkout_service.calculate_total_many(carts, workers=1) == expected
+        assert checkout_service.calculate_total_many([], workers=4) == []
+        assert checkout_service.calculate_total_many(b"", workers=4) == []
+
+    def test_invalid_chunk_size(self):
+        """Test qu'une taille de lot nulle est refusée."""
+        checkout_service = CheckoutService(TaxCalculator(self.TAX_RATES))
+
+        with pytest.raises(ValueError, match="taille des lots"):
+            checkout_service.calculate_total_many(
+                self._encode(self._carts(3)), workers=2, chunk_size=0
+            )
+
+
+class TestCheckoutCache:
+    """Tests pour le cache des résultats de checkout."""
+
+    TAX_RATES = {"food": Decimal("0.055"), "electronics": Decimal("0.20")}
+
+    class FakeClock:
+        """Horloge contrôlée par le test."""
+
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    def setup_method(self):
+        """Crée un catalogue, un service de checkout et un compteur de calculs."""
+        self.tax_calculator = TaxCalculator(self.TAX_RATES)
+        self.checkout_service = CheckoutService(self.tax_calculator)
+        self.catalog = {
+            product_id: Product(id=product_id, name="Test", price=Decimal("10"), category="food")
+            for product_id in ("a", "b", "c")
+        }
+        self.discounts = {
+            "D10": Discount(code="D10", discount_type=DiscountType.PERCENTAGE, value=Decimal("10"))
+        }
+        self.computations = 0
+
+    def _cache(self, **kwargs):
+        """Crée un cache devant le calculateur de taxes du test."""
+        return CheckoutCache(self.tax_calculator, **kwargs)
+
+    def _checkout(self, cache, lines, discount_code=None):
+        """Passe une requête de checkout par le cache."""
+
+        def compute():
+            self.computations += 1
+            cart = Cart.from_lines(lines, self.catalog)
+            discount = self.discounts[discount_code] if discount_code else None
+            return self.checkout_service.calculate_total(cart, discount)
+
+        return cache.get_or_compute(lines, discount_code, compute)
+
+    def test_identical_requests_hit(self):
+        """Test qu'une requête identique est servie sans recalcul."""
+        cache = self._cache()
+
+        first = self._checkout(cache, [("a", 2)])
+        second = self._checkout(cache, [("a", 2)])
+
+        assert first == second
+        assert self.computations == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.stats()["hit_ratio"] == 0.5
+
+    def test_fingerprint_is_canonical(self):
+        """Test que l'empreinte ignore l'ordre des lignes et fusionne les doublons."""
+        cache = self._cache()
+
+        assert cache.fingerprint([("a", 1), ("b", 2)], "D10") == (
+            cache.fingerprint([("b", 1), ("a", 1), ("b", 1)], "D10")
+        )
+        assert cache.fingerprint([("a", 1)]) != cache.fingerprint([("a", 2)])
+        assert cache.fingerprint([("a", 1)]) != cache.fingerprint([("a", 1)], "D10")
+
+    def test_separators_in_ids_and_codes_do_not_collide(self):
+        """Test que des IDs ou des codes contenant des séparateurs ne se confondent pas."""
+        cache = self._cache()
+
+        def digest(lines, discount_code=None):
+            return cache.fingerprint(lines, discount_code)[0]
+
+        assert digest([("a\x1f1\x1eb", 2)]) != digest([("a", 1), ("b", 2)])
+        assert digest([("b", 1)], "D\x1e") != digest([("\x1eb", 1)], "D")
+        assert digest([("a", 1)], "D\x1ea\x1f1") != digest([("a", 1), ("a", 1)], "D")
+
+    def test_separator_id_is_not_served_another_cart(self):
+        """Test de non-régression : un produit piège ne fausse pas le total d'un autre panier."""
+        cache = self._cache()
+        self.catalog["a\x1f1\x1eb"] = Product(
+            id="a\x1f1\x1eb", name="Piège", price=Decimal("0.01"), category="food"
+        )
+
+        self._checkout(cache, [("a\x1f1\x1eb", 2)])
+        result = self._checkout(cache, [("a", 1), ("b", 2)])
+
+        assert result["subtotal"] == Decimal("30")
+        assert self.computations == 2
+
+    def test_invalid_lines_bypass_cache(self):
+        """Test que des lignes invalides ne sont jamais servies depuis le cache."""
+        cache = self._cache()
+        self._checkout(cache, [("a", 2)])
+
+        for quantity in ("2", 2.0, True, 0):
+            assert cache.fingerprint([("a", quantity)]) is None
+        with pytest.raises(ValueError):
+            self._checkout(cache, [("a", "2")])
+        assert cache.hits == 0
+
+    def test_errors_are_not_cached(self):
+        """Test qu'une erreur de calcul n'est pas mémorisée."""
+        cache = self._cache()
+
+        with pytest.raises(MissingProductsError):
+            self._checkout(cache, [("missing", 1)])
+        self.catalog["missing"] = Product(
+            id="missing", name="Test", price=Decimal("1"), category="food"
+        )
+
+        assert self._checkout(cache, [("missing", 1)])["subtotal"] == Decimal("1")
+        assert len(cache) == 1
+
+    def test_invalidation_removes_only_affected_entries(self):
+        """Test que seules les entrées concernées par un changement sont supprimées."""
+        cache = self._cache()
+        self._checkout(cache, [("a", 1), ("b", 1)])
+        self._checkout(cache, [("c", 1)], "D10")
+        self._checkout(cache, [("c", 2)])
+
+        self.catalog["a"] = Product(id="a", name="Test", price=Decimal("12"), category="food")
+        assert cache.invalidate_product("a") == 1
+        self.discounts["D10"] = Discount(
+            code="D10", discount_type=DiscountType.PERCENTAGE, value=Decimal("50")
+        )
+        assert cache.invalidate_discount("D10") == 1
+
+        assert self._checkout(cache, [("a", 1), ("b", 1)])["subtotal"] == Decimal("22")
+        assert self._checkout(cache, [("c", 1)], "D10")["discount_amount"] == Decimal("5")
+        self._checkout(cache, [("c", 2)])
+        assert cache.hits == 1
+        assert cache.stats()["invalidations"] == 2
+
+    def test_tax_rate_change_misses(self):
+        """Test qu'une modification des taux change l'empreinte."""
+        cache = self._cache()
+        self._checkout(cache, [("a", 1)])
+
+        self.tax_calculator.set_tax_rate("food", Decimal("0.10"))
+
+        assert self._checkout(cache, [("a", 1)])["tax_amount"] == Decimal("1")
+        assert cache.hits == 0
+
+    def test_invalidation_during_computation_is_not_stored(self):
+        """Test qu'un résultat calculé pendant une invalidation n'est pas mémorisé."""
+        cache = self._cache()
+
+        def compute():
+            cache.invalidate_product("a")
+            return self.checkout_service.calculate_total(Cart.from_lines([("a", 1)], self.catalog))
+
+        cache.get_or_compute([("a", 1)], None, compute)
+
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """Test que l'entrée la moins récemment utilisée est évincée."""
+        cache = self._cache(max_entries=2)
+        self._checkout(cache, [("a", 1)])
+        self._checkout(cache, [("b", 1)])
+        self._checkout(cache, [("a", 1)])
+        self._checkout(cache, [("c", 1)])
+
+        assert len(cache) == 2
+        assert cache.evictions == 1
+        self._checkout(cache, [("a", 1)])
+        assert cache.hits == 2
+        self._checkout(cache, [("b", 1)])
+        assert cache.misses == 4
+        assert cache.invalidate_product("c") == 0
+
+    def test_ttl_expiration(self):
+        """Test que les entrées expirent après leur durée de vie."""
+        clock = self.FakeClock()
+        cache = self._cache(ttl=10, clock=clock)
+        self._checkout(cache, [("a", 1)])
+
+        clock.now = 9.9
+        self._checkout(cache, [("a", 1)])
+        clock.now = 20
+        self._checkout(cache, [("a", 1)])
+        self._checkout(cache, [("b", 1)])
+        clock.now = 40
+
+        assert (cache.hits, cache.misses, cache.expirations) == (1, 3, 1)
+        assert cache.purge_expired() == 2
+        assert len(cache) == 0
+
+    def test_result_is_a_copy(self):
+        """Test que modifier un résultat ne modifie pas l'entrée en cache."""
+        cache = self._cache()
+        self._checkout(cache, [("a", 1)])["total"] = Decimal("0")
+
+        assert self._checkout(cache, [("a", 1)])["total"] == Decimal("10.55")
+
+
+class TestDiscountIndex:
+    """Tests pour l'index de recherche de la meilleure remise."""
+
+    TAX_RATES = {"food": Decimal("0.055"), "electronics": Decimal("0.20")}
+
+    @staticmethod
+    def _cart(lines):
+        """Crée un panier à partir de lignes (prix, catégorie, quantité)."""
+        cart = Cart()
+        for i, (price, category, quantity) in enumerate(lines):
+            cart.add_item(
+                Product(id=f"prod{i}", name="Test", price=Decimal(price), category=category),
+                quantity,
+            )
+        return cart
+
+    def test_best_discount_matches_exhaustive_search(self):
+        """Test que l'index trouve le total minimal obtenu en essayant chaque remise."""
+        checkout_service = CheckoutService(TaxCalculator(self.TAX_RATES))
+        categories = [None, "food", "electronics", "other"]
+        discounts = [
+            Discount(
+                code=f"CODE{i:03d}",
+                discount_type=DiscountType.PERCENTAGE if i % 2 else DiscountType.FIXED,
+                value=Decimal(i * 37 % 60 + 1),
+                min_amount=Decimal(i * 53 % 400) if i % 3 else None,
+                category=categories[i % 4],
+            )
+            for i in range(300)
+        ]
+        index = DiscountIndex(discounts)
+        carts = [
+            self._cart([("12.50", "food", 2)]),
+            self._cart([("99.99", "electronics", 3), ("4.20", "food", 5)]),
+            self._cart([("150", "other", 1), ("30", "food", 4), ("250", "electronics", 1)]),
+            self._cart([("0.50", "unknown", 1)]),
+        ]
+
+        for cart in carts:
+            best_discount, amount = index.best_discount(cart)
+            totals = [checkout_service.calculate_total(cart, d)["total"] for d in discounts]
+            best_total = min(totals)
+            result = checkout_service.calculate_total(cart, best_discount)
+            assert result["total"] == best_total
+            assert result["discount_amount"] == amount
+
+    def test_tie_goes_to_smallest_code(self):
+        """Test qu'à montant égal, le plus petit code l'emporte."""
+        index = DiscountIndex(
+            [
+                Discount(code="B", discount_type=DiscountType.PERCENTAGE, value=Decimal("10")),
+                Discount(code="A", discount_type=DiscountType.PERCENTAGE, value=Decimal("10")),
+                Discount(code="C", discount_type=DiscountType.FIXED, value=Decimal("10")),
+            ]
+        )
+
+        best_discount, amount = index.best_discount(self._cart([("100", "food", 1)]))
+
+        assert (best_discount.code, amount) == ("A", Decimal("10"))
+
+    def test_min_amount_and_category_are_respected(self):
+        """Test qu'une remise inapplicable n'est jamais retenue."""
+        index = DiscountIndex(
+            [
+                Discount(
+                    code="BIG",
+                    discount_type=DiscountType.FIXED,
+                    value=Decimal("50"),
+                    min_amount=Decimal("200"),
+                ),
+                Discount(
+                    code="TECH",
+                    discount_type=DiscountType.PERCENTAGE,
+                    value=Decimal("50"),
+                    category="electronics",
+                ),
+                Discount(code="SMALL", discount_type=DiscountType.FIXED, value=Decimal("5")),
+            ]
+        )
+
+        assert index.best_discount(self._cart([("100", "food", 1)]))[0].code == "SMALL"
+        assert index.best_discount(self._cart([("100", "food", 2)]))[0].code == "BIG"
+        assert index.best_discount(self._cart([("120", "electronics", 1)]))[0].code == "TECH"
+
+    def test_replace_and_remove(self):
+        """Test le remplacement et le retrait d'une remise indexée."""
+        index = DiscountIndex(
+            [Discount(code="A", discount_type=DiscountType.FIXED, value=Decimal("5"))]
+        )
+        cart = self._cart([("100", "food", 1)])
+
+        index.add(
+            Discount(
+                code="A",
+                discount_type=DiscountType.FIXED,
+                value=Decimal("8"),
+                category="food",
+            )
+        )
+        assert len(index) == 1
+        assert index.best_discount(cart)[1] == Decimal("8")
+
+        index.remove("A")
+        index.remove("unknown")
+        assert index.best_discount(cart) is None
+
+    def test_refresh_reads_only_new_discounts(self):
+        """Test que refresh n'ajoute que les remises apparues depuis le refresh précédent."""
+        repository = InMemoryRepository()
+        index = DiscountIndex()
+        cart = self._cart([("100", "food", 1)])
+        repository.add_discount(
+            Discount(code="A", discount_type=DiscountType.FIXED, value=Decimal("5"))
+        )
+
+        assert index.refresh(repository.discounts_after) == 1
+        assert index.refresh(repository.discounts_after) == 0
+        repository.add_discount(
+            Discount(code="B", discount_type=DiscountType.FIXED, value=Decimal("8"))
+        )
+        assert index.best_discount(cart)[0].code == "A"
+
+        assert index.refresh(repository.discounts_after) == 1
+        assert (len(index), index.best_discount(cart)[0].code) == (2, "B")
+
+    def test_no_discount_reducing_total(self):
+        """Test qu'aucune remise n'est retenue si aucune ne réduit le total."""
+        index = DiscountIndex(
+            [
+                Discount(code="ZERO", discount_type=DiscountType.PERCENTAGE, value=Decimal("0")),
+                Discount(
+                    code="FOOD",
+                    discount_type=DiscountType.FIXED,
+                    value=Decimal("5"),
+                    category="food",
+                ),
+            ]
+        )
+
+        assert index.best_discount(self._cart([("10", "other", 1)])) is None
+        assert DiscountIndex().best_discount(Cart()) is None
+
+
+class TestAsyncCheckoutService:
+    """Tests pour le checkout asynchrone et ses fournisseurs de taux."""
+
+    TAX_RATES = {"food": Decimal("0.055"), "electronics": Decimal("0.20")}
+
+    class FakeClock:
+        """Horloge contrôlée par le test."""
+
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    @staticmethod
+    def _cart():
+        """Crée un panier de trois catégories (dont une non taxée)."""
+        cart = Cart()
+        for price, category in (("10", "food"), ("100", "electronics"), ("20", "books")):
+            cart.add_item(
+                Product(id=category, name="Test", price=Decimal(price), category=category), 2
+            )
+        return cart
+
+    @pytest.mark.parametrize(
+        "discount",
+        [
+            None,
+            Discount(
+                code="FOOD", discount_type=DiscountType.FIXED, value=Decimal("5"), category="food"
+            ),
+        ],
+    )
+    def test_matches_checkout_service(self, discount):
+        """Test que les résultats sont ceux de CheckoutService."""
+        service = AsyncCheckoutService(StaticTaxRateProvider(self.TAX_RATES))
+        cart = self._cart()
+
+        result = asyncio.run(service.calculate_total(cart, discount))
+
+        assert result == CheckoutService(TaxCalculator(self.TAX_RATES)).calculate_total(
+            cart, discount
+        )
+
+    def test_empty_cart_does_not_call_provider(self):
+        """Test qu'un panier vide ne demande aucun taux."""
+        provider = FakeTaxRateProvider(self.TAX_RATES)
+        service = AsyncCheckoutService(provider, money_rounding=Rounding.HALF_UP)
+
+        result = asyncio.run(service.calculate_total(Cart()))
+
+        assert result["total"] == Money.zero()
+        assert provider.calls == 0
+
+    def test_categories_are_fetched_concurrently(self):
+        """Test que les catégories d'un panier sont demandées en parallèle."""
+        provider = FakeTaxRateProvider(self.TAX_RATES, latency=0.01)
+        service = AsyncCheckoutService(provider)
+
+        asyncio.run(service.calculate_total(self._cart()))
+
+        assert provider.calls == 3
+        assert provider.max_in_flight == 3
+
+    def test_in_flight_requests_are_coalesced(self):
+        """Test que des checkouts simultanés ne demandent chaque taux qu'une fois."""
+        provider = FakeTaxRateProvider(self.TAX_RATES, latency=0.01)
+        service = AsyncCheckoutService(provider)
+        cart = self._cart()
+
+        async def run():
+            return await asyncio.gather(*(service.calculate_total(cart) for _ in range(50)))
+
+        results = asyncio.run(run())
+
+        assert all(result == results[0] for result in results)
+        assert provider.calls_by_category == {"food": 1, "electronics": 1, "books": 1}
+        assert service.stats()["coalesced"] == 49 * 3
+
+    def test_ttl_cache_and_expiration(self):
+        """Test la mise en cache des taux puis leur expiration."""
+        provider = FakeTaxRateProvider(self.TAX_RATES)
+        clock = self.FakeClock()
+        service = AsyncCheckoutService(provider, ttl=60, clock=clock)
+        cart = self._cart()
+
+        asyncio.run(service.calculate_total(cart))
+        asyncio.run(service.calculate_total(cart))
+        assert provider.calls == 3
+        assert service.stats()["hits"] == 3
+
+        provider.tax_rates["food"] = Decimal("0.10")
+        clock.now = 61
+        result = asyncio.run(service.calculate_total(cart))
+        assert provider.calls == 6
+        assert result["tax_amount"] == Decimal("2") + Decimal("40")
+
+    def test_invalidate(self):
+        """Test qu'une invalidation force une nouvelle demande pour la catégorie."""
+        provider = FakeTaxRateProvider(self.TAX_RATES)
+        service = AsyncCheckoutService(provider)
+
+        asyncio.run(service.get_rates(["food", "electronics"]))
+        service.invalidate("food")
+        asyncio.run(service.get_rates(["food", "electronics"]))
+
+        assert provider.calls_by_category == {"food": 2, "electronics": 1}
+
+    def test_provider_errors_are_shared_and_not_cached(self):
+        """Test qu'une erreur est propagée à toutes les demandes regroupées, sans cache."""
+        provider = FakeTaxRateProvider(self.TAX_RATES, latency=0.01)
+        provider.failures["food"] = ConnectionError("service indisponible")
+        service = AsyncCheckoutService(provider)
+
+        async def run():
+            return await asyncio.gather(
+                *(service.get_rates(["food"]) for _ in range(5)), return_exceptions=True
+            )
+
+        errors = asyncio.run(run())
+        assert all(isinstance(error, ConnectionError) for error in errors)
+        assert provider.calls == 1
+
+        del provider.failures["food"]
+        assert asyncio.run(service.get_rates(["food"])) == {"food": Decimal("0.055")}
+        assert provider.calls == 2
+
+    def test_many_carts_share_lookups(self):
+        """Test que calculate_total_many demande chaque catégorie une seule fois."""
+        provider = FakeTaxRateProvider(self.TAX_RATES)
+        service = AsyncCheckoutService(provider)
+        carts = [self._cart(), Cart(), self._cart()]
+
+        results = asyncio.run(service.calculate_total_many(carts))
+
+        expected = CheckoutService(TaxCalculator(self.TAX_RATES)).calculate_total_many(carts)
+        assert results == expected
+        assert provider.calls == 3
+
+    def test_negative_rate_is_rejected(self):
+        """Test qu'un taux négatif fourni est refusé."""
+        service = AsyncCheckoutService(FakeTaxRateProvider({"food": Decimal("-0.1")}))
+
+        with pytest.raises(ValueError, match="négatif"):
+            asyncio.run(service.get_rates(["food"]))